@@ -0,0 +1,90 @@
+"""章节预取缓存：按字节预算的 LRU，缓存已构建好的章节文档与逐段字数统计。
+
+条目只在载入线程（ChapterLoadWorker）中创建、复制与释放，打开时 clone() 一份交给编辑器，
+命中即不读盘、不解析、不重算统计。条目以章节文件与编辑日志的 (mtime_ns, 大小) 为戳，
+取用时重新 stat 比对，应用外的修改自然失效；应用内的保存/删除经 project_manager 的
+章节变更事件（notify，可能在保存线程中调用）标记失效。
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from .chapter_journal import journal_path
+from .tab_memory import estimate_document_bytes
+
+
+def file_stamp(project_path, filename):
+    """章节文件与编辑日志的 (mtime_ns, 大小)；文件不存在时对应项为 None。"""
+    stamp = []
+    for path in (os.path.join(project_path, 'chapters', filename), journal_path(project_path, filename)):
+        try: st = os.stat(path); stamp.append((st.st_mtime_ns, st.st_size))
+        except OSError: stamp.append(None)
+    return tuple(stamp)
+
+
+class _Entry:
+    __slots__ = ('stamp', 'font', 'document', 'blocks', 'size', 'stale')
+
+    def __init__(self, stamp, font, document, blocks):
+        self.stamp = stamp; self.font = font; self.document = document; self.blocks = blocks
+        self.size = estimate_document_bytes(document); self.stale = False
+
+
+class ChapterCache:
+    """filename -> 已构建的文档（无父对象，属于载入线程）。font 为默认字体的 toString()，字体变了即视为未命中。"""
+    def __init__(self, project_path, budget_bytes: int):
+        self.project_path = os.path.abspath(project_path)
+        self.budget = budget_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0; self.hits = 0; self.misses = 0
+
+    def get(self, filename, font: str):
+        """命中时返回 (document, blocks) 并移到最近使用端；过期条目在此释放。只在载入线程中调用。"""
+        stamp = file_stamp(self.project_path, filename)
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is not None and not entry.stale and entry.stamp == stamp and entry.font == font:
+                self._entries.move_to_end(filename); self.hits += 1
+                return entry.document, entry.blocks
+            if entry is not None: self._drop(filename)
+            self.misses += 1
+            return None
+
+    def __contains__(self, key):
+        """(filename, font) 是否有未过期的条目（预取时用来跳过，不计命中）。"""
+        filename, font = key
+        with self._lock: entry = self._entries.get(filename)
+        return entry is not None and not entry.stale and entry.font == font and entry.stamp == file_stamp(self.project_path, filename)
+
+    def put(self, filename, stamp, font: str, document, blocks):
+        """stamp 须在读盘之前取得，读取期间文件被改动时条目随即失效。超出预算时淘汰最久未用的条目。
+
+        单个文档超过整个预算时不缓存，返回 False。
+        """
+        entry = _Entry(stamp, font, document, blocks)
+        if entry.size > self.budget: return False
+        with self._lock:
+            if filename in self._entries: self._drop(filename)
+            self._entries[filename] = entry; self.size += entry.size
+            for name in [name for name, e in self._entries.items() if e.stale]: self._drop(name)
+            while self.size > self.budget: self._drop(next(iter(self._entries)))
+        return True
+
+    def _drop(self, filename):
+        self.size -= self._entries.pop(filename).size
+
+    def invalidate(self, filenames):
+        """只做标记，文档留给载入线程释放（QTextDocument 不宜在别的线程中析构）。"""
+        with self._lock:
+            for filename in filenames:
+                entry = self._entries.get(filename)
+                if entry is not None: entry.stale = True
+
+    def notify(self, kind, project_path, filenames):
+        """project_manager.add_change_listener 的回调（可能在任意线程中调用）。"""
+        if kind == 'moved' or not project_path or os.path.abspath(project_path) != self.project_path: return
+        self.invalidate(filenames)
+
+    def clear(self):
+        with self._lock: self._entries.clear(); self.size = 0
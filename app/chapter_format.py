@@ -0,0 +1,248 @@
+"""章节原生存储格式：纯文本 + 游程编码的字符/段落格式。
+
+相比 QTextEdit.toHtml() 的输出（DOCTYPE、<style> 块、每段内联样式），体积小得多，
+加载时直接用 QTextCursor 构建 QTextDocument，不经过 HTML 解析。
+
+文件布局（UTF-8）::
+
+    WRT1
+    {"cf": [字符格式...], "bf": [段落格式...], "blocks": [[段数, bf, cf], ...], "runs": [[字数, cf], ...]}
+    纯文本（段落之间以 \\n 分隔）
+
+格式表项是 QTextFormat.properties() 的 {属性 id: 值}，因此编辑器产生的
+粗体/斜体/下划线/字体/字号/行距/对齐/缩进等属性都能无损往返；
+颜色画刷按 ["brush", "#AARRGGBB"] 编码，其它无法序列化的属性会被丢弃。
+旧的 HTML 章节照常可读（自动识别），下次完整保存时即转换为原生格式。
+"""
+import json
+
+MAGIC = 'WRT1'
+
+
+def is_native(content: str) -> bool:
+    return content.startswith(MAGIC + '\n')
+
+
+def split_native(content: str):
+    """(头部 dict, 纯文本部分)。"""
+    parts = content.split('\n', 2)
+    header = json.loads(parts[1]) if len(parts) > 1 and parts[1] else {}
+    return header, parts[2] if len(parts) > 2 else ''
+
+
+def native_plain_text(content: str) -> str:
+    """原生格式的纯文本部分（plain_backup 直接使用，无需任何解析）。"""
+    text = split_native(content)[1]
+    # 段内软换行 (Shift+Enter) 与 toPlainText() 一样输出为换行
+    return text.replace('\u2028', '\n') if '\u2028' in text else text
+
+
+# ---------- 格式属性 <-> JSON ----------
+
+# 与缺省值相同的字符属性（取消粗体/斜体/下划线后 Qt 会显式写入）不落盘，
+# 使“开了又关”的格式与从未设置过的格式序列化结果一致
+_NEUTRAL_PROPS = {
+    0x2003: 400,    # FontWeight: Normal
+    0x2004: False,  # FontItalic
+    0x2005: False,  # FontUnderline
+    0x2006: False,  # FontOverline
+    0x2007: False,  # FontStrikeOut
+    0x2023: 0,      # TextUnderlineStyle: NoUnderline
+}
+
+
+def _encode_props(fmt) -> dict:
+    from PyQt6.QtGui import QBrush, QColor
+    out = {}
+    for key, value in fmt.properties().items():
+        if _NEUTRAL_PROPS.get(key, ...) == value and type(value) is type(_NEUTRAL_PROPS[key]): continue
+        if isinstance(value, (bool, int, float, str)): out[str(key)] = value
+        elif isinstance(value, list) and all(isinstance(v, str) for v in value): out[str(key)] = value
+        elif isinstance(value, QBrush): out[str(key)] = ['brush', value.color().name(QColor.NameFormat.HexArgb)]
+        elif isinstance(value, QColor): out[str(key)] = ['color', value.name(QColor.NameFormat.HexArgb)]
+    return out
+
+
+def _decode_props(fmt, props: dict):
+    from PyQt6.QtGui import QBrush, QColor, QTextFormat
+    for key, value in props.items():
+        key = int(key)
+        if isinstance(value, list):
+            if len(value) == 2 and value[0] in ('brush', 'color'):
+                value = QBrush(QColor(value[1])) if value[0] == 'brush' else QColor(value[1])
+            elif key == QTextFormat.Property.FontFamilies.value:
+                fmt.setFontFamilies(value); continue
+            else: continue
+        fmt.setProperty(key, value)
+    return fmt
+
+
+class _Table:
+    """格式去重表：相同属性集合只存一份。"""
+    def __init__(self):
+        self.items = []; self._index = {}
+
+    def add(self, props: dict) -> int:
+        key = json.dumps(props, sort_keys=True)
+        idx = self._index.get(key)
+        if idx is None:
+            idx = self._index[key] = len(self.items); self.items.append(props)
+        return idx
+
+
+# ---------- 文档 <-> 原生格式 ----------
+
+def document_to_native(document) -> str:
+    """序列化 QTextDocument（可在工作线程中对 clone() 出的副本调用）。
+
+    文档内部的格式索引（charFormatIndex/blockFormatIndex）先映射到去重表，
+    每种格式只编码一次，逐段/逐片段只做整数查表。
+    """
+    cf = _Table(); bf = _Table(); cf_of = {}; bf_of = {}
+    blocks = []; runs = []; texts = []
+    block = document.begin()
+    while block.isValid():
+        key = block.blockFormatIndex(); b_idx = bf_of.get(key)
+        if b_idx is None: b_idx = bf_of[key] = bf.add(_encode_props(block.blockFormat()))
+        key = block.charFormatIndex(); c_idx = cf_of.get(key)
+        if c_idx is None: c_idx = cf_of[key] = cf.add(_encode_props(block.charFormat()))
+        if blocks and blocks[-1][1] == b_idx and blocks[-1][2] == c_idx: blocks[-1][0] += 1
+        else: blocks.append([1, b_idx, c_idx])
+        it = block.begin()
+        while not it.atEnd():
+            frag = it.fragment(); it += 1
+            length = frag.length()
+            if not length: continue
+            key = frag.charFormatIndex(); idx = cf_of.get(key)
+            if idx is None: idx = cf_of[key] = cf.add(_encode_props(frag.charFormat()))
+            if runs and runs[-1][1] == idx: runs[-1][0] += length
+            else: runs.append([length, idx])
+        texts.append(block.text())
+        block = block.next()
+    header = json.dumps({'cf': cf.items, 'bf': bf.items, 'blocks': blocks, 'runs': runs}, ensure_ascii=False, separators=(',', ':'))
+    return f"{MAGIC}\n{header}\n" + '\n'.join(texts)
+
+
+def native_to_document(content: str, document, uniform_size: bool = False):
+    """直接用 QTextCursor 构建文档（按段/按格式游程插入，不解析 HTML）。
+
+    uniform_size 为真时丢弃格式表中的字号，正文跟随文档默认字体。
+    """
+    from PyQt6.QtGui import QTextCursor, QTextCharFormat, QTextBlockFormat, QTextFormat
+    header, text = split_native(content)
+    cfs = [_decode_props(QTextCharFormat(), p) for p in header.get('cf', [])]
+    if uniform_size:
+        for fmt in cfs: fmt.clearProperty(QTextFormat.Property.FontPointSize)
+    bfs = [_decode_props(QTextBlockFormat(), p) for p in header.get('bf', [])]
+    undo = document.isUndoRedoEnabled(); document.setUndoRedoEnabled(False)
+    document.clear()
+    cursor = QTextCursor(document); cursor.beginEditBlock()
+    lines = text.split('\n'); runs = iter(header.get('runs', [])); run_left = 0; run_fmt = None
+    line_no = 0
+    for count, b_idx, c_idx in header.get('blocks', []) or [[len(lines), None, None]]:
+        for _ in range(count):
+            if line_no >= len(lines): break
+            bfmt = bfs[b_idx] if b_idx is not None else QTextBlockFormat()
+            cfmt = cfs[c_idx] if c_idx is not None else QTextCharFormat()
+            if line_no == 0: cursor.setBlockFormat(bfmt); cursor.setBlockCharFormat(cfmt)
+            else: cursor.insertBlock(bfmt, cfmt)
+            line = lines[line_no]; pos = 0
+            while pos < len(line):
+                if run_left == 0:
+                    try: run_left, f_idx = next(runs); run_fmt = cfs[f_idx]
+                    except StopIteration: run_left, run_fmt = len(line) - pos, cfmt
+                take = min(run_left, len(line) - pos)
+                cursor.insertText(line[pos:pos + take], run_fmt)
+                pos += take; run_left -= take
+            line_no += 1
+    cursor.endEditBlock()
+    document.setUndoRedoEnabled(undo)
+    return document
+
+
+def range_to_native(document, start: int, end: int) -> dict:
+    """文档中 [start, end) 一段的原生格式片段（编辑日志用）：文字、字符格式游程，以及这段涉及的
+    每一段（从 start 所在段到 end 所在段）的段落格式与段落字符格式。
+
+    与 HTML 片段不同，段落格式（对齐、行距、缩进等）按原样记录，重放时原样写回。
+    """
+    from PyQt6.QtGui import QTextCursor
+    cf = _Table(); bf = _Table(); blocks = []; runs = []
+    block = document.findBlock(start); last = document.findBlock(end)
+    while block.isValid():
+        blocks.append([bf.add(_encode_props(block.blockFormat())), cf.add(_encode_props(block.charFormat()))])
+        it = block.begin()
+        while not it.atEnd():
+            frag = it.fragment(); it += 1
+            lo = max(frag.position(), start); hi = min(frag.position() + frag.length(), end)
+            if lo >= hi: continue
+            idx = cf.add(_encode_props(frag.charFormat()))
+            if runs and runs[-1][1] == idx: runs[-1][0] += hi - lo
+            else: runs.append([hi - lo, idx])
+        if block == last: break
+        block = block.next()
+    cursor = QTextCursor(document); cursor.setPosition(start); cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+    return {'cf': cf.items, 'bf': bf.items, 'blocks': blocks, 'runs': runs,
+            'text': cursor.selectedText().replace('\u2029', '\n')}
+
+
+def insert_native_range(cursor, snippet: dict):
+    """在光标处插入 range_to_native 的片段，再把涉及的各段格式恢复为记录时的样子。"""
+    from PyQt6.QtGui import QTextCursor, QTextCharFormat, QTextBlockFormat
+    cfs = [_decode_props(QTextCharFormat(), p) for p in snippet.get('cf', [])]
+    bfs = [_decode_props(QTextBlockFormat(), p) for p in snippet.get('bf', [])]
+    document = cursor.document(); start = cursor.position()
+    runs = iter(snippet.get('runs', [])); run_left = 0; run_fmt = None
+    for line_no, line in enumerate(snippet.get('text', '').split('\n')):
+        if line_no: cursor.insertBlock()
+        pos = 0
+        while pos < len(line):
+            if run_left == 0:
+                try: run_left, f_idx = next(runs); run_fmt = cfs[f_idx]
+                except StopIteration: run_left, run_fmt = len(line) - pos, cursor.charFormat()
+            take = min(run_left, len(line) - pos)
+            cursor.insertText(line[pos:pos + take], run_fmt)
+            pos += take; run_left -= take
+    block = document.findBlock(start)
+    for b_idx, c_idx in snippet.get('blocks', []):
+        if not block.isValid(): break
+        fix = QTextCursor(block); fix.setBlockFormat(bfs[b_idx]); fix.setBlockCharFormat(cfs[c_idx])
+        block = block.next()
+
+
+def plain_to_native(text: str) -> str:
+    """无格式纯文本直接生成原生格式（不需要 Qt，导入时可在子进程中批量调用）。
+
+    与把同一段文本放进空白 QTextDocument 再 document_to_native 的结果一致。
+    """
+    lines = text.split('\n'); length = len(text) - len(lines) + 1
+    header = {'cf': [{}], 'bf': [{}], 'blocks': [[len(lines), 0, 0]], 'runs': [[length, 0]] if length else []}
+    return f"{MAGIC}\n{json.dumps(header, separators=(',', ':'))}\n" + text
+
+
+def load_into_document(content: str, document, uniform_size: bool = False):
+    """按内容格式自动选择加载方式：原生格式直接构建，其余按 HTML 解析。
+
+    uniform_size 为真时正文字号统一为文档默认字体的字号：原生格式只需去掉格式表中的字号
+    （文字随默认字体），旧 HTML 章节仍整篇合并一次字号。
+    """
+    if is_native(content): return native_to_document(content, document, uniform_size)
+    document.setHtml(content)
+    if uniform_size:
+        from PyQt6.QtGui import QTextCursor, QTextCharFormat
+        cursor = QTextCursor(document); cursor.select(QTextCursor.SelectionType.Document)
+        fmt = QTextCharFormat(); fmt.setFontPointSize(document.defaultFont().pointSizeF()); cursor.mergeCharFormat(fmt)
+    return document
+
+
+# ---------- HTML 导入 / 导出 ----------
+
+def html_to_native(html: str) -> str:
+    from PyQt6.QtGui import QTextDocument
+    doc = QTextDocument(); doc.setHtml(html)
+    return document_to_native(doc)
+
+
+def native_to_html(content: str) -> str:
+    from PyQt6.QtGui import QTextDocument
+    return native_to_document(content, QTextDocument()).toHtml()
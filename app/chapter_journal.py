@@ -0,0 +1,142 @@
+"""章节编辑日志（预写日志）：自动保存只追加增量，完整重写延后到显式保存/关闭标签。
+
+日志文件位于 ``journal/<filename>.log``，逐行 JSON：
+    首行 {"base": crc32}         —— 对应 chapters/<filename> 当前内容的校验值
+    其余 {"p": 位置, "r": 删除字符数, "t": 纯文本} 或 {"p", "r", "n": 原生格式片段}
+    （chapter_format.range_to_native：文字、字符格式游程与涉及各段的段落格式）；
+    旧版本写入的 {"p", "r", "h": HTML 片段} 照常重放
+基底不匹配（例如完整保存后、重置日志前崩溃）时整份日志被忽略。
+"""
+import os
+import json
+import zlib
+
+JOURNAL_DIR = 'journal'
+
+
+def journal_path(project_path, filename):
+    return os.path.join(project_path, JOURNAL_DIR, filename + '.log')
+
+
+def content_crc(content: str) -> int:
+    return zlib.crc32(content.encode('utf-8'))
+
+
+def reset_journal(project_path, filename, base_content: str):
+    """完整保存后调用：以新内容为基底清空日志。"""
+    path = journal_path(project_path, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'base': content_crc(base_content)}) + '\n')
+
+
+def ensure_journal(project_path, filename):
+    """打开章节时调用：日志缺失或基底过期时以磁盘上的完整内容重建日志头。"""
+    from .chapter_storage import read_text
+    try: base = read_text(os.path.join(project_path, 'chapters', filename), project_path)
+    except FileNotFoundError: base = ''
+    try:
+        with open(journal_path(project_path, filename), 'r', encoding='utf-8') as f: header = f.readline()
+        if json.loads(header).get('base') == content_crc(base): return
+    except (FileNotFoundError, ValueError, AttributeError): pass
+    reset_journal(project_path, filename, base)
+
+
+def append_journal(project_path, filename, ops) -> int:
+    """追加增量操作，返回写入字节数。日志不存在时视为无效（需要先完整保存）。"""
+    path = journal_path(project_path, filename)
+    if not os.path.exists(path): raise FileNotFoundError(path)
+    data = ''.join(json.dumps(op, ensure_ascii=False) + '\n' for op in ops)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(data); f.flush(); os.fsync(f.fileno())
+    return len(data.encode('utf-8'))
+
+
+def remove_journal(project_path, filename):
+    try: os.remove(journal_path(project_path, filename))
+    except FileNotFoundError: pass
+
+
+def read_journal(project_path, filename, base_content: str):
+    """返回与 base_content 匹配的操作列表；无日志或基底不匹配时返回空列表。"""
+    path = journal_path(project_path, filename)
+    try:
+        with open(path, 'r', encoding='utf-8') as f: lines = f.read().splitlines()
+    except FileNotFoundError: return []
+    if not lines: return []
+    try:
+        if json.loads(lines[0]).get('base') != content_crc(base_content): return []
+    except (ValueError, AttributeError): return []
+    ops = []
+    for line in lines[1:]:
+        try: ops.append(json.loads(line))
+        except ValueError: break  # 崩溃时写了一半的尾行
+    return ops
+
+
+def apply_ops(document, ops):
+    """在 QTextDocument 上按顺序重放操作。"""
+    from PyQt6.QtGui import QTextCursor, QTextDocumentFragment
+    from .chapter_format import insert_native_range
+    cursor = QTextCursor(document)
+    for op in ops:
+        end = document.characterCount() - 1
+        pos = max(0, min(op.get('p', 0), end))
+        cursor.setPosition(pos)
+        removed = op.get('r', 0)
+        if removed:
+            cursor.setPosition(min(pos + removed, end), QTextCursor.MoveMode.KeepAnchor); cursor.removeSelectedText()
+        if 't' in op: cursor.insertText(op['t'])
+        elif 'n' in op: insert_native_range(cursor, op['n'])
+        elif 'h' in op: cursor.insertFragment(QTextDocumentFragment.fromHtml(op['h']))
+
+
+def replay_journal(project_path, filename, content: str) -> str:
+    """加载章节时重放日志，返回合并后的章节内容（原生格式）；无有效日志时原样返回。"""
+    ops = read_journal(project_path, filename, content)
+    if not ops: return content
+    from PyQt6.QtGui import QTextDocument
+    from .chapter_format import load_into_document, document_to_native
+    doc = load_into_document(content, QTextDocument())
+    apply_ops(doc, ops)
+    return document_to_native(doc)
+
+
+def capture_op(document, position: int, removed: int, added: int) -> dict:
+    """在 contentsChange 回调里把一次变化记录为日志操作（代价与编辑区大小成正比）。"""
+    from PyQt6.QtGui import QTextCursor
+    from .chapter_format import range_to_native
+    end = document.characterCount() - 1
+    stop = min(position + added, end)
+    op = {'p': position, 'r': removed}
+    if stop <= position:
+        # 末尾空段改了段落格式（例如居中）时没有可记录的文字，仍要记下该段格式
+        if added: op['n'] = range_to_native(document, position, position)
+        return op
+    cursor = QTextCursor(document); cursor.setPosition(position); cursor.setPosition(stop, QTextCursor.MoveMode.KeepAnchor)
+    text = cursor.selectedText()
+    # 常见的逐字输入：新文字沿用前一个字符的格式且不跨段，记录纯文本即可
+    if position > 0 and '\u2029' not in text:
+        prev = QTextCursor(document); prev.setPosition(position)
+        base_fmt = prev.charFormat()
+        block = document.findBlock(position); it = block.begin(); uniform = True
+        while not it.atEnd():
+            frag = it.fragment()
+            if frag.position() < stop and frag.position() + frag.length() > position and frag.charFormat() != base_fmt:
+                uniform = False; break
+            it += 1
+        if uniform and removed != added:
+            op['t'] = text; return op
+    op['n'] = range_to_native(document, position, stop)
+    return op
+
+
+def merge_op(ops: list, op: dict):
+    """把连续输入/退格合并进上一条操作，避免每个按键一行。"""
+    if ops:
+        last = ops[-1]
+        if 't' in last and 't' in op and op['r'] == 0 and op['p'] == last['p'] + len(last['t']):
+            last['t'] += op['t']; return
+        if op.keys() == last.keys() == {'p', 'r'} and op['p'] + op['r'] == last['p']:
+            last['p'] = op['p']; last['r'] += op['r']; return
+    ops.append(op)
@@ -0,0 +1,108 @@
+"""章节文件的透明压缩存储（可选，按项目在 project.json 中开启）。
+
+project.json::
+
+    "storage": {"compression": "zlib" | "lzma" | "zlib-dict" | "none", "level": 6}
+
+压缩文件以 ``b'\\x00WRZ'`` + 编码字节开头（文本文件不会含 NUL），读取时自动识别，
+因此同一项目中压缩与未压缩的章节可以并存，切换设置后旧文件照常可读。
+``zlib-dict`` 使用按项目训练的预置字典（``storage.zdict``），对大量短章节效果最好；
+文件中记录字典的 crc32，字典不匹配时拒绝解码而不是产生乱码。
+"""
+import os
+import json
+import lzma
+import zlib
+from collections import Counter
+
+MAGIC = b'\x00WRZ'
+CODECS = ('none', 'zlib', 'lzma', 'zlib-dict')
+DICT_FILENAME = 'storage.zdict'
+DICT_SIZE = 32 * 1024
+
+_options_cache: dict = {}  # project_path -> (project.json mtime, options)
+_dict_cache: dict = {}     # (project_path, mtime) -> bytes
+
+
+def load_options(project_path) -> dict:
+    """读取 project.json 中的 storage 设置（按 mtime 缓存，保存路径上只多一次 stat）。"""
+    json_path = os.path.join(project_path, 'project.json')
+    try: mtime = os.path.getmtime(json_path)
+    except OSError: return {}
+    cached = _options_cache.get(project_path)
+    if cached and cached[0] == mtime: return cached[1]
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f: options = json.load(f).get('storage') or {}
+    except Exception: options = {}
+    _options_cache[project_path] = (mtime, options)
+    return options
+
+
+def _dictionary(project_path) -> bytes:
+    path = os.path.join(project_path, DICT_FILENAME)
+    try: mtime = os.path.getmtime(path)
+    except OSError: raise ValueError('缺少压缩字典 ' + path)
+    key = (project_path, mtime)
+    if key not in _dict_cache:
+        with open(path, 'rb') as f: _dict_cache[key] = f.read()
+    return _dict_cache[key]
+
+
+def compress(data: bytes, options: dict, project_path=None) -> bytes:
+    codec = (options or {}).get('compression', 'none'); level = (options or {}).get('level')
+    if codec == 'zlib':
+        return MAGIC + b'z' + zlib.compress(data, 6 if level is None else level)
+    if codec == 'lzma':
+        return MAGIC + b'x' + lzma.compress(data, preset=6 if level is None else level)
+    if codec == 'zlib-dict':
+        zdict = _dictionary(project_path)
+        co = zlib.compressobj(6 if level is None else level, zdict=zdict)
+        return MAGIC + b'd' + zlib.crc32(zdict).to_bytes(4, 'big') + co.compress(data) + co.flush()
+    return data
+
+
+def decompress(blob: bytes, project_path=None) -> bytes:
+    if not blob.startswith(MAGIC): return blob
+    codec = blob[4:5]; body = blob[5:]
+    if codec == b'z': return zlib.decompress(body)
+    if codec == b'x': return lzma.decompress(body)
+    if codec == b'd':
+        zdict = _dictionary(project_path)
+        if zlib.crc32(zdict).to_bytes(4, 'big') != body[:4]: raise ValueError('压缩字典与文件不匹配')
+        do = zlib.decompressobj(zdict=zdict)
+        return do.decompress(body[4:]) + do.flush()
+    raise ValueError(f'未知的压缩格式: {codec!r}')
+
+
+def read_text(path, project_path=None) -> str:
+    """读取章节/备份文件，自动识别是否压缩。"""
+    with open(path, 'rb') as f: blob = f.read()
+    text = decompress(blob, project_path).decode('utf-8')
+    # 与文本模式读取一致：统一换行符（Windows 上以文本模式写出的旧文件含 \r\n）
+    if '\r' in text: text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def write_text(path, text: str, options: dict | None = None, project_path=None):
+    data = text.encode('utf-8')
+    if options and options.get('compression', 'none') != 'none':
+        data = compress(data, options, project_path)
+    with open(path, 'wb') as f: f.write(data)
+
+
+def train_dictionary(samples, size: int = DICT_SIZE, budget: int = 4 * 1024 * 1024) -> bytes:
+    """用项目中的章节内容训练 zlib 预置字典。
+
+    取各样本中出现次数最多的 16 字节片段（例如原生格式的格式表头、常用词句），
+    高频片段放在字典末尾——zlib 对距离更近的匹配编码更短。
+    每个样本只取开头一段，总输入不超过 budget 字节，数千章的项目也能很快训练完。
+    """
+    samples = list(samples)
+    per_sample = max(1024, budget // max(1, len(samples)))
+    counts = Counter(); step = 8
+    for sample in samples:
+        sample = sample[:per_sample]
+        for i in range(0, max(0, len(sample) - 16), step):
+            counts[sample[i:i + 16]] += 1
+    chunks = [chunk for chunk, n in counts.most_common(size // 16) if n > 1]
+    return b''.join(reversed(chunks))[-size:]
@@ -10,4 +10,37 @@ CHAPTER_PADDING = 3
 VOLUME_PREFIX = "第"
 VOLUME_SUFFIX = "卷"
 # 是否使用中文数字 (一, 二, 三...) 作为卷的序号
-VOLUME_USE_CHINESE_NUMERALS = True
\ No newline at end of file
+VOLUME_USE_CHINESE_NUMERALS = True
+
+# 编辑日志累计超过该字节数时，自动保存改为完整重写并清空日志
+JOURNAL_COMPACT_THRESHOLD = 256 * 1024
+
+# project.json 是否缩进排版（默认紧凑输出，章节很多时体积与写入耗时都更小）
+PROJECT_JSON_PRETTY = False
+
+# 导入文稿时识别卷/章标题行的正则（None 表示按上面的前后缀生成，例如“第十二章 风起”）
+# 自定义正则须匹配整行标题，可用命名组 topic 指定标题中的章节名部分
+IMPORT_CHAPTER_PATTERN = None
+IMPORT_VOLUME_PATTERN = None
+# 依次尝试的文本编码（UTF-8 带/不带 BOM 之后是 GBK，最后 GB18030 兜底）
+IMPORT_ENCODINGS = ('utf-8-sig', 'gbk', 'gb18030')
+
+# 输入时状态栏字数统计的最短刷新间隔（毫秒）
+STATUS_REFRESH_MS = 250
+# 字数统计中“汉字”是否也计入扩展 A 区与中文标点（默认只统计基本区 U+4E00–U+9FFF）
+STATS_WIDE_CJK = False
+
+# 目录树每次为一卷取出的章节行数（展开卷或滚动到末尾时按需再取）
+TREE_FETCH_BATCH = 200
+
+# 打开的标签（编辑器文档、排版与撤销栈）的内存预算（MB）：超出时最久未用的标签先保存再休眠，
+# 只保留光标与滚动位置，切换回来时重新载入。0 表示不限制
+TAB_MEMORY_BUDGET_MB = 512
+
+# 章节预取缓存（已构建的文档与逐段统计，按估算内存计）的上限（MB）：切换到预取过的章节不读盘、不解析。
+# 0 表示不缓存也不预取
+CHAPTER_CACHE_MB = 64
+# 切换章节时后台预取目录顺序中其后/其前的章节数，以及打开次数最多的章节数
+PREFETCH_AFTER = 2
+PREFETCH_BEFORE = 1
+PREFETCH_FREQUENT = 3
@@ -1,21 +1,161 @@
 """Custom widgets module."""
+from bisect import bisect_left
 from PyQt6.QtWidgets import QTextEdit, QApplication
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QWheelEvent, QKeyEvent
+from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QTimer
+from PyQt6.QtGui import QWheelEvent, QKeyEvent, QColor, QTextCharFormat, QTextCursor
+
+FIND_COLOR = QColor(255, 230, 150)
+FIND_CURRENT_COLOR = QColor(255, 180, 60)
 
 
 class AdvancedTextEdit(QTextEdit):
     """增强版 QTextEdit: Ctrl+滚轮/加减缩放、Ctrl+-/+=、可配置回车缩进"""
     fontZoomRequested = pyqtSignal(int)  # 发射 +1 / -1
+    findMatchesChanged = pyqtSignal(int, int)  # 编辑后命中更新：(当前下标, 总数)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.enter_mode: str = 'fullwidth'
+        # 章内查找高亮：只为视口前后各一屏内的命中建立 ExtraSelection，滚动时按需重建
+        self._find_matches = []; self._find_starts = []; self._find_current = -1
+        self._find_window = None  # 已建立高亮的 (首个命中下标, 末个下标+1, 起始位置, 结束位置)
+        self._find_selections = []
+        self._find_pattern = ''; self._find_document = None
+        self.verticalScrollBar().valueChanged.connect(lambda _: self.refresh_find_highlight(False))
+        # 编辑后的重建推迟到布局更新之后，连续输入只重建一次
+        self._find_refresh_timer = QTimer(self); self._find_refresh_timer.setSingleShot(True)
+        self._find_refresh_timer.timeout.connect(self.refresh_find_highlight)
+        self._after_paint = None
 
     def set_enter_mode(self, mode: str):
         if mode in ('fullwidth', 'halfwidth', 'none'):
             self.enter_mode = mode
 
+    # ---------- 查找高亮 ----------
+    def set_find_matches(self, matches, current: int = -1, pattern: str = ''):
+        """matches 为按位置排序的 [(位置, 长度)]；current 为当前命中下标。
+
+        给出 pattern（普通文本）时随文档编辑增量维护 matches（原地修改同一个列表）。
+        """
+        self._find_matches = matches; self._find_starts = [pos for pos, _ in matches]
+        self._find_current = current; self._find_window = None
+        self._find_pattern = pattern; self._watch_document(bool(pattern))
+        self.refresh_find_highlight(True)
+
+    def find_matches(self):
+        return self._find_matches
+
+    def _watch_document(self, on: bool):
+        document = self.document() if on else None
+        if document is self._find_document: return
+        if self._find_document is not None:
+            try: self._find_document.contentsChange.disconnect(self._on_find_contents_change)
+            except (TypeError, RuntimeError): pass
+        self._find_document = document
+        if document is not None: document.contentsChange.connect(self._on_find_contents_change)
+
+    def _text_range(self, start: int, end: int) -> str:
+        """文档 [start, end) 的文本，与 toPlainText() 的对应片段一致。"""
+        cursor = QTextCursor(self.document()); cursor.setPosition(start); cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        return cursor.selectedText().replace('\u2029', '\n').replace('\u00a0', ' ')
+
+    def _on_find_contents_change(self, position: int, removed: int, added: int):
+        """编辑后增量更新命中：编辑点之前的保留，之后的平移，只重扫编辑区附近。
+
+        与整篇 str.find 逐个向后（不重叠）查找的结果一致：从编辑区开始重扫，
+        直到新找到的命中与平移后的旧命中重合（之后的查找过程与原来相同）为止。
+        """
+        pattern = self._find_pattern; plen = len(pattern); starts = self._find_starts
+        delta = added - removed
+        head = bisect_left(starts, position - plen + 1)  # 之前的命中完整位于编辑点之前
+        tail = bisect_left(starts, position + removed)   # 之后的命中（旧坐标）
+        after = starts[tail:]
+        base = max(0, position - plen + 1, starts[head - 1] + plen if head else 0)
+        limit = self.document().characterCount() - 1
+        # 没有后续命中时，编辑区之后不可能出现新命中（否则原来就会被找到）
+        end = min(limit, position + added + 2 * plen)
+        text = self._text_range(base, end) if end > base else ''
+        found = []; j = 0; i = 0; resync = None
+        while True:
+            idx = text.find(pattern, i)
+            if idx == -1:
+                if j < len(after) and end < limit:
+                    end = min(limit, max(after[j] + delta + plen, end + 4096)); text = self._text_range(base, end); continue
+                break
+            p = base + idx
+            while j < len(after) and after[j] + delta < p: j += 1  # 与新命中重叠的旧命中
+            if j < len(after) and after[j] + delta == p: resync = j; break
+            found.append(p); i = idx + plen
+        new_tail = found + ([s + delta for s in after[resync:]] if resync is not None else [])
+        # 当前命中：跟随原来的位置（被删除时落到编辑点之后的第一个）
+        current = self._find_current
+        if 0 <= current < len(starts):
+            target = starts[current] if current < head else (starts[current] + delta if current >= tail else position)
+        else: target = position
+        self._find_starts[head:] = new_tail
+        self._find_matches[head:] = [(s, plen) for s in new_tail]
+        total = len(self._find_starts)
+        self._find_current = min(bisect_left(self._find_starts, target), total - 1) if total else -1
+        self._find_window = None; self._find_refresh_timer.start(0)
+        self.findMatchesChanged.emit(self._find_current, total)
+
+    def set_find_current(self, index: int):
+        """切换当前命中：只重设旧、新两处的格式；新命中不在已高亮范围内时由随后的滚动重建。"""
+        old = self._find_current; self._find_current = index
+        if self._find_window is None: return
+        first, last = self._find_window[:2]
+        changed = False
+        for i in (old, index):
+            if first <= i < last:
+                self._find_selections[i - first].format = self._find_format(i == index); changed = True
+        if changed: self.setExtraSelections(self._find_selections)
+
+    def _find_format(self, current: bool):
+        fmt = QTextCharFormat(); fmt.setBackground(FIND_CURRENT_COLOR if current else FIND_COLOR)
+        return fmt
+
+    def _visible_range(self):
+        viewport = self.viewport()
+        top = self.cursorForPosition(QPoint(0, 0)).position()
+        bottom = self.cursorForPosition(QPoint(viewport.width(), viewport.height())).position()
+        return top, max(top, bottom)
+
+    def refresh_find_highlight(self, force: bool = True):
+        if not self._find_matches:
+            if self._find_window is not None or force:
+                self._find_window = None; self._find_selections = []; self.setExtraSelections([])
+            return
+        top, bottom = self._visible_range()
+        if not force and self._find_window and self._find_window[2] <= top and bottom <= self._find_window[3]:
+            return  # 视口仍在已高亮范围内
+        page = bottom - top
+        lo = max(0, top - page); hi = bottom + page
+        first = max(0, bisect_left(self._find_starts, lo) - 1)
+        last = bisect_left(self._find_starts, hi + 1)
+        document = self.document(); selections = []
+        for i in range(first, last):
+            pos, length = self._find_matches[i]
+            sel = QTextEdit.ExtraSelection(); cursor = QTextCursor(document)
+            cursor.setPosition(pos); cursor.setPosition(pos + length, QTextCursor.MoveMode.KeepAnchor)
+            sel.cursor = cursor; sel.format = self._find_format(i == self._find_current)
+            selections.append(sel)
+        self._find_window = (first, last, lo, hi); self._find_selections = selections
+        self.setExtraSelections(selections)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._find_matches: self.refresh_find_highlight(False)
+
+    def after_next_paint(self, callback):
+        """下一次绘制正文后调用一次 callback（用于记录打开章节到首次绘制的耗时）。"""
+        self._after_paint = callback; self.viewport().update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self._after_paint is not None:
+            callback, self._after_paint = self._after_paint, None
+            callback()
+
     def wheelEvent(self, event: QWheelEvent):
         if QApplication.keyboardModifiers() == Qt.KeyboardModifier.ControlModifier:
             delta = 1 if event.angleDelta().y() > 0 else -1
@@ -24,6 +24,8 @@ ICON_DATA = {
     "explorer": """<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24' fill='none' stroke='currentColor' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'><rect x='3' y='4' width='18' height='16' rx='2'/><path d='M9 4v16'/><path d='M3 10h18'/></svg>""",
     # search: 与 find 保持一致，可做语义区分（或后续换成全局检索特征）
     "search": """<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24' fill='none' stroke='currentColor' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'><circle cx='11' cy='11' r='6'/><path d='m17 17 4 4'/></svg>""",
+    # stats: 柱状图（字数统计面板）
+    "stats": """<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24' fill='none' stroke='currentColor' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'><path d='M4 20h16'/><path d='M7 16v-5'/><path d='M12 16V6'/><path d='M17 16v-8'/></svg>""",
     # settings: 对称六齿轮（外圈由 6 个缺口 + 中心圆），更清晰简洁
     "settings": """<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24' fill='none' stroke='currentColor' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'><circle cx='12' cy='12' r='3'/><path d='M12 2.5 13.2 5a1 1 0 0 0 .9.6l2.5.2-.9 2.2a1 1 0 0 0 .3 1.1l1.9 1.4-1.9 1.4a1 1 0 0 0-.3 1.1l.9 2.2-2.5.2a1 1 0 0 0-.9.6L12 21.5 10.8 19a1 1 0 0 0-.9-.6l-2.5-.2.9-2.2a1 1 0 0 0-.3-1.1L5.1 13l1.9-1.4a1 1 0 0 0 .3-1.1L6.4 8.3l2.5-.2a1 1 0 0 0 .9-.6L12 2.5Z'/></svg>""",
 }
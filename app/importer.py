@@ -0,0 +1,157 @@
+"""导入已有文稿：目录中的 .txt/.md，或按“第X章”标题切分的单个大文件。
+
+- 编码自动识别（UTF-8 / GBK / GB18030，见 config.IMPORT_ENCODINGS）；
+- 卷/章标题行按 config 中的前后缀识别（也可换成自定义正则），
+  目录导入时每个子目录为一卷，没有章节标题的文件整个作为一章（章名取文件名）；
+- 读取解析与写章节文件（原生格式 + 纯文本备份）都在进程池中进行；
+- 结构经 project_manager.batch() 一次提交，中途出错则结构与已写文件全部回滚。
+"""
+import os
+import re
+
+from .config import (CHAPTER_PREFIX, CHAPTER_SUFFIX, VOLUME_PREFIX, VOLUME_SUFFIX,
+                     IMPORT_CHAPTER_PATTERN, IMPORT_VOLUME_PATTERN, IMPORT_ENCODINGS)
+from .chapter_format import plain_to_native
+from .project_manager import batch, add_new_volume, add_new_chapter, save_chapter_content
+from .parallel import map_ordered, POOL_MIN_ITEMS
+
+IMPORT_EXTENSIONS = ('.txt', '.md')
+CHUNK_SIZE = 200
+_NUMERAL = r'[0-9０-９零〇一二三四五六七八九十百千万两]+'
+_DIGITS_RE = re.compile(r'(\d+)')
+
+
+def heading_pattern(prefix: str, suffix: str) -> str:
+    """“第十二章 风起” / “# 第12章：风起” 这类标题行；topic 为标题中的章节名部分。
+
+    章节名限 30 字且不含句读，避免把以“第三章”开头的正文句子当作标题。
+    """
+    return (rf'^[ \t　#]*{re.escape(prefix)}[ \t　]*{_NUMERAL}[ \t　]*{re.escape(suffix)}'
+            rf'[ \t　:：.、\-]*(?P<topic>[^\n，。！？]{{0,30}}?)[ \t　]*$')
+
+
+def default_patterns(chapter_pattern=None, volume_pattern=None):
+    return (chapter_pattern or IMPORT_CHAPTER_PATTERN or heading_pattern(CHAPTER_PREFIX, CHAPTER_SUFFIX),
+            volume_pattern or IMPORT_VOLUME_PATTERN or heading_pattern(VOLUME_PREFIX, VOLUME_SUFFIX))
+
+
+def decode_bytes(raw: bytes):
+    """返回 (文本, 编码)。依次尝试 IMPORT_ENCODINGS，都失败时按最后一种替换非法字节。"""
+    if raw.startswith((b'\xff\xfe', b'\xfe\xff')): return raw.decode('utf-16'), 'utf-16'
+    for encoding in IMPORT_ENCODINGS:
+        try: return raw.decode(encoding), encoding
+        except UnicodeDecodeError: continue
+    return raw.decode(IMPORT_ENCODINGS[-1], errors='replace'), IMPORT_ENCODINGS[-1]
+
+
+def normalize_text(text: str) -> str:
+    if '\r' in text: text = text.replace('\r\n', '\n').replace('\r', '\n')
+    # 段落/行分隔符在编辑器中有特殊含义，NUL 会被识别为压缩文件头
+    return text.replace('\u2028', '\n').replace('\u2029', '\n').replace('\x00', '')
+
+
+def _topic(match) -> str:
+    topic = match.groupdict().get('topic')
+    return (topic if topic is not None else match.group(0)).strip()
+
+
+def split_text(text: str, chapter_pattern: str, volume_pattern: str, default_topic: str = ''):
+    """按标题行切分，返回条目列表：('volume', 卷名) 或 ('chapter', 章节名, 正文)。
+
+    没有任何章节标题时整段文本作为一章（章名为 default_topic）；
+    第一个标题之前的非空内容作为“前言”一章。
+    """
+    marks = {m.start(): (m.end(), 'chapter', _topic(m)) for m in re.finditer(chapter_pattern, text, re.M)}
+    if not marks: return [('chapter', default_topic, text.strip('\n'))]
+    # 同一行同时匹配时按卷处理
+    marks.update({m.start(): (m.end(), 'volume', _topic(m)) for m in re.finditer(volume_pattern, text, re.M)})
+    starts = sorted(marks)
+    entries = []
+    head = text[:starts[0]].strip('\n')
+    if head.strip(): entries.append(('chapter', '前言', head))
+    for i, start in enumerate(starts):
+        end, kind, topic = marks[start]
+        if kind == 'volume': entries.append(('volume', topic)); continue
+        body_end = starts[i + 1] if i + 1 < len(starts) else len(text)
+        entries.append(('chapter', topic, text[end:body_end].strip('\n')))
+    return entries
+
+
+def parse_file(path: str, chapter_pattern: str, volume_pattern: str):
+    """读取并切分一个文件（进程池任务）。返回 (条目列表, 编码)。"""
+    with open(path, 'rb') as f: text, encoding = decode_bytes(f.read())
+    stem = os.path.splitext(os.path.basename(path))[0]
+    # 文件名本身就是“第2章 xxx”时只取章节名，编号按项目重新分配
+    match = re.match(chapter_pattern, stem)
+    if match and _topic(match): stem = _topic(match)
+    return split_text(normalize_text(text), chapter_pattern, volume_pattern, stem), encoding
+
+
+def _natural_key(name: str):
+    return [int(part) if part.isdigit() else part.lower() for part in _DIGITS_RE.split(name)]
+
+
+def collect_files(root: str):
+    """按目录分组、自然排序（“第2章”排在“第10章”之前）的 [(相对目录, [文件路径...])]。"""
+    groups = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort(key=_natural_key)
+        files = [os.path.join(dirpath, name) for name in sorted(filenames, key=_natural_key)
+                 if name.lower().endswith(IMPORT_EXTENSIONS)]
+        if files: groups.append((os.path.relpath(dirpath, root), files))
+    return groups
+
+
+def parse_source(path: str, chapter_pattern=None, volume_pattern=None, workers=None):
+    """解析文件或目录，返回 (条目列表, {编码: 文件数})。"""
+    chapter_pattern, volume_pattern = default_patterns(chapter_pattern, volume_pattern)
+    if os.path.isfile(path):
+        entries, encoding = parse_file(path, chapter_pattern, volume_pattern)
+        return entries, {encoding: 1}
+    groups = collect_files(path)
+    paths = [p for _, files in groups for p in files]
+    results = iter(map_ordered(parse_file, paths, workers if len(paths) >= POOL_MIN_ITEMS else 1, chapter_pattern, volume_pattern))
+    entries = []; encodings = {}
+    root_name = os.path.basename(os.path.normpath(path))
+    for rel_dir, files in groups:
+        entries.append(('volume', root_name if rel_dir == os.curdir else rel_dir.replace(os.sep, ' / ')))
+        for _ in files:
+            file_entries, encoding = next(results)
+            entries.extend(file_entries); encodings[encoding] = encodings.get(encoding, 0) + 1
+    return entries, encodings
+
+
+def _write_chunk(chunk, project_path):
+    """写一批章节（进程池任务）：纯文本 -> 原生格式，经 save_chapter_content 落盘并生成备份。"""
+    for filename, text in chunk:
+        success, msg = save_chapter_content(project_path, filename, plain_to_native(text))
+        if not success: raise OSError(f'{filename}: {msg}')
+    return len(chunk)
+
+
+def import_entries(project_path, data, entries, source_name: str, workers=None):
+    """把解析出的条目一次性加入项目结构，返回 (新卷数, 新章数)。失败时全部回滚并抛出异常。"""
+    volumes = chapters = 0; jobs = []
+    with batch(project_path, data) as pending:
+        volume = None
+        for entry in entries:
+            if entry[0] == 'volume' or volume is None:
+                add_new_volume(data, entry[1] if entry[0] == 'volume' else source_name)
+                volume = data['structure'][-1]; volumes += 1
+                if entry[0] == 'volume': continue
+            if not add_new_chapter(project_path, data, volume['id'], entry[1]):
+                raise OSError(f'无法创建章节：{entry[1]}')
+            filename = volume['children'][-1]['filename']
+            pending.claim(os.path.join(project_path, 'chapters', filename))
+            jobs.append((filename, entry[2])); chapters += 1
+        chunks = [jobs[i:i + CHUNK_SIZE] for i in range(0, len(jobs), CHUNK_SIZE)]
+        map_ordered(_write_chunk, chunks, workers if len(jobs) >= POOL_MIN_ITEMS else 1, project_path)
+    return volumes, chapters
+
+
+def import_manuscript(project_path, data, path, chapter_pattern=None, volume_pattern=None, workers=None):
+    """导入文件或目录到项目末尾。返回 (新卷数, 新章数, {编码: 文件数})。"""
+    entries, encodings = parse_source(path, chapter_pattern, volume_pattern, workers)
+    source_name = os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+    volumes, chapters = import_entries(project_path, data, entries, source_name, workers)
+    return volumes, chapters, encodings
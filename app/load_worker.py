@@ -0,0 +1,103 @@
+"""后台载入：读取章节、校验编辑日志并构建 QTextDocument 在工作线程完成，GUI 线程只把建好的文档装进编辑器。
+
+空闲时按预取列表（当前章节的前后章、常开的章节）预先构建文档放进 ChapterCache，
+打开这些章节时只需 clone() 一份，不读盘、不解析。
+"""
+import threading
+import time
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QTextDocument
+
+from .project_manager import load_chapter_content
+from .chapter_format import load_into_document
+from .chapter_journal import ensure_journal
+from .text_stats import block_counts
+from .chapter_cache import ChapterCache, file_stamp
+
+
+class ChapterLoadWorker(QObject):
+    """按请求顺序载入章节。
+
+    文档在工作线程中创建（无父对象、未排版），连同逐段字数统计（BlockStats 的初值）一起算好后
+    移交到 GUI 线程，通过 ``loaded`` 信号 (token, document, 逐段统计, 耗时秒) 异步送回。尚未开始的请求可以取消。
+    请求总是优先于预取；cache_bytes 为 0 时不缓存也不预取。
+    """
+    loaded = pyqtSignal(object, object, object, float)
+
+    def __init__(self, project_path: str, cache_bytes: int = 0, parent=None):
+        super().__init__(parent)
+        self.project_path = project_path
+        self.cache = ChapterCache(project_path, cache_bytes) if cache_bytes > 0 else None
+        self._pending: dict = {}  # token -> (filename, font)
+        self._prefetch: list = []  # [(filename, font)]，新的列表整体替换旧的
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='chapter-load', daemon=True)
+        self._thread.start()
+
+    def request(self, token, filename: str, font):
+        """font 为文档默认字体（含基准字号），正文字号统一跟随它。"""
+        with self._cond:
+            self._pending[token] = (filename, font)
+            self._cond.notify()
+
+    def cancel(self, token):
+        with self._cond: self._pending.pop(token, None)
+
+    def prefetch(self, filenames, font):
+        """按顺序预取（替换尚未完成的预取列表）。"""
+        if self.cache is None: return
+        with self._cond:
+            self._prefetch = [(filename, font) for filename in filenames]
+            self._cond.notify()
+
+    def stop(self, timeout: float | None = None):
+        with self._cond:
+            self._pending.clear(); self._prefetch = []; self._stopped = True; self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._pending or self._prefetch or self._stopped)
+                    if self._stopped: return
+                    if self._pending:
+                        token = next(iter(self._pending)); filename, font = self._pending.pop(token)
+                    else:
+                        token = None; filename, font = self._prefetch.pop(0)
+                if token is None: self._warm(filename, font); continue
+                started = time.perf_counter()
+                cached = self.cache.get(filename, font.toString()) if self.cache is not None else None
+                if cached is not None: document, blocks = cached
+                else: document, blocks, cached = self._build(filename, font)
+                if cached:  # 缓存中的文档留在本线程，交出副本；BlockStats 会就地修改逐段统计
+                    document = document.clone(); blocks = list(blocks)
+                # 载入不算修改：以当前内容作为“已保存”基准
+                document.clearUndoRedoStacks(); document.setModified(False)
+                document.moveToThread(self.thread())
+                self.loaded.emit(token, document, blocks, time.perf_counter() - started)
+        finally:
+            if self.cache is not None: self.cache.clear()  # 缓存的文档属于本线程，在这里释放
+
+    def _build(self, filename, font):
+        """读盘、重放日志并构建文档，返回 (document, 逐段统计, 是否已放入缓存)。"""
+        # 先校验编辑日志再取戳：日志头被重建不会让刚放入的条目立即失效
+        try: ensure_journal(self.project_path, filename)
+        except Exception: pass
+        stamp = file_stamp(self.project_path, filename)
+        document = QTextDocument(); document.setDefaultFont(font)
+        try:
+            content = load_chapter_content(self.project_path, filename)
+            load_into_document(content, document, uniform_size=True)
+            ok = not content.startswith('错误：')
+        except Exception as e:
+            document.setPlainText(f"错误：载入章节失败\n{e}"); ok = False
+        document.clearUndoRedoStacks()
+        blocks = block_counts(document)
+        cached = ok and self.cache is not None and self.cache.put(filename, stamp, font.toString(), document, blocks)
+        return document, blocks, cached
+
+    def _warm(self, filename, font):
+        if (filename, font.toString()) in self.cache: return
+        self._build(filename, font)
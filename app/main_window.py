@@ -1,15 +1,18 @@
 """MainWindow 主窗口：精简修复版本。"""
 
+import json
 import logging
 import os
-from PyQt6.QtCore import Qt, QModelIndex, QTimer, QPoint
+import re
+import time
+from PyQt6.QtCore import Qt, QModelIndex, QPersistentModelIndex, QTimer, QPoint
 from PyQt6.QtGui import (
     QPainter, QPixmap, QColor, QAction, QKeySequence, QFont,
-    QTextCharFormat, QTextCursor, QTextBlockFormat
+    QTextCharFormat, QTextCursor, QTextBlockFormat, QTextDocument
 )
 from PyQt6.QtWidgets import (
     QMainWindow, QSplitter, QStatusBar, QLabel, QMenu, QMessageBox,
-    QInputDialog, QTextEdit, QPushButton
+    QInputDialog, QTextEdit, QPushButton, QFileDialog, QApplication, QListWidgetItem, QProgressDialog
 )
 
 from .widgets.activity_bar import ActivityBar
@@ -18,9 +21,26 @@ from .widgets.editor_panel import EditorPanel
 from .custom_widgets import AdvancedTextEdit
 from .settings_manager import load_settings, save_settings
 from .settings_dialog import SettingsDialog
+from .save_worker import ChapterSaveWorker
+from .load_worker import ChapterLoadWorker
+from .structure_store import StructureStore
+from .chapter_journal import capture_op, merge_op
+from .importer import import_manuscript
+from .search_index import SearchIndex, IndexUpdater
+from .project_search import ProjectSearchWorker, compile_query, locate_match
+from .project_replace import scan_project, replace_in_document, ProjectReplaceWorker
+from .replace_dialog import ReplacePreviewDialog
+from .text_stats import BlockStats, calc_text_stats, STAT_KEYS
+from .project_stats import ProjectStats, StatsUpdater
+from .stats_dialog import StatsDashboard
+from .progress_log import ProgressLog
+from .tab_memory import estimate_document_bytes, pick_hibernation
+from .config import (JOURNAL_COMPACT_THRESHOLD, STATUS_REFRESH_MS, TAB_MEMORY_BUDGET_MB,
+                     CHAPTER_CACHE_MB, PREFETCH_AFTER, PREFETCH_BEFORE, PREFETCH_FREQUENT)
 from .project_manager import (
-    load_chapter_content, save_chapter_content, save_project_structure,
-    add_new_chapter, delete_item, add_new_volume, rename_item_in_structure
+    save_chapter_content, save_project_structure,
+    add_new_chapter, delete_item, add_new_volume, rename_item_in_structure,
+    get_last_chapter, merge_and_delete_volume, add_change_listener, remove_change_listener
 )
 
 logging.basicConfig(filename='debug.log', level=logging.INFO, format='%(asctime)s %(message)s')
@@ -44,12 +64,26 @@ class MainWindow(QMainWindow):
         self.open_tabs: dict = {}
         self.bg_pixmap = None
         self.auto_save_timer: QTimer | None = None
+        self.save_worker: ChapterSaveWorker | None = None
+        self.load_worker: ChapterLoadWorker | None = None
+        self._load_serial = 0
+        self.structure_store: StructureStore | None = None
+        self.search_index: SearchIndex | None = None
+        self.index_updater: IndexUpdater | None = None
+        self.stats_updater: StatsUpdater | None = None
+        self.progress_log: ProgressLog | None = None
+        self.search_worker = ProjectSearchWorker(self); self._search_token = 0; self._search_pattern = None
+        self.replace_worker = ProjectReplaceWorker(self); self._replace_job = None
+        self.replace_worker.progress.connect(self._on_replace_progress); self.replace_worker.finished.connect(self._on_replace_finished)
+        self.search_worker.hits.connect(self._on_search_hits); self.search_worker.finished.connect(self._on_search_finished)
         self._side_visible = True
         self._saved_split_sizes = None
         self.current_find_pattern = ''
         self.current_find_index = 0
         self._current_find_matches = []
         self._current_find_pattern_cache = ''
+        self.status_refresh_timer = QTimer(self); self.status_refresh_timer.setSingleShot(True)
+        self.status_refresh_timer.setInterval(STATUS_REFRESH_MS); self.status_refresh_timer.timeout.connect(self.update_status_bar)
         self.setup_ui()
         self.apply_runtime_settings()
         self.load_project(project_path)
@@ -76,6 +110,7 @@ class MainWindow(QMainWindow):
         # 信号
         self.activity_bar.selected.connect(lambda idx: self.nav_panel.stack.setCurrentIndex(idx))
         self.activity_bar.settings_clicked.connect(lambda: self.nav_panel.stack.setCurrentIndex(2))
+        self.activity_bar.stats_clicked.connect(self.show_stats_dashboard)
         self.editor_panel.save_requested.triggered.connect(self.save_current_tab)
         self.editor_panel.undo_action.triggered.connect(self.undo_current_tab)
         self.editor_panel.redo_action.triggered.connect(self.redo_current_tab)
@@ -99,6 +134,8 @@ class MainWindow(QMainWindow):
         # 导航面板信号
         self.nav_panel.tree_item_clicked.connect(self.open_chapter_in_tab)
         self.nav_panel.search_requested.connect(self.do_search)
+        self.nav_panel.search_hit_activated.connect(self.open_search_hit)
+        self.nav_panel.replace_requested.connect(self.do_replace)
         if hasattr(self.nav_panel, 'find_submitted'):
             self.nav_panel.find_submitted.connect(self.find_in_current_chapter_submit)
             self.nav_panel.find_prev_requested.connect(self.find_in_current_prev)
@@ -124,7 +161,7 @@ class MainWindow(QMainWindow):
     # 设置与外观
     def apply_runtime_settings(self):
         if not self.auto_save_timer:
-            self.auto_save_timer = QTimer(self); self.auto_save_timer.setSingleShot(True); self.auto_save_timer.timeout.connect(self.save_current_tab)
+            self.auto_save_timer = QTimer(self); self.auto_save_timer.setSingleShot(True); self.auto_save_timer.timeout.connect(self.autosave_tabs)
         self.auto_save_timer.setInterval(self.settings.get('auto_save_interval',3000))
         self.apply_background()
         try:
@@ -144,11 +181,22 @@ class MainWindow(QMainWindow):
             if hasattr(editor,'set_enter_mode'): editor.set_enter_mode(self.settings.get('enter_mode','fullwidth'))
             try:
                 percent = self.settings.get('line_spacing_percent',150)
-                cursor = QTextCursor(editor.document()); cursor.beginEditBlock(); cursor.select(QTextCursor.SelectionType.Document)
-                fmt = QTextBlockFormat(); fmt.setLineHeight(percent, QTextBlockFormat.LineHeightTypes.ProportionalHeight); cursor.setBlockFormat(fmt); cursor.endEditBlock()
+                # 行距已一致时不再重设，避免产生无实际变化的修改与保存
+                if not self._line_spacing_applied(editor.document(), percent):
+                    cursor = QTextCursor(editor.document()); cursor.beginEditBlock(); cursor.select(QTextCursor.SelectionType.Document)
+                    fmt = QTextBlockFormat(); fmt.setLineHeight(percent, QTextBlockFormat.LineHeightTypes.ProportionalHeight.value); cursor.setBlockFormat(fmt); cursor.endEditBlock()
             except Exception: pass
         self.font_combo.setCurrentFont(QFont(self.settings.get('editor_font_family'))); self.font_size_spin.setValue(self.settings.get('editor_font_size'))
 
+    @staticmethod
+    def _line_spacing_applied(document, percent) -> bool:
+        block = document.begin(); proportional = QTextBlockFormat.LineHeightTypes.ProportionalHeight.value
+        while block.isValid():
+            fmt = block.blockFormat()
+            if fmt.lineHeightType() != proportional or fmt.lineHeight() != percent: return False
+            block = block.next()
+        return True
+
     def reload_settings_and_apply(self):
         self.settings = load_settings()['settings']; self.apply_runtime_settings()
 
@@ -175,36 +223,209 @@ class MainWindow(QMainWindow):
 
     # 项目 / 章节
     def load_project(self, project_path: str):
+        if self.project_path: self.nav_panel.save_tree_state()
         self.project_path = project_path; self.nav_panel.load_project(project_path); self.project_data = self.nav_panel.project_data
+        if self.save_worker: self.save_worker.stop()
+        self.save_worker = ChapterSaveWorker(project_path, self); self.save_worker.saved.connect(self.on_chapter_saved)
+        # 后台载入与预取：预取缓存随章节保存/删除失效
+        self._stop_load_worker()
+        self.load_worker = ChapterLoadWorker(project_path, CHAPTER_CACHE_MB * 1024 * 1024, self); self.load_worker.loaded.connect(self._on_chapter_loaded)
+        if self.load_worker.cache: add_change_listener(self.load_worker.cache.notify)
+        if self.structure_store: self.structure_store.close()
+        # 结构修改先记入 oplog，连续修改合并为一次 project.json 写入
+        self.structure_store = StructureStore(project_path, self.project_data, self)
+        self.structure_store.changed.connect(self.on_structure_changed)
+        self.structure_store.flush_failed.connect(lambda err: QMessageBox.critical(self, '严重错误', f'无法保存 project.json\n{err}'))
+        if self.search_index: self.search_index.close()
+        self.search_index = None  # 首次正文搜索时打开
+        self._stop_index_updater()
+        # 全文索引在后台维护：启动时建立或对账，之后随章节保存/删除增量更新
+        self.index_updater = IndexUpdater(project_path); add_change_listener(self.index_updater.notify)
+        # 逐章字数统计缓存（chapter_stats.json）同样在后台对账与更新
+        self._stop_stats_updater()
+        self.stats_updater = StatsUpdater(project_path, ProjectStats(project_path)); add_change_listener(self.stats_updater.notify)
+        self.progress_log = ProgressLog(project_path)
+
+    def closeEvent(self, event):
+        # 有未保存编辑（含尚未追加到日志的增量）或日志里还有增量的标签在退出前压缩为完整文件，
+        # 下次打开不必重放日志
+        for cid in self._live_tabs():
+            info = self.open_tabs[cid]
+            if (info['editor'].document().isModified() or info.get('journal_ops') or info.get('journal_bytes')
+                    or info.get('needs_compact')): self._compact_tab(cid)
+        # 等待后台保存队列写完再关闭，避免丢失最后一次快照
+        if self.save_worker: self.save_worker.stop()
+        self._stop_load_worker()
+        if self.structure_store: self.structure_store.close()
+        if self.search_index: self.search_index.close()
+        self._stop_index_updater()
+        self._stop_stats_updater()
+        self.search_worker.cancel()
+        self.replace_worker.cancel(); self.replace_worker.wait()  # 写回已开始时等它完成（原子写回不可中断）
+        self.nav_panel.save_tree_state()
+        super().closeEvent(event)
+
+    def _stop_load_worker(self):
+        if self.load_worker:
+            if self.load_worker.cache: remove_change_listener(self.load_worker.cache.notify)
+            self.load_worker.stop(); self.load_worker = None
+
+    def _stop_index_updater(self):
+        if self.index_updater:
+            remove_change_listener(self.index_updater.notify); self.index_updater.stop(); self.index_updater = None
+
+    def _stop_stats_updater(self):
+        if self.stats_updater:
+            remove_change_listener(self.stats_updater.notify); self.stats_updater.stop(); self.stats_updater = None
+
+    def show_stats_dashboard(self):
+        """字数统计面板：未打开的章节取统计缓存，已打开的标签取编辑器中的实时统计。"""
+        if not self.project_data or not self.stats_updater:
+            return
+        if self.stats_updater.error is not None:
+            # 统计缓存上次更新失败：后台对账重试，面板按“仍在统计中”显示
+            self.status_bar.showMessage(f'字数统计缓存更新失败，正在重新统计：{self.stats_updater.error}', 4000)
+            self.stats_updater.refresh()
+        counts = self.stats_updater.stats.snapshot()
+        for info in self.open_tabs.values():
+            if info.get('stats'):
+                totals = info['stats'].totals(); counts[info['filename']] = [totals[k] for k in STAT_KEYS]
+        StatsDashboard(self.project_data.get('structure', []), counts, not self.stats_updater.ready.is_set() or self.stats_updater.error is not None,
+                       self.progress_log, self.settings.get('daily_goal', 0), self).exec()
+
+    def on_structure_changed(self, ops):
+        # 目录树按操作逐行更新（单个操作或整个批次），不重建、不重新读取 project.json
+        self.nav_panel.apply_structure_ops(ops)
 
     def refresh_tree_view(self):
-        if self.project_path: self.nav_panel.load_project(self.project_path); self.project_data = self.nav_panel.project_data
+        # 整体重建：内存中的结构即为最新，保持同一对象以复用结构索引；展开状态经 tree_state.json 保留
+        if self.project_path: self.nav_panel.save_tree_state(); self.nav_panel.load_project(self.project_path, self.project_data)
 
     def open_chapter_in_tab(self, index: QModelIndex):
-        item = self.tree_model.itemFromIndex(index)
-        if item.data(Qt.ItemDataRole.UserRole) != 'chapter': return
-        chap_id = item.data(Qt.ItemDataRole.UserRole+1)
+        if index.data(Qt.ItemDataRole.UserRole) != 'chapter': return
+        chap_id = index.data(Qt.ItemDataRole.UserRole+1)
         if chap_id in self.open_tabs:
             self.tab_widget.setCurrentWidget(self.open_tabs[chap_id]['editor']); return
-        filename = item.data(Qt.ItemDataRole.UserRole+2)
+        filename = index.data(Qt.ItemDataRole.UserRole+2)
         if not filename: return
-        html = load_chapter_content(self.project_path, filename)
-        editor = AdvancedTextEdit(); editor.setFont(QFont(self.font_combo.currentFont().family(), self.font_size_spin.value())); editor.setHtml(html)
+        clicked = time.perf_counter()
+        editor = AdvancedTextEdit(); editor.setFont(QFont(self.font_combo.currentFont().family(), self.font_size_spin.value()))
         base_size = self.settings.get('editor_font_size', self.font_size_spin.value())
-        try:
-            cursor = QTextCursor(editor.document()); cursor.beginEditBlock(); cursor.select(QTextCursor.SelectionType.Document)
-            fmt_all = QTextCharFormat(); fmt_all.setFontPointSize(base_size); cursor.mergeCharFormat(fmt_all); cursor.endEditBlock()
-            base_font = editor.document().defaultFont(); base_font.setPointSize(base_size); editor.document().setDefaultFont(base_font)
-        except Exception: pass
+        info = {'editor': editor,'original_title': index.data(),'filename': filename,'current_font_size': base_size,
+                'journal_ops': [], 'journal_bytes': 0, 'last_active': time.monotonic(), 'clicked': clicked}
         editor.set_enter_mode(self.settings.get('enter_mode','fullwidth'))
         editor.fontZoomRequested.connect(self.handle_editor_zoom)
+        editor.findMatchesChanged.connect(lambda cur, total, e=editor: self._on_find_matches_changed(e, cur, total))
         if self.bg_pixmap: editor.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True); editor.setStyleSheet(editor.styleSheet()+"\nbackground: transparent;")
         editor.textChanged.connect(lambda e=editor: self.mark_tab_as_dirty(e))
         editor.cursorPositionChanged.connect(self.update_format_toolbar_state)
-        tab_index = self.tab_widget.addTab(editor, item.text()); self.tab_widget.setCurrentIndex(tab_index)
-        self.open_tabs[chap_id] = {'editor': editor,'original_title': item.text(),'filename': filename,'current_font_size': base_size}
+        # 先显示空白的占位标签，章节在后台读取并构建文档，完成后换入（_on_chapter_loaded）
+        self.open_tabs[chap_id] = info; self.nav_panel.record_open(chap_id)
+        self._load_tab_document(chap_id, info)
+        tab_index = self.tab_widget.addTab(editor, index.data()); self.tab_widget.setCurrentIndex(tab_index)
         self.update_ui_on_tab_change()
 
+    def _load_tab_document(self, cid, info):
+        """请求后台载入章节（打开标签与唤醒休眠标签共用）；载入期间编辑器只读并显示占位提示。"""
+        editor = info['editor']
+        if info.get('loading'): self.load_worker.cancel(info['loading'])
+        self._load_serial += 1; info['loading'] = (cid, self._load_serial); info['stats'] = None
+        editor.setReadOnly(True); editor.setPlaceholderText('正在载入…')
+        # 基准字号记在文档默认字体中，正文不再逐字写入字号（见 load_into_document 的 uniform_size）
+        font = QFont(editor.font()); font.setPointSize(info['current_font_size'])
+        self.load_worker.request(info['loading'], info['filename'], font)
+
+    def _prefetch_around(self, cid):
+        """后台预取当前章节在目录中的前后章与常开的章节（已打开且未休眠的标签除外）。"""
+        if not self.load_worker or not self.load_worker.cache: return
+        filenames = []
+        for chapter in (self.nav_panel.adjacent_chapters(cid, PREFETCH_BEFORE, PREFETCH_AFTER)
+                        + self.nav_panel.frequent_chapters(PREFETCH_FREQUENT)):
+            info = self.open_tabs.get(chapter.get('id'))
+            if info and not info.get('hibernated'): continue
+            if chapter.get('filename') and chapter['filename'] not in filenames: filenames.append(chapter['filename'])
+        # 与新开标签的文档默认字体一致（见 open_chapter_in_tab / _load_tab_document），否则缓存不会命中
+        font = QFont(self.font_combo.currentFont().family(), self.font_size_spin.value())
+        font.setPointSize(self.settings.get('editor_font_size', self.font_size_spin.value()))
+        self.load_worker.prefetch(filenames, font)
+
+    def _on_chapter_loaded(self, token, document, blocks, seconds: float):
+        """后台建好的文档装入编辑器并连接文档级信号；唤醒的标签恢复光标与滚动位置。"""
+        cid = token[0]; info = self.open_tabs.get(cid)
+        if not info or info.get('loading') != token: return  # 标签已关闭或已重新请求
+        editor = info['editor']; info['loading'] = None
+        document.setParent(editor)
+        placeholder = editor.document(); owned = placeholder.parent() is editor
+        editor.blockSignals(True)
+        editor.setDocument(document)
+        if owned: placeholder.deleteLater()  # 编辑器自带的文档在 setDocument 时已删除
+        state = info.pop('hibernated', None)
+        if state:
+            limit = document.characterCount() - 1; cursor = editor.textCursor()
+            cursor.setPosition(min(state[0], limit)); cursor.setPosition(min(state[1], limit), QTextCursor.MoveMode.KeepAnchor)
+            editor.setTextCursor(cursor)
+        editor.blockSignals(False)
+        editor.setReadOnly(False); editor.setPlaceholderText('')
+        if state: editor.verticalScrollBar().setValue(state[2]); editor.horizontalScrollBar().setValue(state[3])
+        if 'select_on_load' in info: self._select_range(editor, *info.pop('select_on_load'))
+        block_stats = BlockStats(document, blocks=blocks)
+        document.contentsChange.connect(lambda p, r, a, cid=cid: self._record_edit(cid, p, r, a))
+        document.modificationChanged.connect(lambda m, cid=cid: self._update_dirty_marker(cid, m))
+        info['stats'] = block_stats; info['logged_chars'] = block_stats.totals()['chars_no_space']
+        clicked = info.pop('clicked', None)
+        if clicked is not None:
+            editor.after_next_paint(lambda: logging.info(
+                f"打开章节 {info['filename']}：点击到首次绘制 {(time.perf_counter() - clicked) * 1000:.0f} ms（后台读取与构建 {seconds * 1000:.0f} ms）"))
+        if editor is self.tab_widget.currentWidget():
+            self.update_status_bar(); self.update_format_toolbar_state()
+
+    # ---------- 标签休眠 ----------
+    def tab_memory_estimates(self) -> dict:
+        """{章节 id: 估算字节}；休眠或载入中的标签为 0。"""
+        live = self._live_tabs()
+        return {cid: estimate_document_bytes(info['editor'].document()) if cid in live else 0
+                for cid, info in self.open_tabs.items()}
+
+    def _live_tabs(self) -> dict:
+        """未休眠、已载入完成的标签（编辑器中有实际内容）。"""
+        return {cid: info for cid, info in self.open_tabs.items() if not info.get('hibernated') and not info.get('loading')}
+
+    def enforce_tab_memory_budget(self):
+        """超出 TAB_MEMORY_BUDGET_MB 时休眠最久未用的标签：已保存的直接释放文档；
+        有未保存内容（含日志）的先完整保存，写完后（on_chapter_saved）再休眠。当前标签不休眠。"""
+        if not TAB_MEMORY_BUDGET_MB or not self.save_worker: return
+        estimates = self.tab_memory_estimates(); current = self.tab_widget.currentWidget()
+        for cid, size in estimates.items():
+            idx = self.tab_widget.indexOf(self.open_tabs[cid]['editor'])
+            if idx != -1: self.tab_widget.setTabToolTip(idx, '已休眠，切换时重新载入' if self.open_tabs[cid].get('hibernated') else f'约 {size / 1048576:.1f} MB')
+        tabs = [(cid, info.get('last_active', 0), estimates[cid]) for cid, info in self._live_tabs().items()]
+        keep = {cid for cid, info in self.open_tabs.items() if info['editor'] is current}
+        for cid in pick_hibernation(tabs, TAB_MEMORY_BUDGET_MB * 1024 * 1024, keep):
+            info = self.open_tabs[cid]
+            if info['editor'].document().isModified() or info['journal_ops'] or info['journal_bytes'] or info.get('needs_compact'):
+                self._compact_tab(cid)
+            elif not self.save_worker.is_pending(info['filename']):
+                self._hibernate_tab(cid)
+
+    def _hibernate_tab(self, cid):
+        """释放标签的文档（正文、排版与撤销栈），只保留光标与滚动位置；标签本身不变。"""
+        info = self.open_tabs[cid]; editor = info['editor']; cursor = editor.textCursor()
+        info['hibernated'] = (cursor.anchor(), cursor.position(), editor.verticalScrollBar().value(), editor.horizontalScrollBar().value())
+        editor.set_find_matches([])
+        if getattr(self, '_find_editor', None) is editor: self._find_editor = None
+        info['stats'] = None
+        old = editor.document(); owned = old.parent() is editor
+        editor.blockSignals(True); editor.setDocument(QTextDocument(editor)); editor.blockSignals(False)
+        if owned: old.deleteLater()  # 编辑器自带的文档在 setDocument 时已删除，唤醒时新建的需手动释放
+        idx = self.tab_widget.indexOf(editor)
+        if idx != -1: self.tab_widget.setTabToolTip(idx, '已休眠，切换时重新载入')
+
+    def _wake_tab(self, cid):
+        """重新载入休眠的标签；载入完成后恢复光标与滚动位置（_on_chapter_loaded）。"""
+        info = self.open_tabs[cid]
+        if self.save_worker.is_pending(info['filename']): self.save_worker.flush()  # 读到的须是最后一次写入
+        self._load_tab_document(cid, info)
+
     # 编辑状态
     def mark_tab_as_dirty(self, editor):
         self.update_status_bar(); idx = self.tab_widget.indexOf(editor)
@@ -301,7 +522,7 @@ class MainWindow(QMainWindow):
     def show_tree_context_menu(self, position: QPoint):
         index = self.tree_view.indexAt(position); menu = QMenu(self)
         if index.isValid():
-            item = self.tree_model.itemFromIndex(index)
+            item = QPersistentModelIndex(index)
             if item.data(Qt.ItemDataRole.UserRole)=='volume': menu.addAction('新建章节', lambda: self.handle_new_chapter(item))
             menu.addAction('重命名', lambda: self.handle_rename_item(item)); menu.addAction('删除', lambda: self.handle_delete_item(item))
         else: menu.addAction('新建卷', self.handle_new_volume)
@@ -321,13 +542,13 @@ class MainWindow(QMainWindow):
             else: QMessageBox.warning(self,'错误','创建新章节失败')
 
     def handle_rename_item(self, item):
-        item_id = item.data(Qt.ItemDataRole.UserRole+1); old = item.text(); new, ok = QInputDialog.getText(self,'重命名','新的名称：', text=old)
+        item_id = item.data(Qt.ItemDataRole.UserRole+1); old = item.data(); new, ok = QInputDialog.getText(self,'重命名','新的名称：', text=old)
         if ok and new and new!=old:
             if rename_item_in_structure(self.project_data, item_id, new): self.save_and_refresh('已重命名')
             else: QMessageBox.warning(self,'错误','重命名失败')
 
     def handle_delete_item(self, item):
-        item_id = item.data(Qt.ItemDataRole.UserRole+1); title = item.text(); is_volume = item.data(Qt.ItemDataRole.UserRole)=='volume'
+        item_id = item.data(Qt.ItemDataRole.UserRole+1); title = item.data(); is_volume = item.data(Qt.ItemDataRole.UserRole)=='volume'
         if not is_volume:
             all_chapters=[]
             for vol in self.project_data.get('structure', []):
@@ -476,27 +697,35 @@ class MainWindow(QMainWindow):
 
     # ---------- 编辑/状态 ----------
     def mark_tab_as_dirty(self, editor):
-        self.update_status_bar()
+        self.schedule_status_bar_update()
         idx = self.tab_widget.indexOf(editor)
         if idx == -1:
             return
-        # 找到原始标题
-        for cid, info in self.open_tabs.items():
-            if info['editor'] == editor:
-                original = info['original_title']
-                break
-        else:
-            return
-        if not self.tab_widget.tabText(idx).endswith(' ●'):
-            self.tab_widget.setTabText(idx, f"{original} ●")
+        # 未保存标记 ● 由 document 的 modificationChanged 维护（撤销回保存点时自动清除）
         if self.auto_save_timer and self.auto_save_timer.isActive():
             self.auto_save_timer.stop()
         if self.auto_save_timer:
             self.auto_save_timer.start()
 
+    def _update_dirty_marker(self, cid, modified: bool):
+        info = self.open_tabs.get(cid)
+        if not info: return
+        idx = self.tab_widget.indexOf(info['editor'])
+        if idx != -1:
+            self.tab_widget.setTabText(idx, f"{info['original_title']} ●" if modified else info['original_title'])
+
     def update_ui_on_tab_change(self):
+        editor = self.tab_widget.currentWidget()
+        for cid, info in self.open_tabs.items():
+            if info['editor'] is editor:
+                if info.get('hibernated') and not info.get('loading'): self._wake_tab(cid)
+                info['last_active'] = time.monotonic()
+                self.nav_panel.reveal(cid)  # 目录树跟随当前标签：展开其所在的卷并选中
+                self._prefetch_around(cid)
+                break
         self.update_status_bar()
         self.update_format_toolbar_state()
+        self.enforce_tab_memory_budget()
 
     def update_format_toolbar_state(self):
         editor = self.tab_widget.currentWidget()
@@ -592,23 +821,73 @@ class MainWindow(QMainWindow):
         self.font_size_spin.blockSignals(False)
         self.status_bar.showMessage(f"字号: {new_size}pt", 1500)
 
+    def _record_edit(self, cid, position: int, removed: int, added: int):
+        """contentsChange 回调：把本次变化记为日志增量（只处理编辑区域）。"""
+        info = self.open_tabs.get(cid)
+        if not info: return
+        op = capture_op(info['editor'].document(), position, removed, added)
+        merge_op(info['journal_ops'], op)
+        info['journal_bytes'] += len(op.get('t', '')) + (len(json.dumps(op['n'], ensure_ascii=False)) if 'n' in op else 0) + 16
+
+    def _log_progress(self, cid):
+        """保存时记一条写作进度：自上次记录以来的字数变化（取逐段统计，O(1)）。"""
+        info = self.open_tabs[cid]
+        if not self.progress_log or not info.get('stats'): return
+        chars = info['stats'].totals()['chars_no_space']
+        try: self.progress_log.append(cid, chars - info['logged_chars'])
+        except OSError: return  # 下次保存时连同本次增量一起记录
+        info['logged_chars'] = chars
+
+    def _compact_tab(self, cid):
+        """完整重写章节文件与纯文本备份，并以新内容为基底清空日志。"""
+        info = self.open_tabs[cid]; doc = info['editor'].document()
+        if info.get('hibernated') or info.get('loading'): return  # 编辑器中只是空的占位文档（休眠前已保存）
+        self._log_progress(cid)
+        snapshot = doc.clone()
+        info['journal_ops'] = []; info['journal_bytes'] = 0; info['needs_compact'] = False
+        doc.setModified(False)
+        self.save_worker.submit(info['filename'], snapshot, cid)
+
+    def autosave_tabs(self):
+        """自动保存：只向日志追加增量；日志过大或上次追加失败时才完整重写。
+
+        document 未修改（例如撤销回保存点）时缓存的增量相互抵消，直接丢弃。
+        """
+        for cid, info in self.open_tabs.items():
+            doc = info['editor'].document()
+            if not doc.isModified() and not info.get('needs_compact'):
+                info['journal_ops'] = []
+            elif info.get('needs_compact') or info['journal_bytes'] > JOURNAL_COMPACT_THRESHOLD:
+                self._compact_tab(cid)
+            elif info['journal_ops']:
+                ops = info['journal_ops']; info['journal_ops'] = []
+                doc.setModified(False)
+                self.save_worker.append(info['filename'], ops, cid)
+                self._log_progress(cid)
+
     def save_current_tab(self):
+        """显式保存：GUI 线程只克隆文档快照，toHtml/纯文本备份/写盘交给后台保存线程。"""
         editor = self.tab_widget.currentWidget()
         if not isinstance(editor, AdvancedTextEdit):
             return
         for cid, info in self.open_tabs.items():
             if info['editor'] == editor:
-                content = editor.toHtml()
-                success, msg = save_chapter_content(self.project_path, info['filename'], content)
-                if success:
-                    self.status_bar.showMessage(msg or '已保存', 2500)
-                    idx = self.tab_widget.indexOf(editor)
-                    if idx != -1:
-                        self.tab_widget.setTabText(idx, info['original_title'])
+                if not editor.document().isModified() and not info['journal_bytes'] and not info.get('needs_compact'):
+                    self.status_bar.showMessage('内容未变化', 2500)
                 else:
-                    QMessageBox.warning(self, '保存失败', msg)
+                    self._compact_tab(cid)
                 break
 
+    def on_chapter_saved(self, filename: str, success: bool, msg: str, cid):
+        info = self.open_tabs.get(cid)
+        if not success:
+            # 写入失败：恢复未保存标记，下次保存时完整重写
+            if info and cid in self._live_tabs(): info['needs_compact'] = True; info['editor'].document().setModified(True)
+            QMessageBox.warning(self, '保存失败', msg)
+            return
+        self.status_bar.showMessage(msg or '已保存', 2500)
+        if info and cid in self._live_tabs(): self.enforce_tab_memory_budget()  # 为休眠而保存的标签此时可以释放
+
     def close_tab(self, index: int, force: bool = False):
         editor = self.tab_widget.widget(index)
         if not editor:
@@ -623,10 +902,14 @@ class MainWindow(QMainWindow):
                     reply = QMessageBox.question(self, '未保存', '此章节有未保存修改，仍要关闭吗？', QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
                     if reply != QMessageBox.StandardButton.Yes:
                         return
+                elif not force and info.get('journal_bytes'):
+                    # 内容已全部记入日志：关闭时压缩为完整文件
+                    self._compact_tab(cid)
                 break
         self.tab_widget.removeTab(index)
         if target_cid:
-            self.open_tabs.pop(target_cid, None)
+            info = self.open_tabs.pop(target_cid, None)
+            if info and info.get('loading'): self.load_worker.cancel(info['loading'])
         self.update_status_bar()
 
     # ---------- 树与结构操作 ----------
@@ -634,15 +917,36 @@ class MainWindow(QMainWindow):
         index = self.tree_view.indexAt(position)
         menu = QMenu(self)
         if index.isValid():
-            item = self.tree_model.itemFromIndex(index)
+            item = QPersistentModelIndex(index)
             if item.data(Qt.ItemDataRole.UserRole) == 'volume':
                 menu.addAction('新建章节', lambda: self.handle_new_chapter(item))
             menu.addAction('重命名', lambda: self.handle_rename_item(item))
             menu.addAction('删除', lambda: self.handle_delete_item(item))
         else:
             menu.addAction('新建卷', self.handle_new_volume)
+            menu.addSeparator()
+            menu.addAction('导入文稿文件…', lambda: self.handle_import(False))
+            menu.addAction('导入文稿文件夹…', lambda: self.handle_import(True))
         menu.exec(self.tree_view.viewport().mapToGlobal(position))
 
+    def handle_import(self, directory: bool):
+        if directory: path = QFileDialog.getExistingDirectory(self, '选择文稿文件夹（.txt / .md，每个子文件夹为一卷）')
+        else: path, _ = QFileDialog.getOpenFileName(self, '选择文稿文件', '', '文本 (*.txt *.md)')
+        if not path: return
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            # 整个导入为一次批量提交：成功后 structure_store.changed 刷新目录树，失败则全部回滚
+            volumes, chapters, encodings = import_manuscript(self.project_path, self.project_data, path)
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            self.refresh_tree_view()  # 结构已原地回滚；整体重建目录树，与内存中的结构重新对齐
+            QMessageBox.warning(self, '导入失败', str(e)); return
+        QApplication.restoreOverrideCursor()
+        # 导入在子进程中写文件，不经过章节变更事件：由对账补进全文索引与字数统计
+        if self.index_updater: self.index_updater.reconcile()
+        if self.stats_updater: self.stats_updater.refresh()
+        self.status_bar.showMessage(f"已导入 {volumes} 卷 {chapters} 章（编码：{'、'.join(encodings)}）", 5000)
+
     def handle_new_volume(self):
         topic, ok = QInputDialog.getText(self, '新建卷', '请输入卷的主题：')
         if ok and topic:
@@ -657,12 +961,14 @@ class MainWindow(QMainWindow):
         if ok and topic:
             if add_new_chapter(self.project_path, self.project_data, volume_id, topic):
                 self.save_and_refresh('新章节已创建')
+                volume = self.tree_model.node(self.tree_model.find_index(volume_id))
+                if volume and volume.get('children'): self.nav_panel.reveal(volume['children'][-1]['id'])
             else:
                 QMessageBox.warning(self, '错误', '创建新章节失败')
 
     def handle_rename_item(self, item):
         item_id = item.data(Qt.ItemDataRole.UserRole + 1)
-        old = item.text()
+        old = item.data()
         new, ok = QInputDialog.getText(self, '重命名', '新的名称：', text=old)
         if ok and new and new != old:
             if rename_item_in_structure(self.project_data, item_id, new):
@@ -672,49 +978,25 @@ class MainWindow(QMainWindow):
 
     def handle_delete_item(self, item):
         item_id = item.data(Qt.ItemDataRole.UserRole + 1)
-        title = item.text()
+        title = item.data()
         # 判断类型
         is_volume = item.data(Qt.ItemDataRole.UserRole) == 'volume'
         if not is_volume:
             # 章节删除限制：只能删除整体结构里最后一章
-            # 找出所有章节按出现顺序
-            all_chapters = []
-            for vol in self.project_data.get('structure', []):
-                for ch in vol.get('children', []):
-                    all_chapters.append(ch)
-            if not all_chapters:
+            last_chapter = get_last_chapter(self.project_data)
+            if not last_chapter:
                 return
-            last_id = all_chapters[-1]['id']
-            if item_id != last_id:
+            if item_id != last_chapter['id']:
                 QMessageBox.information(self, '限制', '只能删除最后一章（最新一章）。')
                 return
         reply = QMessageBox.question(self, '确认删除', f"确定删除 '{title}'?\n此操作不可恢复", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply != QMessageBox.StandardButton.Yes:
             return
         if is_volume:
-            # 删除卷：将其章节合并到第一卷（若存在且不是自己），然后删除空卷
-            target_volume = None
-            for vol in self.project_data.get('structure', []):
-                if vol['id'] == item_id:
-                    target_volume = vol; break
-            if not target_volume:
+            # 删除卷：将其章节合并到第一卷（若存在且不是自己），然后删除空卷（不额外删除章节文件）
+            if not merge_and_delete_volume(self.project_data, item_id, self.project_path):
                 return
-            # 找第一卷（按现有顺序第一个不同于 target）
-            first_volume = None
-            for vol in self.project_data.get('structure', []):
-                if vol['id'] != target_volume['id']:
-                    first_volume = vol; break
-            if first_volume:
-                # 合并章节（追加到末尾）
-                first_volume['children'].extend(target_volume.get('children', []))
-            # 真正删除该卷（不额外删除章节文件）
-            for i, vol in enumerate(self.project_data.get('structure', [])):
-                if vol['id'] == target_volume['id']:
-                    del self.project_data['structure'][i]; break
-            if save_project_structure(self.project_path, self.project_data):
-                self.refresh_tree_view(); self.status_bar.showMessage('卷已合并删除', 2500)
-            else:
-                QMessageBox.warning(self, '错误', '保存结构失败')
+            self.status_bar.showMessage('卷已合并删除', 2500)
             return
         # 普通章节删除（此时已确认是最后一章）
         if delete_item(self.project_path, self.project_data, item_id):
@@ -723,33 +1005,169 @@ class MainWindow(QMainWindow):
                 idx = self.tab_widget.indexOf(ed)
                 if idx != -1:
                     self.close_tab(idx, force=True)
-            if save_project_structure(self.project_path, self.project_data):
-                self.refresh_tree_view()
-                self.status_bar.showMessage('章节已删除', 2500)
-            else:
-                QMessageBox.warning(self,'错误','保存结构失败（章节已从内存删除）')
+            # 删除已记入 oplog（崩溃后可重放），project.json 稍后合并写入
+            self.status_bar.showMessage('章节已删除', 2500)
         else:
             QMessageBox.warning(self, '错误', '删除失败')
 
     def save_and_refresh(self, msg):
-        if save_project_structure(self.project_path, self.project_data):
-            self.status_bar.showMessage(msg, 2000)
-            self.refresh_tree_view()
-        else:
-            QMessageBox.critical(self, '严重错误', '无法保存 project.json')
+        # 结构修改已记入 oplog 并触发 changed 刷新树；project.json 由 structure_store 合并写入
+        self.status_bar.showMessage(msg, 2000)
 
     # ---------- 搜索 ----------
     def do_search(self, keyword: str):
         keyword = (keyword or '').strip()
-        self.nav_panel.search_results.clear()
+        results_list = self.nav_panel.search_results
+        results_list.clear(); self.nav_panel.search_status.setText('')
+        self.search_worker.cancel()  # 新查询立即取消尚在运行的旧查询
         if not keyword or not self.project_data:
             return
+        self.nav_panel.stack.setCurrentIndex(1)
+        options = self.nav_panel.search_options()
+        try: pattern = compile_query(keyword, **options)
+        except re.error as e:
+            self.nav_panel.search_status.setText(f'正则表达式有误：{e}'); return
+        chapters = []
         for vol in self.project_data.get('structure', []):
             for ch in vol.get('children', []):
-                title = ch.get('title', '')
-                if keyword.lower() in title.lower():
-                    self.nav_panel.search_results.addItem(title)
-        self.nav_panel.stack.setCurrentIndex(1)
+                chapters.append((ch['id'], ch.get('title', ''), ch.get('filename')))
+                if pattern.search(ch.get('title', '')):
+                    self._add_search_result(f"[标题] {ch.get('title', '')}", ch['id'], -1, 0)
+        # 普通关键词优先走全文索引（按命中次数排序）；正则/大小写/全词或索引未就绪时逐章扫描
+        index = None if any(options.values()) else self._ensure_search_index()
+        if index is not None and self.index_updater and self.index_updater.error is not None:
+            # 索引上次更新失败，可能已过期：让后台对账重试，本次逐章扫描
+            self.status_bar.showMessage(f'全文索引更新失败，本次逐章搜索：{self.index_updater.error}', 4000)
+            self.index_updater.reconcile(); index = None
+        if index is not None:
+            by_filename = {filename: (cid, title) for cid, title, filename in chapters}
+            # 已打开的标签以编辑器中的内容为准：未压实的编辑只在日志里，索引还看不到
+            live = {info['filename']: info['editor'].toPlainText() for info in self._live_tabs().values()}
+            hits, _ = index.search(keyword, live=live)
+            for hit in hits:
+                if hit['filename'] not in by_filename:
+                    continue
+                cid, title = by_filename[hit['filename']]
+                self._add_search_result(f"{title}  ·  {hit['count']} 处\n{hit['snippet']}", cid, hit['position'], len(keyword), pattern)
+            self.nav_panel.search_status.setText(f'{len(hits)} 章包含“{keyword}”' if hits else '正文中没有找到匹配内容')
+            return
+        # 已打开的标签以编辑器中的内容为准（可能尚未保存）
+        live = {cid: info['editor'].toPlainText() for cid, info in self._live_tabs().items()}
+        self.nav_panel.search_status.setText('正在搜索…')
+        self._search_pattern = pattern
+        self._search_token = self.search_worker.start(self.project_path, chapters, pattern, live)
+
+    def _on_search_hits(self, token, hits):
+        if token != self._search_token:
+            return
+        for chapter_id, title, position, length, snippet in hits:
+            self._add_search_result(f"{title}\n{snippet}", chapter_id, position, length, self._search_pattern)
+
+    def _on_search_finished(self, token, total, truncated):
+        if token != self._search_token:
+            return
+        if truncated: self.nav_panel.search_status.setText(f'结果过多，仅显示前 {total} 处')
+        else: self.nav_panel.search_status.setText(f'共 {total} 处' if total else '正文中没有找到匹配内容')
+
+    def _add_search_result(self, text, chapter_id, position, length, pattern=None):
+        item = QListWidgetItem(text)
+        item.setData(Qt.ItemDataRole.UserRole, chapter_id); item.setData(Qt.ItemDataRole.UserRole + 1, position)
+        item.setData(Qt.ItemDataRole.UserRole + 2, length); item.setData(Qt.ItemDataRole.UserRole + 3, pattern)
+        self.nav_panel.search_results.addItem(item)
+
+    def open_search_hit(self, item):
+        """打开命中所在章节并选中匹配内容。"""
+        chapter_id = item.data(Qt.ItemDataRole.UserRole)
+        if not chapter_id:
+            return
+        index = self.nav_panel.find_index(chapter_id)
+        if not index.isValid():
+            return
+        self.open_chapter_in_tab(index)
+        info = self.open_tabs.get(chapter_id)
+        position = item.data(Qt.ItemDataRole.UserRole + 1)
+        if not info or position is None or position < 0:
+            return
+        length = item.data(Qt.ItemDataRole.UserRole + 2) or 0; pattern = item.data(Qt.ItemDataRole.UserRole + 3)
+        if info.get('loading'):
+            info['select_on_load'] = (position, length, pattern); return  # 后台载入完成后再选中
+        self._select_range(info['editor'], position, length, pattern)
+
+    def _select_range(self, editor, position: int, length: int, pattern=None):
+        if pattern is not None: position, length = locate_match(editor.toPlainText(), pattern, position, length)
+        doc_len = editor.document().characterCount() - 1
+        cursor = editor.textCursor(); cursor.setPosition(min(position, doc_len))
+        cursor.setPosition(min(position + length, doc_len), QTextCursor.MoveMode.KeepAnchor)
+        editor.setTextCursor(cursor); editor.ensureCursorVisible(); editor.setFocus()
+
+    def do_replace(self, keyword: str, replacement: str):
+        """全项目替换：扫描预览 -> 勾选章节 -> 未打开的章节原子写回，已打开的直接改编辑器文档。"""
+        if not keyword or not self.project_data:
+            return
+        if self._replace_job is not None:
+            self.status_bar.showMessage('上一次替换尚未完成', 3000); return
+        options = self.nav_panel.search_options()
+        try: pattern = compile_query(keyword, **options)
+        except re.error as e:
+            QMessageBox.warning(self, '替换', f'正则表达式有误：{e}'); return
+        chapters = [(ch['id'], ch.get('title', ''), ch.get('filename'))
+                    for vol in self.project_data.get('structure', []) for ch in vol.get('children', [])]
+        live = {cid: info['editor'].toPlainText() for cid, info in self._live_tabs().items()}
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try: previews = scan_project(self.project_path, chapters, pattern, replacement, options['regex'], live)
+        except (re.error, IndexError) as e:  # 替换模板中引用了不存在的分组等
+            QApplication.restoreOverrideCursor(); QMessageBox.warning(self, '替换', f'替换内容有误：{e}'); return
+        QApplication.restoreOverrideCursor()
+        if not previews:
+            QMessageBox.information(self, '替换', '没有找到匹配内容'); return
+        dialog = ReplacePreviewDialog(keyword, replacement, previews, self)
+        if dialog.exec() != dialog.DialogCode.Accepted:
+            return
+        selected = set(dialog.selected_ids())
+        targets = [p for p in previews if p['id'] in selected]
+        live_tabs = self._live_tabs()  # 休眠的标签与磁盘内容一致，按未打开的章节处理
+        closed = [p['filename'] for p in targets if p['id'] not in live_tabs]
+        self._replace_job = {'targets': targets, 'pattern': pattern, 'replacement': replacement, 'regex': options['regex']}
+        if not closed:
+            self._on_replace_finished(True, 0, ''); return
+        # 未打开的章节在后台改写并原子写回；进度框为窗口模态（期间不能打开/编辑章节），界面照常响应，可取消
+        progress = self._replace_job['dialog'] = QProgressDialog('正在替换未打开的章节…', '取消', 0, len(closed), self)
+        progress.setWindowTitle('全部替换'); progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300); progress.setAutoClose(False); progress.setAutoReset(False)
+        progress.canceled.connect(self.replace_worker.cancel)
+        self.replace_worker.start(self.project_path, closed, pattern, replacement, options['regex'])
+
+    def _on_replace_progress(self, done: int, total: int):
+        if self._replace_job and self._replace_job.get('dialog'): self._replace_job['dialog'].setValue(done)
+
+    def _on_replace_finished(self, success: bool, total: int, msg: str):
+        """未打开的章节写回之后，再在界面线程中改动已打开的标签（失败或取消时都不改）。"""
+        job = self._replace_job; self._replace_job = None
+        if job is None: return
+        if job.get('dialog'): job['dialog'].close()
+        if not success:
+            QMessageBox.warning(self, '替换失败', f'所有章节均未修改：{msg}'); return
+        live_tabs = self._live_tabs()
+        for p in job['targets']:
+            info = self.open_tabs.get(p['id'])
+            if info and info.get('loading'): self._load_tab_document(p['id'], info)  # 载入中读到的可能是替换前的内容
+            if p['id'] in live_tabs:
+                # 已打开的标签：改动实时文档（可撤销），随自动保存写回
+                total += replace_in_document(live_tabs[p['id']]['editor'].document(), job['pattern'], job['replacement'], job['regex'])
+        self.status_bar.showMessage(f"已替换 {total} 处（{len(job['targets'])} 章）", 5000)
+
+    def _ensure_search_index(self):
+        """打开项目全文索引（由 index_updater 在后台建立与维护）。"""
+        if self.search_index is None:
+            try: self.search_index = SearchIndex(self.project_path)
+            except Exception as e:
+                self.status_bar.showMessage(f'无法打开全文索引：{e}', 4000); return None
+        if self.search_index.is_empty():
+            # 后台线程正在建立索引，本次只返回标题匹配
+            if self.index_updater and self.index_updater.busy.is_set():
+                self.status_bar.showMessage('全文索引正在后台建立，稍后再试正文搜索', 4000)
+            return None
+        return self.search_index
 
     # ---------- 当前章节内查找 ----------
     def trigger_focus_inline_find(self):
@@ -781,42 +1199,40 @@ class MainWindow(QMainWindow):
         return matches
 
     def _update_find_highlight(self, pattern: str, current_index: int, rebuild: bool = True):
-        """使用 ExtraSelections 高亮，避免整篇反复重写格式造成卡顿。"""
-        ed, text = self._get_current_editor_and_text()
+        """使用 ExtraSelections 高亮，只覆盖视口附近的命中（见 AdvancedTextEdit.set_find_matches）；
+        上一个/下一个只重设新旧两处的格式，命中总数仍按全部匹配计算。"""
+        ed, _ = self._get_current_editor_and_text()
         if not ed:
             return
         if not pattern:
-            ed.setExtraSelections([])
+            ed.set_find_matches([])
             if hasattr(self.nav_panel, 'find_count_label'):
                 self.nav_panel.find_count_label.setText('0/0')
             return
+        # 切换了标签时匹配结果属于另一个编辑器，需要重新收集
+        rebuild = rebuild or ed is not getattr(self, '_find_editor', None)
         if rebuild or not hasattr(self, '_current_find_matches') or pattern != getattr(self, '_current_find_pattern_cache', ''):
+            old = getattr(self, '_find_editor', None)
+            if old is not None and old is not ed:
+                try: old.set_find_matches([])
+                except RuntimeError: pass  # 标签已关闭
             self._current_find_matches = self._collect_find_matches(pattern)
             self._current_find_pattern_cache = pattern
+            self._find_editor = ed
+            rebuild = True
         matches = self._current_find_matches
         total = len(matches)
         if total == 0:
-            ed.setExtraSelections([])
+            ed.set_find_matches([])
             if hasattr(self.nav_panel, 'find_count_label'):
                 self.nav_panel.find_count_label.setText('0/0')
             return
         current_index = max(0, min(current_index, total - 1))
-        # 构建 ExtraSelections
-        base_sel = []
-        normal_color = QColor(255, 230, 150)
-        current_color = QColor(255, 180, 60)
-        for i, (pos, length) in enumerate(matches):
-            sel = QTextEdit.ExtraSelection()
-            c = QTextCursor(ed.document())
-            c.setPosition(pos)
-            c.setPosition(pos + length, QTextCursor.MoveMode.KeepAnchor)
-            sel.cursor = c
-            fmt = QTextCharFormat()
-            fmt.setBackground(current_color if i == current_index else normal_color)
-            sel.format = fmt
-            base_sel.append(sel)
-        ed.setExtraSelections(base_sel)
-        # 移动主光标
+        if rebuild:
+            ed.set_find_matches(matches, current_index, pattern)
+        else:
+            ed.set_find_current(current_index)
+        # 移动主光标（滚动时编辑器按新视口重建高亮）
         pos, length = matches[current_index]
         vis = QTextCursor(ed.document())
         vis.setPosition(pos)
@@ -828,9 +1244,18 @@ class MainWindow(QMainWindow):
             self.nav_panel.find_count_label.setText(f"{current_index+1}/{total}")
 
     def find_in_current_chapter_submit(self, pattern: str):
+        # 同一关键词再次提交时沿用编辑器增量维护的命中，不重扫全文
         self.current_find_pattern = pattern
         self.current_find_index = 0
-        self._update_find_highlight(pattern, 0, rebuild=True)
+        self._update_find_highlight(pattern, 0, rebuild=False)
+
+    def _on_find_matches_changed(self, editor, current: int, total: int):
+        """编辑后命中增量更新：同步当前下标与计数。"""
+        if editor is not getattr(self, '_find_editor', None):
+            return
+        self.current_find_index = max(current, 0)
+        if hasattr(self.nav_panel, 'find_count_label'):
+            self.nav_panel.find_count_label.setText(f"{current+1}/{total}" if total else '0/0')
 
     def find_in_current_next(self):
         pattern = getattr(self, 'current_find_pattern', '')
@@ -876,45 +1301,27 @@ class MainWindow(QMainWindow):
         if not hasattr(ed, 'toPlainText'):
             self.word_count_label.setText('请打开一个章节进行编辑')
             return
-        text = ed.toPlainText()
-        stats = self._calc_text_stats(text)
+        block_stats = next((info['stats'] for info in self.open_tabs.values() if info['editor'] is ed and info.get('stats')), None)
+        if block_stats is not None:
+            # 逐段缓存的统计，只在编辑涉及的段落上重算
+            stats = block_stats.totals(); line_count = block_stats.line_count()
+        else:
+            text = ed.toPlainText()
+            stats = self._calc_text_stats(text); line_count = text.count('\n') + (1 if text else 0)
         # 模仿 Word：主要显示不含空格字符数，同时补充分类
         line_part = ''
         if self.settings.get('show_line_numbers', False):
-            line_count = text.count('\n') + (1 if text else 0)
             line_part = f" | 行: {line_count}"
         self.word_count_label.setText(
             f"字数(不含空格): {stats['chars_no_space']} | 汉字: {stats['chinese']} | 英文: {stats['english']} | 数字: {stats['digits']} | 符号: {stats['symbols']}{line_part}"
         )
 
+    def schedule_status_bar_update(self):
+        """输入时合并状态栏刷新：每 STATUS_REFRESH_MS 最多一次。"""
+        if not self.status_refresh_timer.isActive():
+            self.status_refresh_timer.start()
+
     # ---------- 文本统计 ----------
     def _calc_text_stats(self, text: str) -> dict:
-        # 去除 Windows \r
-        t = text.replace('\r', '')
-        total_with_space = len(t)
-        no_space = len([c for c in t if not c.isspace()])
-        chinese = 0
-        english = 0
-        digits = 0
-        symbols = 0
-        for c in t:
-            if c.isspace():
-                continue
-            code = ord(c)
-            if 0x4E00 <= code <= 0x9FFF:
-                chinese += 1
-            elif c.isalpha() and c.isascii():
-                english += 1
-            elif c.isdigit():
-                digits += 1
-            else:
-                symbols += 1
-        return {
-            'chars_with_space': total_with_space,
-            'chars_no_space': no_space,
-            'chinese': chinese,
-            'english': english,
-            'digits': digits,
-            'symbols': symbols
-        }
+        return calc_text_stats(text)
 
@@ -0,0 +1,29 @@
+"""进程池辅助：批量导入、全项目替换等按章处理的任务共用。"""
+from concurrent.futures import ProcessPoolExecutor
+
+POOL_MIN_ITEMS = 64  # 少于该数量的文件/章节直接在当前进程处理，省去进程池启动开销
+
+
+def map_ordered(func, items, workers=None, *args):
+    """对 items 逐个调用 func(item, *args)，保持原顺序返回结果。
+
+    workers == 1 或只有一项时顺序执行，否则交给进程池（func 须为模块级函数）。
+    """
+    if workers == 1 or len(items) < 2: return [func(item, *args) for item in items]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(func, item, *args) for item in items]
+        return [future.result() for future in futures]
+
+
+def imap_ordered(func, items, workers=None, *args):
+    """与 map_ordered 相同，但按原顺序逐个产出结果：调用方可以边取边报告进度，
+    中途停止迭代时尚未开始的任务随即取消。"""
+    if workers == 1 or len(items) < 2:
+        for item in items: yield func(item, *args)
+        return
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(func, item, *args) for item in items]
+        for future in futures: yield future.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
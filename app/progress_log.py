@@ -0,0 +1,108 @@
+"""写作进度：每次保存追加一条字数增量记录，按天 / 周 / 写作时段懒汇总并缓存。
+
+- progress.log：定长二进制记录（12 字节，struct '<IIi'）：
+  时间戳（秒）、章节键（章节 id 的 32 位十六进制部分）、字数增量（不含空格，有符号）。
+  只追加不改写，十年每天上百次保存也只有几 MB；
+- progress_rollup.json：汇总缓存，记录已汇总到的字节偏移，之后只需读取新追加的记录::
+
+      {"version": 1, "offset": 字节数, "days": {"2024-05-01": [净增, 新增]}, "sessions": [[开始, 结束, 净增], ...]}
+
+增量来自编辑器的逐段统计（BlockStats），在自动保存 / 保存时记录，不在输入路径上做任何事。
+"""
+import os
+import json
+import struct
+import time
+import zlib
+from datetime import date, timedelta
+
+PROGRESS_FILENAME = 'progress.log'
+ROLLUP_FILENAME = 'progress_rollup.json'
+ROLLUP_VERSION = 1
+RECORD = struct.Struct('<IIi')
+SESSION_GAP = 30 * 60  # 两次保存相隔超过 30 分钟视为新的写作时段
+
+
+def chapter_key(chapter_id: str) -> int:
+    """'chap-1a2b3c4d' -> 0x1a2b3c4d；其他形式的 id 取 crc32。"""
+    try: return int(chapter_id.rsplit('-', 1)[-1], 16) & 0xFFFFFFFF
+    except (ValueError, AttributeError): return zlib.crc32(str(chapter_id).encode('utf-8'))
+
+
+class ProgressLog:
+    def __init__(self, project_path):
+        self.path = os.path.join(project_path, PROGRESS_FILENAME)
+        self.rollup_path = os.path.join(project_path, ROLLUP_FILENAME)
+        self._rollup = None
+
+    def append(self, chapter_id, delta: int, timestamp=None):
+        """追加一条记录（增量为 0 时不记）。"""
+        if not delta: return
+        delta = max(-0x80000000, min(0x7FFFFFFF, delta))
+        with open(self.path, 'ab') as f:
+            f.write(RECORD.pack(int(timestamp if timestamp is not None else time.time()), chapter_key(chapter_id), delta))
+
+    def records(self, offset: int = 0):
+        """[(时间戳, 章节键, 增量)]，从字节偏移 offset 开始（只取完整记录）。"""
+        try:
+            with open(self.path, 'rb') as f: f.seek(offset); data = f.read()
+        except FileNotFoundError: return []
+        return list(RECORD.iter_unpack(data[:len(data) - len(data) % RECORD.size]))
+
+    # ---------- 汇总 ----------
+    def _load_rollup(self):
+        try:
+            with open(self.rollup_path, 'r', encoding='utf-8') as f: rollup = json.load(f)
+            if rollup.get('version') == ROLLUP_VERSION: return rollup
+        except (OSError, ValueError, AttributeError): pass
+        return None
+
+    def rollup(self) -> dict:
+        """汇总到日志末尾并返回；只处理上次汇总之后追加的记录。日志被截断或替换时从头重建。"""
+        try: size = os.path.getsize(self.path)
+        except OSError: size = 0
+        rollup = self._rollup or self._load_rollup()
+        if rollup is None or rollup['offset'] > size:
+            rollup = {'version': ROLLUP_VERSION, 'offset': 0, 'days': {}, 'sessions': []}
+        size -= size % RECORD.size
+        if rollup['offset'] < size:
+            days = rollup['days']; sessions = rollup['sessions']
+            day_start = day_end = 0; day = None
+            for timestamp, _, delta in self.records(rollup['offset']):
+                if not day_start <= timestamp < day_end:  # 记录按时间追加，只在跨天时换算日期
+                    local = time.localtime(timestamp)
+                    day_start = int(time.mktime(local[:3] + (0, 0, 0, 0, 0, -1)))
+                    day_end = int(time.mktime(local[:2] + (local[2] + 1, 0, 0, 0, 0, 0, -1)))
+                    day = days.setdefault(time.strftime('%Y-%m-%d', local), [0, 0])
+                day[0] += delta
+                if delta > 0: day[1] += delta
+                if sessions and 0 <= timestamp - sessions[-1][1] <= SESSION_GAP:
+                    sessions[-1][1] = timestamp; sessions[-1][2] += delta
+                else: sessions.append([timestamp, timestamp, delta])
+            rollup['offset'] = size
+            try:
+                tmp_path = self.rollup_path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f: json.dump(rollup, f, separators=(',', ':'))
+                os.replace(tmp_path, self.rollup_path)
+            except OSError: pass  # 缓存写不进去不影响结果
+        self._rollup = rollup
+        return rollup
+
+    def daily(self) -> dict:
+        """{日期字符串: (净增, 新增)}。"""
+        return {day: tuple(values) for day, values in self.rollup()['days'].items()}
+
+    def weekly(self) -> dict:
+        """{(ISO 年, 周): 净增}，由按天汇总再合并。"""
+        weeks = {}
+        for day, (net, _) in self.rollup()['days'].items():
+            key = tuple(date.fromisoformat(day).isocalendar()[:2]); weeks[key] = weeks.get(key, 0) + net
+        return weeks
+
+    def sessions(self, since=None) -> list:
+        """[(开始时间戳, 结束时间戳, 净增)]；since 为时间戳时只返回之后开始的时段。"""
+        return [tuple(s) for s in self.rollup()['sessions'] if since is None or s[0] >= since]
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
@@ -0,0 +1,151 @@
+"""project_data 的内存结构索引：id -> 节点/父节点、最大卷号/章号、最后一章。
+
+project_data 仍是写入 project.json 的普通 dict，索引只保存对其中卷/章 dict 的引用，
+通过 get_index(data) 按对象身份取得（首次使用时 O(n) 建立，之后增量维护）。
+结构修改须经 project_manager 的函数进行，索引才能保持一致。
+"""
+import re
+import heapq
+from collections import Counter
+
+from .config import VOLUME_PREFIX, VOLUME_SUFFIX
+
+CHINESE_NUMERALS_MAP = {
+    '一': 1, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9, '十': 10
+}
+_VOLUME_NUM_RE = re.compile(f"{VOLUME_PREFIX}(.+?){VOLUME_SUFFIX}")
+_CHAPTER_NUM_RE = re.compile(r'\d+')
+
+
+def volume_number(title: str) -> int:
+    match = _VOLUME_NUM_RE.search(title or '')
+    if match:
+        num_str = match.group(1)
+        if num_str in CHINESE_NUMERALS_MAP: return CHINESE_NUMERALS_MAP[num_str]
+        if num_str.isdigit(): return int(num_str)
+    return 0
+
+
+def chapter_number(title: str) -> int:
+    match = _CHAPTER_NUM_RE.search(title or '')
+    return int(match.group()) if match else 0
+
+
+class StructureNode:
+    """卷或章节点：data 指向 project_data 中对应的 dict，parent 为所属卷节点。"""
+    __slots__ = ('id', 'kind', 'data', 'parent')
+
+    def __init__(self, kind: str, data: dict, parent=None):
+        self.id = data['id']; self.kind = kind; self.data = data; self.parent = parent
+
+
+class _MaxTracker:
+    """可删除元素的最大值：计数 + 延迟删除的大顶堆，增删 O(log n) 摊还。"""
+    __slots__ = ('_counts', '_heap')
+
+    def __init__(self):
+        self._counts = Counter(); self._heap = []
+
+    def add(self, n: int):
+        if n <= 0: return
+        if not self._counts[n]: heapq.heappush(self._heap, -n)
+        self._counts[n] += 1
+
+    def remove(self, n: int):
+        if n <= 0 or not self._counts[n]: return
+        self._counts[n] -= 1
+
+    def max(self) -> int:
+        heap = self._heap
+        while heap and not self._counts[-heap[0]]:
+            del self._counts[-heapq.heappop(heap)]
+        return -heap[0] if heap else 0
+
+
+class ProjectIndex:
+    def __init__(self, data: dict):
+        self.data = data
+        self.nodes: dict = {}
+        self.volume_numbers = _MaxTracker(); self.chapter_numbers = _MaxTracker()
+        for vol in data.setdefault('structure', []):
+            self._register_volume(vol)
+            for ch in vol.setdefault('children', []): self._register_chapter(vol, ch)
+
+    # ---------- 查询 ----------
+    def node(self, item_id):
+        return self.nodes.get(item_id)
+
+    def volume(self, volume_id):
+        node = self.nodes.get(volume_id)
+        return node.data if node and node.kind == 'volume' else None
+
+    def parent_of(self, item_id):
+        node = self.nodes.get(item_id)
+        return node.parent.data if node and node.parent else None
+
+    def next_volume_number(self) -> int:
+        return self.volume_numbers.max() + 1
+
+    def next_chapter_number(self) -> int:
+        return self.chapter_numbers.max() + 1
+
+    def last_chapter(self):
+        """整体顺序中的最后一章（从最后一卷向前找第一个非空卷，通常 O(1)）。"""
+        for vol in reversed(self.data['structure']):
+            if vol.get('children'): return vol['children'][-1]
+        return None
+
+    # ---------- 增量维护 ----------
+    def _register_volume(self, vol: dict):
+        self.nodes[vol['id']] = StructureNode('volume', vol)
+        self.volume_numbers.add(volume_number(vol.get('title', '')))
+
+    def _register_chapter(self, vol: dict, ch: dict):
+        self.nodes[ch['id']] = StructureNode('chapter', ch, self.nodes[vol['id']])
+        self.chapter_numbers.add(chapter_number(ch.get('title', '')))
+
+    def _unregister_chapter(self, ch: dict):
+        self.nodes.pop(ch['id'], None)
+        self.chapter_numbers.remove(chapter_number(ch.get('title', '')))
+
+    def added_volume(self, vol: dict):
+        self._register_volume(vol)
+
+    def added_chapter(self, vol: dict, ch: dict):
+        self._register_chapter(vol, ch)
+
+    def renamed(self, item_id, old_title: str, new_title: str):
+        node = self.nodes[item_id]
+        tracker, parse = (self.volume_numbers, volume_number) if node.kind == 'volume' else (self.chapter_numbers, chapter_number)
+        tracker.remove(parse(old_title)); tracker.add(parse(new_title))
+
+    def removed_chapter(self, ch: dict):
+        self._unregister_chapter(ch)
+
+    def removed_volume(self, vol: dict):
+        """卷及其仍在卷内的章节一起移出索引（合并删除时章节应先移走）。"""
+        for ch in vol.get('children', []): self._unregister_chapter(ch)
+        self.nodes.pop(vol['id'], None)
+        self.volume_numbers.remove(volume_number(vol.get('title', '')))
+
+    def moved_chapters(self, chapters, target_vol: dict):
+        parent = self.nodes[target_vol['id']]
+        for ch in chapters: self.nodes[ch['id']].parent = parent
+
+
+_indexes: dict = {}  # id(data) -> ProjectIndex（按对象身份缓存，旧对象会被替换）
+_MAX_CACHED = 8
+
+
+def get_index(data: dict) -> ProjectIndex:
+    index = _indexes.get(id(data))
+    if index is None or index.data is not data:
+        if len(_indexes) >= _MAX_CACHED: _indexes.pop(next(iter(_indexes)))
+        index = _indexes[id(data)] = ProjectIndex(data)
+    return index
+
+
+def drop_index(data: dict):
+    """结构被整体替换（例如批量修改回滚）后丢弃缓存，下次使用时重建。"""
+    index = _indexes.get(id(data))
+    if index is not None and index.data is data: del _indexes[id(data)]
@@ -1,16 +1,20 @@
 # app/project_manager.py
 import os
 import json
+import logging
 import uuid
 import re
-import html as _html
+from contextlib import contextmanager
+from .html_plain import write_plain, html_to_plain
+from .chapter_format import is_native, native_plain_text, html_to_native, native_to_html
+from .chapter_storage import load_options, read_text, write_text, train_dictionary, DICT_FILENAME, CODECS
+from .chapter_journal import replay_journal, reset_journal, remove_journal
+from .project_index import get_index, drop_index, CHINESE_NUMERALS_MAP
+from .structure_store import record_op, read_oplog, write_project_json, get_store
 from .config import (CHAPTER_PREFIX, CHAPTER_SUFFIX, CHAPTER_PADDING,
                      VOLUME_PREFIX, VOLUME_SUFFIX, VOLUME_USE_CHINESE_NUMERALS)
 
 # 中文/阿拉伯数字转换相关的辅助函数 (保持不变)
-CHINESE_NUMERALS_MAP = {
-    '一': 1, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9, '十': 10
-}
 INT_TO_CHINESE_MAP = {v: k for k, v in CHINESE_NUMERALS_MAP.items()}
 
 def to_chinese_numeral(n):
@@ -23,28 +27,101 @@ def sanitize_filename(name):
     name = name.replace(" ", "_")
     return name
 
+# 卷号/章号、按 id 查找均走 ProjectIndex，不再每次遍历整个结构
 def get_next_volume_number(data):
-    max_num = 0
-    for volume in data.get('structure', []):
-        title = volume.get('title', '')
-        match = re.search(f"{VOLUME_PREFIX}(.+?){VOLUME_SUFFIX}", title)
-        if match:
-            num_str = match.group(1)
-            if num_str in CHINESE_NUMERALS_MAP:
-                max_num = max(max_num, CHINESE_NUMERALS_MAP[num_str])
-            elif num_str.isdigit():
-                max_num = max(max_num, int(num_str))
-    return max_num + 1
+    return get_index(data).next_volume_number()
 
 def get_next_chapter_number(data):
-    max_num = 0
-    for volume in data.get('structure', []):
-        for chapter in volume.get('children', []):
-            title = chapter.get('title', '')
-            num_part = re.search(r'\d+', title)
-            if num_part:
-                max_num = max(max_num, int(num_part.group()))
-    return max_num + 1
+    return get_index(data).next_chapter_number()
+
+def get_last_chapter(data):
+    """整体顺序中的最后一章（只允许删除这一章）。"""
+    return get_index(data).last_chapter()
+
+# 章节内容变更事件：listener(kind, project_path, filenames)
+# kind 为 'saved'（内容已写入，含纯文本备份）/ 'deleted'（文件已删除）/ 'moved'（换卷，内容不变）。
+# 保存可能发生在后台保存线程中，监听者须自行保证线程安全（例如只把事件放入队列）。
+_change_listeners = []
+
+def add_change_listener(listener):
+    if listener not in _change_listeners: _change_listeners.append(listener)
+
+def remove_change_listener(listener):
+    if listener in _change_listeners: _change_listeners.remove(listener)
+
+def _emit_change(kind, project_path, filenames):
+    for listener in list(_change_listeners):
+        try: listener(kind, project_path, filenames)
+        except Exception: logging.exception('change listener failed')
+
+class StructureBatch:
+    """batch() 期间累积的操作与延后的文件创建/删除。"""
+    __slots__ = ('ops', 'created', 'removed', 'claimed')
+
+    def __init__(self):
+        self.ops = []; self.created = []; self.removed = []; self.claimed = set()
+
+    def claim(self, path):
+        """调用方已自行写入该章节文件（如导入），提交时不再创建空文件；回滚时照样删除。"""
+        self.claimed.add(path)
+
+_batches: dict = {}  # id(data) -> StructureBatch
+
+def _active_batch(data):
+    return _batches.get(id(data))
+
+def _record(data, op):
+    batch = _active_batch(data)
+    if batch is not None: batch.ops.append(op)
+    else: record_op(data, op)
+
+def _snapshot(structure):
+    """记下每个卷/章节 dict 的内容与各卷的章节列表（浅拷贝），回滚时原地恢复。"""
+    return [(vol, dict(vol), list(vol.get('children', [])), [(ch, dict(ch)) for ch in vol.get('children', [])])
+            for vol in structure]
+
+def _restore(structure, snapshot):
+    """原地恢复：列表与各 dict 保持原对象（目录树模型与结构索引引用的正是这些对象）。"""
+    structure[:] = [vol for vol, _, _, _ in snapshot]
+    for vol, fields, children, chapters in snapshot:
+        vol.clear(); vol.update(fields)
+        if 'children' in fields: vol['children'][:] = children
+        for ch, ch_fields in chapters: ch.clear(); ch.update(ch_fields)
+
+@contextmanager
+def batch(project_path, data):
+    """批量修改结构：期间的新建/重命名/移动/删除只改内存，
+    退出时一次性创建章节文件、写一次 project.json、发出一次变更通知；
+    出现异常则恢复原结构、删除已创建的文件并重新抛出。嵌套调用并入外层批次。
+
+        with batch(project_path, data):
+            for topic in topics: add_new_chapter(project_path, data, volume_id, topic)
+    """
+    outer = _active_batch(data)
+    if outer is not None:
+        yield outer; return
+    structure = data.setdefault('structure', []); snapshot = _snapshot(structure)
+    current = _batches[id(data)] = StructureBatch()
+    created = []
+    try:
+        yield current
+        for path in current.created:
+            if path in current.claimed: continue
+            open(path, 'w', encoding='utf-8').close(); created.append(path)
+        if current.ops: write_project_json(project_path, data)
+    except BaseException:
+        for path in created:
+            try: os.remove(path)
+            except OSError: pass
+        for path in current.claimed: _remove_chapter_files(project_path, {'filename': os.path.basename(path)})
+        data['structure'] = structure; _restore(structure, snapshot); drop_index(data)
+        raise
+    finally:
+        del _batches[id(data)]
+    # 结构已落盘，再删除被删章节的文件
+    for chapter in current.removed: _remove_chapter_files(project_path, chapter)
+    store = get_store(data)
+    if store is not None and current.ops: store.committed(current.ops)
 
 # --- 以下函数中的逻辑有修正 ---
 
@@ -57,115 +134,277 @@ def add_new_volume(data, volume_topic):
     full_title = f"{VOLUME_PREFIX}{num_str}{VOLUME_SUFFIX}：{volume_topic}"
     new_volume = {"id": f"vol-{uuid.uuid4().hex[:8]}", "type": "volume", "title": full_title, "children": []}
     data['structure'].append(new_volume)
+    get_index(data).added_volume(new_volume)
+    _record(data, {'op': 'add_volume', 'volume': new_volume})
     return True
 
 def add_new_chapter(project_path, data, volume_id, chapter_topic):
-    """修正此函数的逻辑错误。"""
-    for volume in data['structure']:
-        if volume['id'] == volume_id:
-            next_num = get_next_chapter_number(data)
-            num_str = str(next_num).zfill(CHAPTER_PADDING)
-            full_title = f"{CHAPTER_PREFIX}{num_str}{CHAPTER_SUFFIX} {chapter_topic}"
-            sanitized_topic = sanitize_filename(chapter_topic)
-            new_filename = f"{num_str}-{sanitized_topic}.txt"
-            new_chapter_id = f"chap-{uuid.uuid4().hex[:8]}"
-            new_chapter = {"id": new_chapter_id, "type": "chapter", "title": full_title, "filename": new_filename}
-            volume['children'].append(new_chapter)
-            try:
-                open(os.path.join(project_path, 'chapters', new_filename), 'w', encoding='utf-8').close()
-                # 找到并处理完后，直接返回True，退出函数
-                return True
-            except Exception as e:
-                # 如果文件创建失败，回滚操作
-                volume['children'].pop()
-                print(f"Error creating chapter file: {e}")
-                return False
-    
-    # --- 【关键修正】---
-    # 这句 return False 必须放在 for 循环的外面！
-    # 这样才能保证在遍历完所有卷都找不到匹配的id后，才返回False。
-    return False
-
-# --- 其他函数保持不变 ---
+    index = get_index(data)
+    volume = index.volume(volume_id)
+    if volume is None: return False
+    next_num = index.next_chapter_number()
+    num_str = str(next_num).zfill(CHAPTER_PADDING)
+    full_title = f"{CHAPTER_PREFIX}{num_str}{CHAPTER_SUFFIX} {chapter_topic}"
+    sanitized_topic = sanitize_filename(chapter_topic)
+    new_filename = f"{num_str}-{sanitized_topic}.txt"
+    new_chapter_id = f"chap-{uuid.uuid4().hex[:8]}"
+    new_chapter = {"id": new_chapter_id, "type": "chapter", "title": full_title, "filename": new_filename}
+    chapter_path = os.path.join(project_path, 'chapters', new_filename)
+    try:
+        pending = _active_batch(data)
+        if pending is not None: pending.created.append(chapter_path)  # 批次提交时统一创建
+        else: open(chapter_path, 'w', encoding='utf-8').close()
+    except Exception as e:
+        # 文件创建失败则不修改结构
+        print(f"Error creating chapter file: {e}")
+        return False
+    volume['children'].append(new_chapter)
+    index.added_chapter(volume, new_chapter)
+    _record(data, {'op': 'add_chapter', 'volume_id': volume_id, 'chapter': new_chapter})
+    return True
+
 def rename_item_in_structure(data, item_id, new_title):
-    for volume in data['structure']:
-        if volume['id'] == item_id: volume['title'] = new_title; return True
-        for chapter in volume['children']:
-            if chapter['id'] == item_id: chapter['title'] = new_title; return True
-    return False
+    index = get_index(data); node = index.node(item_id)
+    if node is None: return False
+    old_title = node.data.get('title', ''); node.data['title'] = new_title
+    index.renamed(item_id, old_title, new_title)
+    _record(data, {'op': 'rename', 'id': item_id, 'title': new_title})
+    return True
+
+def _remove_chapter_files(project_path, chapter):
+    chapter_filename = chapter.get('filename')
+    if not chapter_filename: return
+    # 删富文本文件
+    try: os.remove(os.path.join(project_path, 'chapters', chapter_filename))
+    except FileNotFoundError: pass
+    # 删纯文本备份
+    try: os.remove(os.path.join(project_path, 'plain_backup', chapter_filename))
+    except FileNotFoundError: pass
+    remove_journal(project_path, chapter_filename)
+    _emit_change('deleted', project_path, [chapter_filename])
+
+def _remove_from_structure(data, node):
+    index = get_index(data)
+    if node.kind == 'volume':
+        index.removed_volume(node.data)
+        data['structure'].remove(node.data)
+        return
+    children = node.parent.data['children']
+    # 通常删除的是卷末章节，从尾部判断避免线性查找
+    if children and children[-1] is node.data: children.pop()
+    else: children.remove(node.data)
+    index.removed_chapter(node.data)
 
 def delete_item(project_path, data, item_id):
-    for i, volume in enumerate(data['structure']):
-        if volume['id'] == item_id:
-            for chapter in volume.get('children', []):
-                if chapter.get('filename'):
-                    chapter_filename = chapter.get('filename')
-                    # 删富文本文件
-                    try: os.remove(os.path.join(project_path, 'chapters', chapter_filename))
-                    except FileNotFoundError: pass
-                    # 删纯文本备份
-                    try: os.remove(os.path.join(project_path, 'plain_backup', chapter_filename))
-                    except FileNotFoundError: pass
-            del data['structure'][i]
-            return True
-        for j, chapter in enumerate(volume.get('children', [])):
-            if chapter['id'] == item_id:
-                if chapter.get('filename'):
-                    chapter_filename = chapter.get('filename')
-                    try: os.remove(os.path.join(project_path, 'chapters', chapter_filename))
-                    except FileNotFoundError: pass
-                    try: os.remove(os.path.join(project_path, 'plain_backup', chapter_filename))
-                    except FileNotFoundError: pass
-                del volume['children'][j]
-                return True
-    return False
+    node = get_index(data).node(item_id)
+    if node is None: return False
+    chapters = node.data.get('children', []) if node.kind == 'volume' else [node.data]
+    pending = _active_batch(data)
+    if pending is not None: pending.removed.extend(chapters)  # 批次落盘后再删文件
+    else:
+        for chapter in chapters: _remove_chapter_files(project_path, chapter)
+    _remove_from_structure(data, node)
+    _record(data, {'op': 'delete', 'id': item_id})
+    return True
+
+def _merge_volume(data, volume_id):
+    index = get_index(data); target = index.volume(volume_id)
+    if target is None: return False
+    first_volume = next((vol for vol in data['structure'] if vol is not target), None)
+    if first_volume is not None:
+        moved = target.get('children', [])
+        first_volume['children'].extend(moved)
+        index.moved_chapters(moved, first_volume)
+        target['children'] = []
+    index.removed_volume(target)
+    data['structure'].remove(target)
+    return True
+
+def merge_and_delete_volume(data, volume_id, project_path=None):
+    """删除卷但保留章节：章节追加到第一个剩余卷末尾，章节文件不动。
+
+    只剩这一卷时章节无处可去，连同卷一起移出结构（与原有行为一致）。
+    """
+    volume = get_index(data).volume(volume_id)
+    moved = [ch.get('filename') for ch in volume.get('children', [])] if volume else []
+    if not _merge_volume(data, volume_id): return False
+    _record(data, {'op': 'merge_volume', 'id': volume_id})
+    if moved: _emit_change('moved', project_path, moved)
+    return True
+
+def move_chapter(data, chapter_id, volume_id, position=None):
+    """把章节移到指定卷的 position 处（默认卷末），章节文件不动。"""
+    index = get_index(data); node = index.node(chapter_id); target = index.volume(volume_id)
+    if node is None or node.kind != 'chapter' or target is None: return False
+    _move_chapter(index, node, target, position)
+    _record(data, {'op': 'move', 'id': chapter_id, 'volume_id': volume_id, 'position': position})
+    return True
+
+def _move_chapter(index, node, target, position):
+    node.parent.data['children'].remove(node.data)
+    children = target['children']
+    if position is None or position >= len(children): children.append(node.data)
+    else: children.insert(max(0, position), node.data)
+    index.moved_chapters([node.data], target)
+
+def apply_structure_op(data, op):
+    """在内存结构上重放一条 oplog 操作（只改结构，文件操作在记录前已完成）。"""
+    index = get_index(data); kind = op.get('op')
+    if kind == 'add_volume':
+        if index.node(op['volume']['id']) is None:
+            data['structure'].append(op['volume']); index.added_volume(op['volume'])
+    elif kind == 'add_chapter':
+        volume = index.volume(op['volume_id'])
+        if volume is not None and index.node(op['chapter']['id']) is None:
+            volume['children'].append(op['chapter']); index.added_chapter(volume, op['chapter'])
+    elif kind == 'rename':
+        node = index.node(op['id'])
+        if node is not None:
+            old_title = node.data.get('title', ''); node.data['title'] = op['title']
+            index.renamed(op['id'], old_title, op['title'])
+    elif kind == 'delete':
+        node = index.node(op['id'])
+        if node is not None: _remove_from_structure(data, node)
+    elif kind == 'move':
+        node = index.node(op['id']); target = index.volume(op['volume_id'])
+        if node is not None and node.kind == 'chapter' and target is not None: _move_chapter(index, node, target, op.get('position'))
+    elif kind == 'merge_volume':
+        _merge_volume(data, op['id'])
 
 def load_project_structure(project_path):
     json_path = os.path.join(project_path, "project.json")
     try:
-        with open(json_path, 'r', encoding='utf-8') as f: return json.load(f)
+        with open(json_path, 'r', encoding='utf-8') as f: text = f.read()
+        data = json.loads(text)
     except Exception as e: return None
+    # 上次退出前尚未合并写入 project.json 的结构修改
+    ops = read_oplog(project_path, text)
+    if ops:
+        for op in ops: apply_structure_op(data, op)
+        save_project_structure(project_path, data)
+    return data
 
 def save_project_structure(project_path, data):
-    json_path = os.path.join(project_path, "project.json")
     try:
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+        write_project_json(project_path, data)  # 临时文件 + 原子替换，并重置 oplog
         return True
     except Exception as e: return False
 
 def load_chapter_content(project_path, filename):
     chapter_path = os.path.join(project_path, 'chapters', filename)
-    try:
-        with open(chapter_path, 'r', encoding='utf-8') as f: return f.read()
+    try: content = read_text(chapter_path, project_path)
     except FileNotFoundError: return f"错误：无法加载文件\n路径：{chapter_path}"
     except Exception as e: return f"错误：读取文件失败\n{e}"
+    # 自动保存只写了编辑日志时，在完整内容上重放
+    try: return replay_journal(project_path, filename, content)
+    except Exception: return content
 
 def save_chapter_content(project_path, filename, content):
     chapter_path = os.path.join(project_path, 'chapters', filename)
     try:
-        with open(chapter_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        options = load_options(project_path)  # project.json 中的可选压缩设置
+        write_text(chapter_path, content, options, project_path)
+        # 完整内容已落盘，日志以新内容为基底重新开始
+        reset_journal(project_path, filename, content)
         # 生成纯文本备份
         try:
             backup_dir = os.path.join(project_path, 'plain_backup')
             os.makedirs(backup_dir, exist_ok=True)
-            plain = content
-            # 保留段落/换行
-            plain = re.sub(r'(?i)<br\s*/?>', '\n', plain)
-            plain = re.sub(r'(?i)</p>', '\n', plain)
-            # 去除样式与脚本
-            plain = re.sub(r'(?is)<style.*?</style>', '', plain)
-            plain = re.sub(r'(?is)<script.*?</script>', '', plain)
-            # 去标签
-            plain = re.sub(r'<[^>]+>', '', plain)
-            # HTML 实体
-            plain = _html.unescape(plain)
-            # 规范换行: 去除多余连续空行（保留最多两个）
-            plain = re.sub(r'\n{3,}', '\n\n', plain)
-            with open(os.path.join(backup_dir, filename), 'w', encoding='utf-8') as pf:
-                pf.write(plain.strip() + '\n')
+            backup_path = os.path.join(backup_dir, filename)
+            # 原生格式自带纯文本，旧 HTML 章节走单遍转换
+            if is_native(content): write_text(backup_path, native_plain_text(content) + '\n', options, project_path)
+            elif options.get('compression', 'none') != 'none': write_text(backup_path, html_to_plain(content) + '\n', options, project_path)
+            else:
+                with open(backup_path, 'w', encoding='utf-8') as pf: write_plain(content, pf)
         except Exception:
             pass
+        _emit_change('saved', project_path, [filename])
         return True, "保存成功"
-    except Exception as e: return False, str(e)
\ No newline at end of file
+    except Exception as e: return False, str(e)
+
+def save_chapters_atomic(project_path, contents):
+    """多章新内容一起落盘（全项目替换等）：章节与纯文本备份先全部写成临时文件，
+    都成功后再逐个替换原文件；任一临时文件写入失败则清理临时文件，原文件全部保持不变。
+    替换途中失败（例如文件被别的程序占用）时清理其余临时文件，已替换的章照常重置日志并通知，
+    返回的信息中列出这些章。
+
+    contents 为 {文件名: 新内容}。返回 (成功, 信息)。
+    """
+    options = load_options(project_path); staged = []
+    try:
+        backup_dir = os.path.join(project_path, 'plain_backup'); os.makedirs(backup_dir, exist_ok=True)
+        for filename, content in contents.items():
+            plain = (native_plain_text(content) if is_native(content) else html_to_plain(content)) + '\n'
+            # 章节文件在前：一章的章节文件替换成功即视为已替换
+            for path, text in ((os.path.join(project_path, 'chapters', filename), content), (os.path.join(backup_dir, filename), plain)):
+                write_text(path + '.tmp', text, options, project_path); staged.append((filename, path + '.tmp', path))
+    except Exception as e:
+        for _, tmp_path, _ in staged:
+            try: os.remove(tmp_path)
+            except OSError: pass
+        return False, str(e)
+    applied = []; error = None
+    try:
+        for filename, tmp_path, path in staged:
+            os.replace(tmp_path, path)
+            if not applied or applied[-1] != filename: applied.append(filename)
+    except OSError as e:
+        error = e
+        for _, tmp_path, _ in staged:
+            try: os.remove(tmp_path)
+            except OSError: pass
+    for filename in applied: reset_journal(project_path, filename, contents[filename])
+    if applied: _emit_change('saved', project_path, applied)
+    if error is not None:
+        names = '、'.join(applied[:10]) + (' 等' if len(applied) > 10 else '')
+        return False, (f"只替换了 {len(applied)}/{len(contents)} 章（{names}），其余保持不变：{error}" if applied
+                       else f"替换失败，原文件保持不变：{error}")
+    return True, f"已保存 {len(contents)} 章"
+
+def migrate_chapter_files(project_path, to_html=False):
+    """把 chapters/*.txt 批量转换为原生格式（to_html=True 时导出回 HTML）。
+
+    需要已创建 QGuiApplication。返回 (转换数, 转换前字节数, 转换后字节数)。
+    """
+    chapters_dir = os.path.join(project_path, 'chapters')
+    converted = before = after = 0
+    for filename in sorted(os.listdir(chapters_dir)):
+        if not filename.endswith('.txt'): continue
+        path = os.path.join(chapters_dir, filename)
+        size = os.path.getsize(path)
+        content = load_chapter_content(project_path, filename)
+        if to_html == (not is_native(content)): continue
+        new_content = native_to_html(content) if to_html else html_to_native(content)
+        success, _ = save_chapter_content(project_path, filename, new_content)
+        if success:
+            converted += 1; before += size; after += os.path.getsize(path)
+    return converted, before, after
+
+def set_project_storage(project_path, compression='none', level=None):
+    """切换项目的章节压缩方式，并把 chapters/ 与 plain_backup/ 中的文件全部按新方式重写。
+
+    compression 取值见 chapter_storage.CODECS；zlib-dict 会先用本项目章节训练字典。
+    返回重写的文件数；project.json 写入失败时返回 -1。
+    """
+    if compression not in CODECS: raise ValueError(f'未知的压缩方式: {compression}')
+    data = load_project_structure(project_path)
+    if data is None: return -1
+    # 先用旧设置（旧字典）把全部内容解码到内存，再落新字典与新文件
+    files = []
+    for sub in ('chapters', 'plain_backup'):
+        folder = os.path.join(project_path, sub)
+        if not os.path.isdir(folder): continue
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith('.txt'):
+                path = os.path.join(folder, filename)
+                files.append((path, read_text(path, project_path)))
+    options = {'compression': compression}
+    if level is not None: options['level'] = level
+    if compression == 'zlib-dict':
+        zdict = train_dictionary([text.encode('utf-8') for path, text in files if os.sep + 'chapters' + os.sep in path])
+        with open(os.path.join(project_path, DICT_FILENAME), 'wb') as f: f.write(zdict)
+    for path, text in files:
+        write_text(path, text, options, project_path)
+    data['storage'] = options
+    if not save_project_structure(project_path, data): return -1
+    return len(files)
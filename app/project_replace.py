@@ -0,0 +1,249 @@
+"""全项目查找替换：并行扫描生成逐章预览，确认后原子地写回。
+
+- 扫描：未打开的章节交给进程池逐章读取匹配（有未压缩编辑日志的章节回到主进程处理），
+  已打开的标签直接扫描编辑器中的文本；
+- 替换：未打开的原生格式章节直接改写纯文本与格式游程（replace_in_native，不经 QTextDocument），
+  在后台线程中分批交给进程池，可报告进度与取消；旧 HTML 章节、有待重放日志的章节与跨段的
+  匹配/替换在后台线程中用 QTextDocument + QTextCursor 逐处替换。全部算好后经
+  project_manager.save_chapters_atomic 一次性落盘。
+  已打开的标签直接改动编辑器文档（可撤销，随自动保存写回），这一步在界面线程中。
+"""
+import json
+import os
+import re
+import threading
+from bisect import bisect_right
+from itertools import accumulate
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .chapter_format import MAGIC, is_native, native_plain_text, load_into_document, document_to_native, split_native
+from .chapter_journal import read_journal
+from .chapter_storage import read_text
+from .html_plain import html_to_plain
+from .parallel import map_ordered, imap_ordered, POOL_MIN_ITEMS
+from .project_manager import load_chapter_content, save_chapters_atomic
+from .project_search import chapter_plain_text
+
+PREVIEW_CONTEXTS = 20  # 每章预览的命中条数
+CONTEXT_RADIUS = 16
+REPLACE_CHUNK = 64  # 替换时每个进程池任务处理的章节数
+
+
+def expand_replacement(match, replacement: str, regex: bool) -> str:
+    return match.expand(replacement) if regex else replacement
+
+
+def _contexts(text, pattern, replacement, regex, limit=PREVIEW_CONTEXTS):
+    count = 0; contexts = []
+    for m in pattern.finditer(text):
+        if m.end() == m.start(): continue
+        count += 1
+        if len(contexts) < limit:
+            before = text[max(0, m.start() - CONTEXT_RADIUS):m.start()].replace('\n', ' ')
+            after = text[m.end():m.end() + CONTEXT_RADIUS].replace('\n', ' ')
+            contexts.append(f"{before}【{m.group(0)} → {expand_replacement(m, replacement, regex)}】{after}")
+    return count, contexts
+
+
+def scan_chapter(item, pattern_src, flags, replacement, regex):
+    """扫描一章（进程池任务）。有待重放的编辑日志时返回 None，由主进程处理。"""
+    project_path, filename = item
+    path = os.path.join(project_path, 'chapters', filename)
+    try: content = read_text(path, project_path)
+    except (OSError, ValueError): return 0, []
+    if read_journal(project_path, filename, content): return None
+    text = native_plain_text(content) if is_native(content) else html_to_plain(content)
+    return _contexts(text, re.compile(pattern_src, flags), replacement, regex)
+
+
+def scan_project(project_path, chapters, pattern, replacement, regex=False, live_texts=None, workers=None):
+    """返回有命中的章节预览 [{'id','title','filename','count','contexts'}]，按目录顺序。
+
+    chapters 为 [(章节 id, 标题, 文件名)]；live_texts 为已打开标签的 {章节 id: 纯文本}。
+    """
+    live_texts = live_texts or {}
+    closed = [ch for ch in chapters if ch[0] not in live_texts]
+    items = [(project_path, filename) for _, _, filename in closed]
+    results = map_ordered(scan_chapter, items, workers if len(items) >= POOL_MIN_ITEMS else 1,
+                          pattern.pattern, pattern.flags, replacement, regex)
+    scanned = dict(zip((ch[0] for ch in closed), results))
+    previews = []
+    for chapter_id, title, filename in chapters:
+        if chapter_id in live_texts: count, contexts = _contexts(live_texts[chapter_id], pattern, replacement, regex)
+        elif scanned[chapter_id] is None:
+            count, contexts = _contexts(chapter_plain_text(project_path, filename) or '', pattern, replacement, regex)
+        else: count, contexts = scanned[chapter_id]
+        if count: previews.append({'id': chapter_id, 'title': title, 'filename': filename, 'count': count, 'contexts': contexts})
+    return previews
+
+
+def replace_in_document(document, pattern, replacement, regex=False) -> int:
+    """在文档上替换全部匹配（一个撤销步骤），返回替换数。
+
+    从后往前替换，前面匹配的位置不受影响；QTextCursor.insertText 沿用被替换文字的格式。
+    """
+    from PyQt6.QtGui import QTextCursor
+    matches = [m for m in pattern.finditer(document.toPlainText()) if m.end() > m.start()]
+    if not matches: return 0
+    cursor = QTextCursor(document); cursor.beginEditBlock()
+    for m in reversed(matches):
+        cursor.setPosition(m.start()); cursor.setPosition(m.end(), QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(expand_replacement(m, replacement, regex))
+    cursor.endEditBlock()
+    return len(matches)
+
+
+def _splice_runs(runs, edits):
+    """按 edits [(起, 止, 新长度)]（游程坐标，升序、不重叠）改写格式游程。
+
+    替换文字沿用被替换的最后一个字的格式（与 QTextCursor 选中后 insertText 一致）。
+    """
+    starts = list(accumulate([0] + [length for length, _ in runs])); out = []
+
+    def emit(length, fmt):
+        if length <= 0: return
+        if out and out[-1][1] == fmt: out[-1][0] += length
+        else: out.append([length, fmt])
+
+    def copy(lo, hi):
+        i = bisect_right(starts, lo) - 1
+        while lo < hi:
+            end = min(starts[i + 1], hi); emit(end - lo, runs[i][1]); lo = end; i += 1
+
+    pos = 0
+    for start, end, length in edits:
+        copy(pos, start); emit(length, runs[bisect_right(starts, end - 1) - 1][1]); pos = end
+    copy(pos, starts[-1])
+    return out
+
+
+def replace_in_native(content: str, pattern, replacement, regex=False):
+    """不经 QTextDocument 直接改写原生格式章节，返回 (新内容, 替换数)，结果与 replace_in_document 相同。
+
+    匹配或替换文字含换行（跨段、段内软换行）时返回 None，交给 QTextDocument 处理。
+    """
+    header, text = split_native(content)
+    # 与 toPlainText() 看到的文字相同（逐字对应，位置不变）
+    plain = text.replace('\u2028', '\n').replace('\xa0', ' ')
+    fixed = None if regex else replacement  # 非正则替换的文字固定，只需检查一次
+    if fixed is not None and _breaks_block(fixed): return None
+    edits = []; pieces = []; pos = 0; newlines = 0
+    for m in pattern.finditer(plain):
+        start, end = m.span()
+        if end == start: continue
+        replaced = fixed if fixed is not None else m.expand(replacement)
+        if plain.find('\n', start, end) >= 0 or (fixed is None and _breaks_block(replaced)): return None
+        newlines += text.count('\n', pos, start)  # 段落分隔不占游程
+        edits.append((start - newlines, end - newlines, len(replaced)))
+        pieces.append(text[pos:start]); pieces.append(replaced); pos = end
+    if not edits: return content, 0
+    runs = header.get('runs', []); length = len(text) - text.count('\n')
+    if sum(n for n, _ in runs) != length: return None  # 游程不完整（非本程序写出）
+    pieces.append(text[pos:])
+    if len(runs) == 1:  # 整章同一格式（导入的纯文本等）不必逐处拆分游程
+        length += sum(n - (end - start) for start, end, n in edits)
+        header['runs'] = [[length, runs[0][1]]] if length else []
+    else: header['runs'] = _splice_runs(runs, edits)
+    return f"{MAGIC}\n{json.dumps(header, ensure_ascii=False, separators=(',', ':'))}\n" + ''.join(pieces), len(edits)
+
+
+def _breaks_block(text: str) -> bool:
+    return '\n' in text or '\r' in text or '\u2028' in text or '\u2029' in text
+
+
+def replace_chunk(filenames, project_path, pattern_src, flags, replacement, regex):
+    """替换一批章节（进程池任务），逐章返回 (文件名, 状态, 新内容或错误信息, 替换数)。
+
+    状态为 'ok'（替换数为 0 时不需要写回）、'document'（需要 QTextDocument：旧 HTML、
+    有待重放的编辑日志或跨段替换）或 'error'。
+    """
+    pattern = re.compile(pattern_src, flags); results = []
+    for filename in filenames:
+        try: content = read_text(os.path.join(project_path, 'chapters', filename), project_path)
+        except (OSError, ValueError) as e: results.append((filename, 'error', f'{filename}: {e}', 0)); continue
+        if not is_native(content) or read_journal(project_path, filename, content):
+            results.append((filename, 'document', None, 0)); continue
+        replaced = replace_in_native(content, pattern, replacement, regex)
+        if replaced is None: results.append((filename, 'document', None, 0))
+        else: results.append((filename, 'ok', replaced[0] if replaced[1] else None, replaced[1]))
+    return results
+
+
+def _replace_with_document(project_path, filename, pattern, replacement, regex):
+    """QTextDocument 路径（可在后台线程中调用）。返回 (新内容或 None, 替换数)，读取失败时抛出 OSError。"""
+    from PyQt6.QtGui import QTextDocument
+    content = load_chapter_content(project_path, filename)
+    if not is_native(content) and content.startswith('错误：'): raise OSError(content)
+    document = load_into_document(content, QTextDocument())
+    count = replace_in_document(document, pattern, replacement, regex)
+    return (document_to_native(document) if count else None), count
+
+
+def apply_to_files(project_path, filenames, pattern, replacement, regex=False, workers=None, progress=None, cancel=None):
+    """替换未打开的章节并原子地写回。返回 (成功, 替换数, 信息)。
+
+    progress(已处理章数, 总章数) 随进度调用；cancel 为 threading.Event，写回之前被设置则放弃、不修改任何章节。
+    需要 QTextDocument 的章节在调用线程中处理（需要已创建 QGuiApplication）。
+    """
+    filenames = list(filenames); total_files = len(filenames)
+    chunks = [filenames[i:i + REPLACE_CHUNK] for i in range(0, total_files, REPLACE_CHUNK)]
+    contents = {}; total = 0; done = 0; with_document = []
+    results = imap_ordered(replace_chunk, chunks, workers if total_files >= POOL_MIN_ITEMS else 1,
+                           project_path, pattern.pattern, pattern.flags, replacement, regex)
+    try:
+        for chunk in results:
+            if cancel is not None and cancel.is_set(): return False, 0, '已取消'
+            for filename, status, content, count in chunk:
+                if status == 'error': return False, 0, content
+                if status == 'document': with_document.append(filename)
+                elif count: contents[filename] = content; total += count
+            done += len(chunk) - sum(1 for r in chunk if r[1] == 'document')
+            if progress: progress(done, total_files)
+    finally:
+        results.close()
+    for filename in with_document:
+        if cancel is not None and cancel.is_set(): return False, 0, '已取消'
+        try: content, count = _replace_with_document(project_path, filename, pattern, replacement, regex)
+        except OSError as e: return False, 0, str(e)
+        if count: contents[filename] = content; total += count
+        done += 1
+        if progress: progress(done, total_files)
+    if not contents: return True, 0, '没有需要替换的内容'
+    success, msg = save_chapters_atomic(project_path, contents)
+    return success, total if success else 0, msg
+
+
+class ProjectReplaceWorker(QObject):
+    """在后台线程中运行 apply_to_files。
+
+    progress(已处理章数, 总章数)；finished(成功, 替换数, 信息)。写回之前可以 cancel()。
+    """
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(bool, int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cancel = threading.Event(); self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, project_path, filenames, pattern, replacement, regex=False):
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='project-replace', daemon=True,
+                                        args=(self._cancel, project_path, list(filenames), pattern, replacement, regex))
+        self._thread.start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None):
+        if self._thread is not None: self._thread.join(timeout)
+
+    def _run(self, cancel, project_path, filenames, pattern, replacement, regex):
+        try:
+            success, total, msg = apply_to_files(project_path, filenames, pattern, replacement, regex,
+                                                 progress=lambda done, n: self.progress.emit(done, n), cancel=cancel)
+        except Exception as e: success, total, msg = False, 0, str(e)
+        self.finished.emit(success, total, msg)
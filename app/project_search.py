@@ -0,0 +1,93 @@
+"""项目正文搜索（不依赖全文索引）：正则 / 区分大小写 / 全词匹配，后台逐章扫描并流式返回命中。"""
+import re
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .project_manager import load_chapter_content
+from .chapter_format import is_native, native_plain_text
+from .html_plain import html_to_plain
+from .search_index import make_snippet
+
+MAX_HITS = 2000
+_WORD_BEFORE = r'(?<![A-Za-z0-9_])'
+_WORD_AFTER = r'(?![A-Za-z0-9_])'
+
+
+def compile_query(text: str, regex: bool = False, case_sensitive: bool = False, whole_word: bool = False):
+    """构造搜索用的正则；regex=True 时 text 按正则解析（非法时抛出 re.error）。
+
+    全词只看两侧是否紧挨英文字母、数字或下划线：\\b 会把汉字也当作单词字符，
+    中文正文里连续的汉字之间没有边界，全词匹配就什么也找不到了。
+    """
+    pattern = text if regex else re.escape(text)
+    if whole_word: pattern = rf'{_WORD_BEFORE}(?:{pattern}){_WORD_AFTER}'
+    return re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+
+
+def chapter_plain_text(project_path, filename):
+    """章节当前内容的纯文本（含未压缩的编辑日志），偏移与编辑器中 toPlainText() 一致；读取失败返回 None。"""
+    content = load_chapter_content(project_path, filename)
+    if is_native(content): return native_plain_text(content)
+    if content.startswith('错误：'): return None
+    return html_to_plain(content)
+
+
+def locate_match(text: str, pattern, position: int, length: int):
+    """在编辑器的纯文本中确认命中位置，返回 (position, length)。
+
+    命中偏移来自 plain_backup 或 html_to_plain，旧 HTML 章节与编辑器的 toPlainText() 可能对不上
+    （表格、列表等段落模型不一致时）；对不上时改选离原偏移最近的一处匹配，找不到则原样返回。
+    """
+    m = pattern.match(text, position)
+    if m and m.end() - m.start() == length: return position, length
+    best = None
+    for m in pattern.finditer(text):
+        if m.end() == m.start(): continue
+        if best is not None and m.start() - position > abs(best.start() - position): break
+        if best is None or abs(m.start() - position) < abs(best.start() - position): best = m
+    return (best.start(), best.end() - best.start()) if best else (position, length)
+
+
+class ProjectSearchWorker(QObject):
+    """逐章读取、逐章发出命中；同一时刻只运行一个搜索，新搜索开始即取消旧的。
+
+    hits(token, [(章节 id, 标题, 位置, 长度, 摘要), ...]) 每章发出一次；
+    finished(token, 命中数, 是否被截断/取消)。token 用于界面丢弃已取消搜索的迟到结果。
+    """
+    hits = pyqtSignal(int, list)
+    finished = pyqtSignal(int, int, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._token = 0
+        self._cancel = threading.Event()
+
+    def start(self, project_path, chapters, pattern, live_texts=None) -> int:
+        """chapters 为 [(章节 id, 标题, 文件名)]（按目录顺序）；live_texts 为已打开标签的 {章节 id: 纯文本}。"""
+        self.cancel()
+        self._token += 1; self._cancel = threading.Event()
+        threading.Thread(target=self._run, name='project-search', daemon=True,
+                         args=(self._token, self._cancel, project_path, list(chapters), pattern, dict(live_texts or {}))).start()
+        return self._token
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _run(self, token, cancel, project_path, chapters, pattern, live_texts):
+        total = 0; truncated = False
+        for chapter_id, title, filename in chapters:
+            if cancel.is_set(): break
+            text = live_texts.get(chapter_id)
+            if text is None:
+                try: text = chapter_plain_text(project_path, filename)
+                except Exception: text = None
+            if not text: continue
+            found = []
+            for m in pattern.finditer(text):
+                if m.end() == m.start(): continue  # 空匹配（如 a*）没有可跳转的内容
+                found.append((chapter_id, title, m.start(), m.end() - m.start(), make_snippet(text, m.start(), m.end() - m.start())))
+                if total + len(found) >= MAX_HITS or cancel.is_set(): break
+            if found and not cancel.is_set():
+                total += len(found); self.hits.emit(token, found)
+            if total >= MAX_HITS: truncated = True; break
+        self.finished.emit(token, total, truncated or cancel.is_set())
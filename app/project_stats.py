@@ -0,0 +1,177 @@
+"""项目字数统计缓存：逐章统计结果保存在项目目录下的 chapter_stats.json，统计面板无需打开章节。
+
+文件内容（紧凑 JSON）::
+
+    {"version": 1, "wide_cjk": false,
+     "chapters": {文件名: [大小, mtime, crc32, 字符, 字数(不含空格), 汉字, 英文, 数字, 符号]}}
+
+统计来源为 plain_backup/ 中的纯文本（分类与状态栏相同，见 text_stats）。大小或 mtime 变化时
+比较内容哈希，哈希也变了才重新统计；冷启动时需要统计的章节较多则交给进程池。
+"""
+import os
+import logging
+import json
+import queue
+import threading
+import zlib
+
+from .chapter_storage import read_text
+from .config import STATS_WIDE_CJK
+from .parallel import map_ordered, POOL_MIN_ITEMS
+from .text_stats import STAT_KEYS, count_text
+
+STATS_FILENAME = 'chapter_stats.json'
+STATS_VERSION = 1
+
+
+def _backup_text(path, project_path) -> str:
+    text = read_text(path, project_path)
+    return text[:-1] if text.endswith('\n') else text  # 备份末尾追加的换行不计入（与编辑器一致）
+
+
+def count_chapter(item, wide_cjk):
+    """统计一章（进程池任务）。item 为 (项目目录, 文件名, 已知哈希)；哈希未变时不重新统计，counts 返回 None。"""
+    project_path, filename, known_hash = item
+    path = os.path.join(project_path, 'plain_backup', filename)
+    try:
+        stat = os.stat(path); text = _backup_text(path, project_path)
+    except (OSError, ValueError): return None
+    digest = zlib.crc32(text.encode('utf-8', 'surrogatepass'))
+    counts = None if digest == known_hash else list(count_text(text, wide_cjk))
+    return stat.st_size, stat.st_mtime, digest, counts
+
+
+class ProjectStats:
+    """逐章统计缓存。读写都加锁，可在保存线程与界面线程中同时使用。"""
+    def __init__(self, project_path, wide_cjk=None):
+        self.project_path = project_path
+        self.wide_cjk = STATS_WIDE_CJK if wide_cjk is None else wide_cjk
+        self.path = os.path.join(project_path, STATS_FILENAME)
+        self._lock = threading.Lock()
+        self._chapters = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f: saved = json.load(f)
+            if saved.get('version') == STATS_VERSION and saved.get('wide_cjk') == self.wide_cjk:
+                self._chapters = saved.get('chapters', {})
+        except (OSError, ValueError, AttributeError): pass
+
+    def save(self):
+        """原子写入（临时文件 + 替换）。"""
+        with self._lock:
+            blob = json.dumps({'version': STATS_VERSION, 'wide_cjk': self.wide_cjk, 'chapters': self._chapters},
+                              ensure_ascii=False, separators=(',', ':'))
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f: f.write(blob)
+        os.replace(tmp_path, self.path)
+
+    def _store(self, filename, result):
+        if result is None: self._chapters.pop(filename, None); return
+        size, mtime, digest, counts = result
+        if counts is None: counts = self._chapters[filename][3:]  # 只是被 touch 过
+        self._chapters[filename] = [size, mtime, digest] + counts
+
+    def refresh(self, workers=None):
+        """与 plain_backup/ 对账，返回有变化（重新统计、更新 mtime 或移除）的章数。"""
+        backup_dir = os.path.join(self.project_path, 'plain_backup')
+        on_disk = {}
+        if os.path.isdir(backup_dir):
+            with os.scandir(backup_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.txt') and entry.is_file(): on_disk[entry.name] = entry.stat()
+        with self._lock:
+            removed = self._chapters.keys() - on_disk.keys()
+            for filename in removed: del self._chapters[filename]
+            stale = [f for f, stat in on_disk.items()
+                     if (self._chapters.get(f) or [None, None])[:2] != [stat.st_size, stat.st_mtime]]
+            items = [(self.project_path, f, (self._chapters.get(f) or [None] * 3)[2]) for f in stale]
+        if not stale: return len(removed)
+        # 冷项目（或大批外部修改）交给进程池，零散变化就地处理
+        results = map_ordered(count_chapter, items, workers if len(items) >= POOL_MIN_ITEMS else 1, self.wide_cjk)
+        with self._lock:
+            for filename, result in zip(stale, results): self._store(filename, result)
+        return len(removed) + len(stale)
+
+    def update(self, filename):
+        """章节保存后更新一章（文件已删除时移除）。"""
+        with self._lock: known = (self._chapters.get(filename) or [None] * 3)[2]
+        result = count_chapter((self.project_path, filename, known), self.wide_cjk)
+        with self._lock: self._store(filename, result)
+
+    def remove(self, filename):
+        with self._lock: self._chapters.pop(filename, None)
+
+    def chapter(self, filename):
+        """一章的统计 {STAT_KEYS...}；尚未统计时返回 None。"""
+        with self._lock: entry = self._chapters.get(filename)
+        return dict(zip(STAT_KEYS, entry[3:])) if entry else None
+
+    def snapshot(self) -> dict:
+        """{文件名: 计数列表（STAT_KEYS 顺序）}。"""
+        with self._lock: return {f: entry[3:] for f, entry in self._chapters.items()}
+
+
+def summarize(structure, counts: dict):
+    """按目录结构汇总：返回 (全书合计, [(卷, 卷合计, [(章, 计数)])])。计数均为 STAT_KEYS 顺序的列表。"""
+    zero = [0] * len(STAT_KEYS); book = list(zero); volumes = []
+    for volume in structure:
+        volume_total = list(zero); chapters = []
+        for chapter in volume.get('children', []):
+            chapter_counts = counts.get(chapter.get('filename')) or zero
+            chapters.append((chapter, chapter_counts))
+            volume_total = [a + b for a, b in zip(volume_total, chapter_counts)]
+        volumes.append((volume, volume_total, chapters))
+        book = [a + b for a, b in zip(book, volume_total)]
+    return book, volumes
+
+
+class StatsUpdater:
+    """后台线程维护统计缓存：启动时对账（冷项目用进程池），之后随章节保存/删除逐章更新并写回。
+
+    不经过章节变更事件写入的文件（导入在子进程中写章节）由调用方 refresh() 触发对账。
+    更新失败时记入日志并保留在 error 中，之后每次处理事件都先对账重试，成功后清除。
+    """
+    def __init__(self, project_path, stats: ProjectStats):
+        self.project_path = os.path.abspath(project_path); self.stats = stats
+        self._queue = queue.Queue()
+        self.ready = threading.Event()  # 启动对账完成
+        self.error = None  # 最近一次更新失败的原因；None 表示缓存与磁盘一致
+        self._thread = threading.Thread(target=self._run, name='project-stats', daemon=True)
+        self.refresh()  # 打开项目即对账
+        self._thread.start()
+
+    def notify(self, kind, project_path, filenames):
+        """project_manager.add_change_listener 的回调（可能在任意线程中调用）。"""
+        if kind == 'moved' or not project_path or os.path.abspath(project_path) != self.project_path: return
+        for filename in filenames: self._queue.put(('update', filename))
+
+    def refresh(self):
+        self._queue.put(('refresh', None))
+
+    def wait_idle(self):
+        self._queue.join()
+
+    def stop(self, timeout: float = 10.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            tasks = [self._queue.get()]
+            while True:  # 合并已排队的事件
+                try: tasks.append(self._queue.get_nowait())
+                except queue.Empty: break
+            stop = None in tasks
+            try:
+                changed = False
+                if ('refresh', None) in tasks or self.error is not None:
+                    changed = self.stats.refresh() > 0 or not os.path.exists(self.stats.path)
+                for filename in dict.fromkeys(t[1] for t in tasks if t and t[0] == 'update'):
+                    self.stats.update(filename); changed = True
+                if changed: self.stats.save()
+                self.error = None
+            except Exception as e:
+                logging.exception('project stats update failed'); self.error = str(e)
+            finally:
+                self.ready.set()
+                for _ in tasks: self._queue.task_done()
+            if stop: break
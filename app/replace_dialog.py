@@ -0,0 +1,41 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QDialogButtonBox, QLabel, QTreeWidget, QTreeWidgetItem
+)
+from PyQt6.QtCore import Qt
+
+
+class ReplacePreviewDialog(QDialog):
+    """全项目替换预览：逐章列出命中数与上下文，勾选要替换的章节。"""
+    def __init__(self, query, replacement, previews, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("替换预览")
+        self.resize(640, 480)
+        total = sum(p['count'] for p in previews)
+
+        # 控件
+        summary = QLabel(f"“{query}” → “{replacement}”：{len(previews)} 章，共 {total} 处")
+        self.tree = QTreeWidget(); self.tree.setHeaderHidden(True)
+        for p in previews:
+            chapter = QTreeWidgetItem([f"{p['title']}  ·  {p['count']} 处"])
+            chapter.setData(0, Qt.ItemDataRole.UserRole, p['id'])
+            chapter.setFlags(chapter.flags() | Qt.ItemFlag.ItemIsUserCheckable); chapter.setCheckState(0, Qt.CheckState.Checked)
+            for context in p['contexts']: chapter.addChild(QTreeWidgetItem([context]))
+            if p['count'] > len(p['contexts']): chapter.addChild(QTreeWidgetItem([f"…… 另有 {p['count'] - len(p['contexts'])} 处"]))
+            self.tree.addTopLevelItem(chapter)
+        if len(previews) <= 20: self.tree.expandAll()
+
+        # 布局
+        layout = QVBoxLayout(self)
+        layout.addWidget(summary)
+        layout.addWidget(self.tree)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.button(QDialogButtonBox.StandardButton.Ok).setText("替换所选章节")
+        buttons.accepted.connect(self.accept); buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def selected_ids(self):
+        ids = []
+        for i in range(self.tree.topLevelItemCount()):
+            item = self.tree.topLevelItem(i)
+            if item.checkState(0) == Qt.CheckState.Checked: ids.append(item.data(0, Qt.ItemDataRole.UserRole))
+        return ids
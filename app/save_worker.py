@@ -0,0 +1,104 @@
+"""后台保存：GUI 线程只负责拍快照，序列化（原生章节格式）与写盘在工作线程完成。"""
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from .project_manager import save_chapter_content
+from .chapter_journal import append_journal, content_crc
+from .chapter_format import document_to_native
+
+
+class ChapterSaveWorker(QObject):
+    """按章节文件名合并的保存队列。
+
+    每个章节至多一个待处理任务：完整快照（compact）会替换排队中的旧快照和
+    之前的日志增量；日志增量（append）则在同一任务内顺序累积。
+    结果通过 ``saved`` 信号 (filename, success, msg, token) 异步回到 GUI 线程。
+    每个章节记住最后一次完整落盘内容的校验值，内容未变化的快照不再重写文件与备份。
+    快照在 GUI 线程中创建，写完后交回 GUI 线程释放（QTextDocument 须在所属线程中析构）。
+    """
+    saved = pyqtSignal(str, bool, str, object)
+
+    def __init__(self, project_path: str, parent=None):
+        super().__init__(parent)
+        self.project_path = project_path
+        self._pending: dict = {}  # filename -> {'document', 'ops', 'token'}
+        self._persisted: dict = {}  # filename -> 最后完整落盘内容的 crc32（日志追加后失效）
+        self._order: list = []
+        self._released: list = []  # 已写完、等待在 GUI 线程中释放的快照
+        self._busy = False
+        self._active = None  # 正在写入的章节
+        self._cond = threading.Condition()
+        self._stopped = False
+        self.saved.connect(self._release)
+        self._thread = threading.Thread(target=self._run, name='chapter-save', daemon=True)
+        self._thread.start()
+
+    def _job(self, filename):
+        job = self._pending.get(filename)
+        if job is None:
+            job = self._pending[filename] = {'document': None, 'ops': [], 'token': None}
+            self._order.append(filename)
+        return job
+
+    def submit(self, filename: str, document, token=None):
+        """提交文档快照（QTextDocument.clone() 得到的独立副本），完整重写并清空日志。"""
+        with self._cond:
+            job = self._job(filename)
+            job['document'] = document; job['ops'] = []; job['token'] = token
+            self._cond.notify()
+
+    def append(self, filename: str, ops: list, token=None):
+        """提交自上次快照以来的编辑增量，只追加到日志。"""
+        with self._cond:
+            job = self._job(filename)
+            job['ops'].extend(ops); job['token'] = token
+            self._cond.notify()
+
+    def is_pending(self, filename: str) -> bool:
+        """该章节是否还有排队中或正在写入的任务。"""
+        with self._cond: return filename in self._pending or filename == self._active
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """阻塞直到队列清空（关闭窗口/标签前调用）。"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def stop(self, timeout: float | None = None):
+        self.flush(timeout)
+        with self._cond:
+            self._stopped = True; self._cond.notify_all()
+        self._thread.join(timeout)
+        self._release()
+
+    @pyqtSlot()
+    def _release(self):
+        with self._cond: self._released.clear()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._order or self._stopped)
+                if self._stopped and not self._order: return
+                filename = self._order.pop(0); job = self._pending.pop(filename)
+                self._busy = True; self._active = filename
+            success, msg = True, ''
+            try:
+                if job['document'] is not None:
+                    content = document_to_native(job['document']); digest = content_crc(content)
+                    if self._persisted.get(filename) == digest:
+                        msg = '内容未变化'
+                    else:
+                        success, msg = save_chapter_content(self.project_path, filename, content)
+                        if success: self._persisted[filename] = digest
+                if success and job['ops']:
+                    append_journal(self.project_path, filename, job['ops'])
+                    self._persisted.pop(filename, None)
+                    msg = msg or '已自动保存'
+            except Exception as e:
+                success, msg = False, str(e)
+            finally:
+                with self._cond:
+                    # 工作线程不留快照的引用，最后一个引用总在 GUI 线程中（_release）放掉
+                    if job['document'] is not None: self._released.append(job.pop('document'))
+                    self._busy = False; self._active = None; self._cond.notify_all()
+            self.saved.emit(filename, success, msg, job['token'])
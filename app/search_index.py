@@ -0,0 +1,317 @@
+"""项目级全文索引：基于 plain_backup/ 的字符二元/三元组倒排索引（适用于不分词的中文）。
+
+索引保存在项目目录下的 ``search_index.db``（SQLite，标准库自带）::
+
+    docs(id, filename, mtime, size, hash, text)   每章一行；text 为建立索引时的纯文本（zlib）
+    postings(bucket, data)                        n-gram 按 crc32 分到 65536 个桶，
+                                                  data 为压缩后 marshal 的 {n-gram: uint32 数组}，
+                                                  数组元素为 章 id << 8 | min(次数, 255)
+
+查询时把关键词切成三元组（两个字的关键词用二元组），取各 n-gram 倒排表的交集得到候选章，
+以各 n-gram 次数的最小值作为命中次数上界排序，再用索引中保存的纯文本逐一核实：
+上界不超过当前第 K 名的实际次数即可停止，因此只需核实少数几章即可得到准确的前 K 名与摘要。
+"""
+import os
+import re
+import logging
+import zlib
+import array
+import marshal
+import sqlite3
+import threading
+import queue
+from operator import add
+
+from .chapter_storage import read_text
+
+INDEX_FILENAME = 'search_index.db'
+INDEX_VERSION = '1'
+BUCKETS = 1 << 16
+SNIPPET_RADIUS = 24
+_SPACE_RE = re.compile(r'\s')
+
+
+def extract_grams(text: str) -> dict:
+    """{n-gram: 次数}：全文小写后的字符二元组与三元组（不跨越空白）。"""
+    text = text.lower(); rest = text[1:]
+    counts = {}
+    for grams in (map(add, text, rest), map(add, map(add, text, rest), text[2:])):
+        for gram in grams: counts[gram] = counts.get(gram, 0) + 1
+    for gram in [g for g in counts if _SPACE_RE.search(g)]: del counts[gram]
+    return counts
+
+
+def query_grams(query: str):
+    """关键词对应的 n-gram：每个非空白片段取三元组，两个字的片段取二元组，单字片段无法走索引。"""
+    grams = []
+    for seg in query.lower().split():
+        if len(seg) >= 3: grams.extend(seg[i:i + 3] for i in range(len(seg) - 2))
+        elif len(seg) == 2: grams.append(seg)
+    return list(dict.fromkeys(grams))
+
+
+def bucket_of(gram: str) -> int:
+    return zlib.crc32(gram.encode('utf-8')) & (BUCKETS - 1)
+
+
+def _posting(doc_id: int, count: int) -> int:
+    return doc_id << 8 | (count if count < 255 else 255)
+
+
+def _unpack(blob: bytes) -> dict:
+    values = array.array('I'); values.frombytes(blob)
+    return {v >> 8: v & 255 for v in values}
+
+
+def make_snippet(text: str, pos: int, length: int, radius: int = SNIPPET_RADIUS) -> str:
+    start = max(0, pos - radius); end = min(len(text), pos + length + radius)
+    snippet = text[start:end].replace('\n', ' ').strip()
+    return ('…' if start > 0 else '') + snippet + ('…' if end < len(text) else '')
+
+
+class SearchIndex:
+    def __init__(self, project_path):
+        self.project_path = project_path
+        self.db_path = os.path.join(project_path, INDEX_FILENAME)
+        self.conn = sqlite3.connect(self.db_path, timeout=10)
+        self.conn.execute('PRAGMA journal_mode=WAL'); self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS docs(id INTEGER PRIMARY KEY, filename TEXT UNIQUE NOT NULL,
+                                            mtime REAL, size INTEGER, hash INTEGER, text BLOB);
+            CREATE TABLE IF NOT EXISTS postings(bucket INTEGER PRIMARY KEY, data BLOB NOT NULL);
+        ''')
+        row = self.conn.execute("SELECT value FROM meta WHERE key='version'").fetchone()
+        if row is None or row[0] != INDEX_VERSION:
+            with self.conn:
+                self.conn.execute('DELETE FROM docs'); self.conn.execute('DELETE FROM postings')
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (INDEX_VERSION,))
+
+    def close(self):
+        self.conn.close()
+
+    def is_empty(self) -> bool:
+        return self.conn.execute('SELECT 1 FROM docs LIMIT 1').fetchone() is None
+
+    def doc_count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+
+    # ---------- 建立 ----------
+    def rebuild(self):
+        """从 plain_backup/ 全量重建，返回索引的章节数。"""
+        backup_dir = os.path.join(self.project_path, 'plain_backup')
+        filenames = sorted(f for f in os.listdir(backup_dir) if f.endswith('.txt')) if os.path.isdir(backup_dir) else []
+        postings = {}; docs = []
+        for doc_id, filename in enumerate(filenames, 1):
+            path = os.path.join(backup_dir, filename); stat = os.stat(path)
+            text = read_text(path, self.project_path); data = text.encode('utf-8')
+            for gram, n in extract_grams(text).items():
+                entry = postings.get(gram)
+                if entry is None: postings[gram] = [_posting(doc_id, n)]
+                else: entry.append(_posting(doc_id, n))
+            docs.append((doc_id, filename, stat.st_mtime, stat.st_size, zlib.crc32(data), zlib.compress(data, 1)))
+        buckets = {}
+        for gram, entry in postings.items():
+            packed = array.array('I', entry).tobytes(); key = bucket_of(gram)
+            bucket = buckets.get(key)
+            if bucket is None: buckets[key] = {gram: packed}
+            else: bucket[gram] = packed
+        with self.conn:
+            self.conn.execute('DELETE FROM docs'); self.conn.execute('DELETE FROM postings')
+            self.conn.executemany('INSERT INTO docs VALUES (?, ?, ?, ?, ?, ?)', docs)
+            self.conn.executemany('INSERT INTO postings VALUES (?, ?)', ((k, zlib.compress(marshal.dumps(b), 1)) for k, b in buckets.items()))
+        return len(docs)
+
+    # ---------- 增量维护 ----------
+    def _old_grams(self, filename):
+        row = self.conn.execute('SELECT id, text FROM docs WHERE filename=?', (filename,)).fetchone()
+        if row is None: return None, {}
+        return row[0], extract_grams(zlib.decompress(row[1]).decode('utf-8'))
+
+    def _apply_diff(self, doc_id, old: dict, new: dict):
+        """只改写次数有变化的 n-gram 所在的桶。"""
+        changes = {}
+        for gram, n in new.items():
+            if old.get(gram) != n: changes.setdefault(bucket_of(gram), []).append((gram, n))
+        for gram in old:
+            if gram not in new: changes.setdefault(bucket_of(gram), []).append((gram, 0))
+        for key, items in changes.items():
+            row = self.conn.execute('SELECT data FROM postings WHERE bucket=?', (key,)).fetchone()
+            bucket = marshal.loads(zlib.decompress(row[0])) if row else {}
+            for gram, n in items:
+                entry = _unpack(bucket[gram]) if gram in bucket else {}
+                if n: entry[doc_id] = n if n < 255 else 255
+                else: entry.pop(doc_id, None)
+                if entry: bucket[gram] = array.array('I', [doc << 8 | c for doc, c in sorted(entry.items())]).tobytes()
+                else: bucket.pop(gram, None)
+            if bucket: self.conn.execute('INSERT OR REPLACE INTO postings VALUES (?, ?)', (key, zlib.compress(marshal.dumps(bucket), 1)))
+            else: self.conn.execute('DELETE FROM postings WHERE bucket=?', (key,))
+        return sum(len(items) for items in changes.values())
+
+    def update_document(self, filename):
+        """按 plain_backup/ 中的当前内容重新索引一章（新旧 n-gram 求差，只更新变化部分）。
+
+        文件已不存在时从索引中移除。返回变化的 n-gram 数。
+        """
+        path = os.path.join(self.project_path, 'plain_backup', filename)
+        try:
+            stat = os.stat(path); text = read_text(path, self.project_path)
+        except FileNotFoundError: return self.remove_document(filename)
+        data = text.encode('utf-8')
+        with self.conn:
+            doc_id, old = self._old_grams(filename)
+            if doc_id is None:
+                doc_id = self.conn.execute('INSERT INTO docs(filename) VALUES (?)', (filename,)).lastrowid
+            self.conn.execute('UPDATE docs SET mtime=?, size=?, hash=?, text=? WHERE id=?',
+                              (stat.st_mtime, stat.st_size, zlib.crc32(data), zlib.compress(data, 1), doc_id))
+            return self._apply_diff(doc_id, old, extract_grams(text))
+
+    def remove_document(self, filename):
+        with self.conn:
+            doc_id, old = self._old_grams(filename)
+            if doc_id is None: return 0
+            changed = self._apply_diff(doc_id, old, {})
+            self.conn.execute('DELETE FROM docs WHERE id=?', (doc_id,))
+            return changed
+
+    def reconcile(self):
+        """与 plain_backup/ 对账：mtime/大小变化且内容哈希不同的章重新索引，新增的加入，消失的移除。
+
+        用于拾取应用之外（或上次运行时未来得及索引）的修改，而无需全量重建。返回 (更新数, 移除数)。
+        """
+        backup_dir = os.path.join(self.project_path, 'plain_backup')
+        on_disk = {}
+        if os.path.isdir(backup_dir):
+            with os.scandir(backup_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.txt') and entry.is_file(): on_disk[entry.name] = entry.stat()
+        indexed = {row[0]: row[1:] for row in self.conn.execute('SELECT filename, mtime, size, hash FROM docs')}
+        updated = removed = 0
+        for filename in indexed.keys() - on_disk.keys():
+            self.remove_document(filename); removed += 1
+        for filename, stat in on_disk.items():
+            known = indexed.get(filename)
+            if known and known[0] == stat.st_mtime and known[1] == stat.st_size: continue
+            if known:
+                try: text = read_text(os.path.join(backup_dir, filename), self.project_path)
+                except (OSError, ValueError): continue
+                if zlib.crc32(text.encode('utf-8')) == known[2]:
+                    # 只是被 touch 过，内容没变：记下新的 mtime 即可
+                    with self.conn: self.conn.execute('UPDATE docs SET mtime=?, size=? WHERE filename=?', (stat.st_mtime, stat.st_size, filename))
+                    continue
+            self.update_document(filename); updated += 1
+        return updated, removed
+
+    # ---------- 查询 ----------
+    def _postings(self, gram) -> dict:
+        row = self.conn.execute('SELECT data FROM postings WHERE bucket=?', (bucket_of(gram),)).fetchone()
+        blob = marshal.loads(zlib.decompress(row[0])).get(gram) if row else None
+        return _unpack(blob) if blob else {}
+
+    def doc_text(self, doc_id) -> str:
+        row = self.conn.execute('SELECT text FROM docs WHERE id=?', (doc_id,)).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else ''
+
+    def candidates(self, query: str):
+        """[(章 id, 命中次数上界)]，按上界降序；关键词无法走索引（单字）时返回 None。"""
+        grams = query_grams(query)
+        if not grams: return None
+        lists = sorted((self._postings(g) for g in grams), key=len)
+        bounds = lists[0]
+        for other in lists[1:]:
+            if not bounds: break
+            bounds = {doc: min(n, other[doc]) for doc, n in bounds.items() if doc in other}
+        # 次数达到 255 的记录已截断，视为无上界
+        return sorted(((doc, n if n < 255 else 1 << 30) for doc, n in bounds.items()), key=lambda item: -item[1])
+
+    def search(self, query: str, limit: int = 50, live=None):
+        """返回 (结果列表, 候选章数)。结果为 {'filename','count','position','snippet'}，按命中次数降序。
+
+        live 为 {filename: 纯文本}：已打开标签中的内容（可能只写进了编辑日志，索引尚未更新），
+        这些章以它为准逐一核实，不看索引中的旧文本。
+        """
+        query = query.strip()
+        if not query: return [], 0
+        needle = query.lower(); live = live or {}
+        results = []
+
+        def verify(filename, text):
+            lowered = text.lower(); count = lowered.count(needle)
+            if not count: return
+            pos = lowered.find(needle)
+            results.append({'filename': filename, 'count': count, 'position': pos, 'snippet': make_snippet(text, pos, len(needle))})
+            results.sort(key=lambda r: -r['count'])
+            if len(results) > limit: results.pop()
+
+        for filename, text in live.items(): verify(filename, text)
+        candidates = self.candidates(query)
+        if candidates is None:  # 单字：没有可用的 n-gram，逐章核实
+            candidates = [(doc, 1 << 30) for (doc,) in self.conn.execute('SELECT id FROM docs')]
+        filenames = dict(self.conn.execute('SELECT id, filename FROM docs'))
+        for doc, bound in candidates:
+            if len(results) >= limit and bound <= results[-1]['count']: break
+            if filenames[doc] in live: continue
+            verify(filenames[doc], self.doc_text(doc))
+        return results, len(candidates)
+
+
+class IndexUpdater:
+    """后台线程维护全文索引，打字与保存路径上只做一次入队。
+
+    - project_manager 的章节变更事件（保存/删除）经 notify() 入队，后台逐章增量更新；
+      短时间内同一章的多次事件合并为一次；
+    - 启动时索引为空则全量建立，否则与 plain_backup/ 对账。
+    写入使用线程自己的 SQLite 连接，界面线程的查询连接在 WAL 模式下不受阻塞。
+    更新失败时记入日志并保留在 error 中（此时索引可能过期），之后每次处理事件都先与
+    plain_backup/ 对账重试，成功后清除。
+    """
+    def __init__(self, project_path):
+        self.project_path = os.path.abspath(project_path)
+        self._queue = queue.Queue()
+        self.busy = threading.Event()
+        self.error = None  # 最近一次更新失败的原因；None 表示索引与磁盘一致
+        self._thread = threading.Thread(target=self._run, name='search-index', daemon=True)
+        self._queue.put(('startup', None))
+        self._thread.start()
+
+    def notify(self, kind, project_path, filenames):
+        """project_manager.add_change_listener 的回调（可能在任意线程中调用）。"""
+        if kind == 'moved' or not project_path or os.path.abspath(project_path) != self.project_path: return
+        for filename in filenames: self._queue.put(('update', filename))
+
+    def reconcile(self):
+        self._queue.put(('reconcile', None))
+
+    def wait_idle(self):
+        self._queue.join()
+
+    def stop(self, timeout: float = 10.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        index = SearchIndex(self.project_path)
+        try:
+            while True:
+                tasks = [self._queue.get()]
+                while True:  # 合并已排队的事件
+                    try: tasks.append(self._queue.get_nowait())
+                    except queue.Empty: break
+                self.busy.set()
+                stop = None in tasks
+                try:
+                    if ('startup', None) in tasks:
+                        if index.is_empty(): index.rebuild()
+                        else: index.reconcile()
+                    elif ('reconcile', None) in tasks or self.error is not None: index.reconcile()
+                    for filename in dict.fromkeys(t[1] for t in tasks if t and t[0] == 'update'):
+                        index.update_document(filename)
+                    self.error = None
+                except Exception as e:
+                    logging.exception('search index update failed'); self.error = str(e)
+                finally:
+                    self.busy.clear()
+                    for _ in tasks: self._queue.task_done()
+                if stop: break
+        finally:
+            index.close()
@@ -24,6 +24,8 @@ class SettingsDialog(QDialog):
         self.autosave_spin = QSpinBox(); self.autosave_spin.setRange(1, 60); self.autosave_spin.setSuffix(" 秒")
         self.enter_mode_combo = QComboBox(); self.enter_mode_combo.addItems(["none", "halfwidth", "fullwidth"])
         self.show_line_numbers_cb = QCheckBox("状态栏显示行数")
+        self.daily_goal_spin = QSpinBox(); self.daily_goal_spin.setRange(0, 100000); self.daily_goal_spin.setSingleStep(500)
+        self.daily_goal_spin.setSuffix(" 字"); self.daily_goal_spin.setSpecialValueText("不设目标")
 
         # 背景相关
         self.bg_path_edit = QLineEdit(); browse_btn = QPushButton("浏览...")
@@ -44,6 +46,7 @@ class SettingsDialog(QDialog):
         self.bg_opacity_slider.setValue(sd.get('background_opacity', 80))
         self.enter_mode_combo.setCurrentText(sd.get('enter_mode', 'fullwidth'))
         self.show_line_numbers_cb.setChecked(sd.get('show_line_numbers', False))
+        self.daily_goal_spin.setValue(sd.get('daily_goal', 0))
 
         # 布局
         layout = QVBoxLayout(self)
@@ -59,6 +62,7 @@ class SettingsDialog(QDialog):
         form.addRow("背景不透明度:", self.bg_opacity_slider)
         form.addRow("回车缩进:", self.enter_mode_combo)
         form.addRow("状态栏行数:", self.show_line_numbers_cb)
+        form.addRow("每日目标:", self.daily_goal_spin)
         layout.addLayout(form)
         buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         buttons.accepted.connect(self.accept); buttons.rejected.connect(self.reject)
@@ -82,6 +86,7 @@ class SettingsDialog(QDialog):
         sd['background_opacity'] = self.bg_opacity_slider.value()
         sd['enter_mode'] = self.enter_mode_combo.currentText()
         sd['show_line_numbers'] = self.show_line_numbers_cb.isChecked()
+        sd['daily_goal'] = self.daily_goal_spin.value()
         super().accept()
 
     def get_settings(self):
@@ -24,6 +24,8 @@ DEFAULT_SETTINGS = {
     "enter_mode": "fullwidth",
     # 【新增】是否显示行数统计
     "show_line_numbers": False,
+    # 每日目标字数（0 表示不设目标），用于字数统计面板的写作进度页
+    "daily_goal": 0,
     }
 }
 
@@ -0,0 +1,80 @@
+import time
+from datetime import date
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QDialogButtonBox, QLabel, QTreeWidget, QTreeWidgetItem, QHeaderView, QTabWidget, QWidget
+)
+from PyQt6.QtCore import Qt
+
+from .project_stats import summarize
+from .progress_log import week_start
+from .widgets.progress_heatmap import ProgressHeatmap
+
+COLUMNS = ("名称", "字数(不含空格)", "汉字", "英文", "数字", "符号")
+STAT_COLUMNS = (1, 2, 3, 4, 5)  # 对应 STAT_KEYS[1:]
+
+
+class StatsDashboard(QDialog):
+    """字数统计面板：全书与各卷合计，展开卷时才填充章节行（上千章也能立即打开）；
+    给出 progress（ProgressLog）时另有“写作进度”页：今日/本周字数、每日目标与近一年热力图。"""
+    def __init__(self, structure, counts, pending=False, progress=None, goal=0, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("字数统计")
+        self.resize(720, 560)
+        book, volumes = summarize(structure, counts)
+        chapter_count = sum(len(chapters) for _, _, chapters in volumes)
+
+        # 控件
+        summary = QLabel(f"全书 {len(volumes)} 卷 {chapter_count} 章：字数 {book[1]}（汉字 {book[2]}，英文 {book[3]}，数字 {book[4]}，符号 {book[5]}）"
+                         + ("\n部分章节仍在统计中，数字可能偏小" if pending else ""))
+        self.tree = QTreeWidget(); self.tree.setColumnCount(len(COLUMNS)); self.tree.setHeaderLabels(COLUMNS)
+        self.tree.setUniformRowHeights(True)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self._pending_chapters = {}
+        for volume, total, chapters in volumes:
+            item = self._make_item(volume.get('title', ''), total)
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator if chapters
+                                         else QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicator)
+            self._pending_chapters[id(item)] = chapters
+            self.tree.addTopLevelItem(item)
+        self.tree.itemExpanded.connect(self._fill_chapters)
+
+        # 布局
+        layout = QVBoxLayout(self)
+        counts_page = QWidget(); counts_layout = QVBoxLayout(counts_page)
+        counts_layout.addWidget(summary); counts_layout.addWidget(self.tree)
+        if progress is None:
+            layout.addWidget(counts_page)
+        else:
+            tabs = QTabWidget(); tabs.addTab(counts_page, "字数"); tabs.addTab(self._progress_page(progress, goal), "写作进度")
+            layout.addWidget(tabs)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def _progress_page(self, progress, goal):
+        daily = progress.daily(); today = date.today()
+        today_net, today_added = daily.get(today.isoformat(), (0, 0))
+        monday = week_start(today)
+        week_added = sum(added for day, (_, added) in daily.items() if date.fromisoformat(day) >= monday)
+        midnight = time.mktime(today.timetuple())
+        sessions = progress.sessions(since=midnight)
+        lines = [f"今日新增 {today_added} 字（净增 {today_net}）" + (f"，目标 {goal} 字，完成 {min(100, today_added * 100 // goal)}%" if goal else ""),
+                 f"本周新增 {week_added} 字；今日写作 {len(sessions)} 段"]
+        for start, end, net in sessions[-5:]:
+            lines.append(f"　{time.strftime('%H:%M', time.localtime(start))}–{time.strftime('%H:%M', time.localtime(end))}  净增 {net} 字")
+        page = QWidget(); page_layout = QVBoxLayout(page)
+        page_layout.addWidget(QLabel("\n".join(lines)))
+        page_layout.addWidget(ProgressHeatmap(daily, goal, today))
+        page_layout.addStretch()
+        return page
+
+    def _make_item(self, title, counts):
+        item = QTreeWidgetItem([title] + [str(counts[i]) for i in STAT_COLUMNS])
+        for column in range(1, len(COLUMNS)): item.setTextAlignment(column, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return item
+
+    def _fill_chapters(self, item):
+        chapters = self._pending_chapters.pop(id(item), None)
+        if chapters:
+            item.addChildren([self._make_item(chapter.get('title', ''), counts) for chapter, counts in chapters])
@@ -0,0 +1,134 @@
+"""project.json 的持久化：原子写入 + 操作日志 + 防抖合并。
+
+- 每次结构修改（新建/重命名/删除/合并卷）只向 ``project.oplog`` 追加一行操作并 fsync，
+  O(1) 且崩溃后可重放；
+- 一串连续修改由 StructureStore 合并为一次 project.json 写入（临时文件 + os.replace，
+  不会留下写了一半的文件）；
+- oplog 首行记录其基底 project.json 的 crc32，写完新的 project.json 后重置；
+  若在两者之间崩溃，基底不匹配的旧日志会被忽略，不会重复应用。
+"""
+import os
+import json
+import zlib
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .config import PROJECT_JSON_PRETTY
+
+OPLOG_FILENAME = 'project.oplog'
+FLUSH_DELAY_MS = 1000
+
+
+def dumps_structure(data, pretty: bool = PROJECT_JSON_PRETTY) -> str:
+    if pretty: return json.dumps(data, ensure_ascii=False, indent=4)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def _reset_oplog(project_path, base_text: str):
+    with open(os.path.join(project_path, OPLOG_FILENAME), 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'base': zlib.crc32(base_text.encode('utf-8'))}) + '\n')
+
+
+def write_project_json(project_path, data, pretty: bool = PROJECT_JSON_PRETTY):
+    """原子写入 project.json，随后以新内容为基底重置操作日志。"""
+    json_path = os.path.join(project_path, 'project.json')
+    text = dumps_structure(data, pretty)
+    tmp_path = json_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text); f.flush(); os.fsync(f.fileno())
+    os.replace(tmp_path, json_path)
+    _reset_oplog(project_path, text)
+
+
+def ensure_oplog(project_path):
+    """oplog 缺失（旧版本保存的项目）或基底不是当前 project.json 时，以当前内容写好首行，
+    保证之后追加的操作在崩溃后能被重放。"""
+    try:
+        with open(os.path.join(project_path, 'project.json'), 'r', encoding='utf-8') as f: text = f.read()
+    except OSError: return
+    try:
+        with open(os.path.join(project_path, OPLOG_FILENAME), 'r', encoding='utf-8') as f: header = f.readline()
+        if json.loads(header).get('base') == zlib.crc32(text.encode('utf-8')): return
+    except (OSError, ValueError, AttributeError): pass
+    _reset_oplog(project_path, text)
+
+
+def read_oplog(project_path, base_text: str):
+    """返回基底与 base_text（当前 project.json 原文）匹配的未落盘操作。"""
+    try:
+        with open(os.path.join(project_path, OPLOG_FILENAME), 'r', encoding='utf-8') as f: lines = f.read().splitlines()
+    except FileNotFoundError: return []
+    if not lines: return []
+    try:
+        if json.loads(lines[0]).get('base') != zlib.crc32(base_text.encode('utf-8')): return []
+    except (ValueError, AttributeError): return []
+    ops = []
+    for line in lines[1:]:
+        try: ops.append(json.loads(line))
+        except ValueError: break  # 崩溃时写了一半的尾行
+    return ops
+
+
+_stores: dict = {}  # id(data) -> StructureStore
+
+
+def get_store(data):
+    store = _stores.get(id(data))
+    return store if store is not None and store.data is data else None
+
+
+def record_op(data, op: dict):
+    """由 project_manager 的结构修改函数调用；没有关联 StructureStore 的 data 不记录。"""
+    store = get_store(data)
+    if store is not None: store.record_many([op])
+
+
+class StructureStore(QObject):
+    """把一串结构修改合并为一次 project.json 写入；期间的操作先记入 oplog。
+
+    每次提交的修改（单个操作或一整个批次）发出一次 changed(ops)，界面据此刷新。
+    """
+    changed = pyqtSignal(list)
+    flush_failed = pyqtSignal(str)
+
+    def __init__(self, project_path, data, parent=None, delay_ms: int = FLUSH_DELAY_MS):
+        super().__init__(parent)
+        self.project_path = project_path; self.data = data
+        self._dirty = False
+        ensure_oplog(project_path)  # data 即当前 project.json（load_project_structure 已重放并落盘）
+        self._timer = QTimer(self); self._timer.setSingleShot(True); self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+        _stores[id(data)] = self
+
+    def record_many(self, ops):
+        """修改已作用于内存中的结构：oplog 写不进去（磁盘满、只读）时报告 flush_failed，
+        修改照常交给随后的 project.json 写入，界面照常收到 changed。"""
+        try:
+            with open(os.path.join(self.project_path, OPLOG_FILENAME), 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(op, ensure_ascii=False) + '\n' for op in ops)); f.flush(); os.fsync(f.fileno())
+        except OSError as e:
+            self.flush_failed.emit(f'无法写入操作日志：{e}')
+        self.schedule_flush()
+        self.changed.emit(list(ops))
+
+    def committed(self, ops):
+        """批次已直接写入 project.json（连同此前未落盘的修改）。"""
+        self._timer.stop(); self._dirty = False
+        self.changed.emit(list(ops))
+
+    def schedule_flush(self):
+        self._dirty = True
+        self._timer.start()
+
+    def flush(self) -> bool:
+        self._timer.stop()
+        if not self._dirty: return True
+        try:
+            write_project_json(self.project_path, self.data)
+        except Exception as e:
+            self.flush_failed.emit(str(e)); return False
+        self._dirty = False
+        return True
+
+    def close(self):
+        self.flush()
+        if _stores.get(id(self.data)) is self: del _stores[id(self.data)]
@@ -0,0 +1,26 @@
+"""标签内存估算与休眠选择。
+
+QTextDocument 不报告自身占用，这里按实测系数估算：排版后的正文每字约 28 字节
+（文本、段落与排版缓存，中文段落约百字时的 RSS 增量），每个撤销步骤约 3.5 KB。
+估算只用于在标签之间比较与对照预算，不追求精确。
+"""
+CHAR_BYTES = 28
+UNDO_STEP_BYTES = 3584
+
+
+def estimate_document_bytes(document) -> int:
+    return document.characterCount() * CHAR_BYTES + document.availableUndoSteps() * UNDO_STEP_BYTES
+
+
+def pick_hibernation(tabs, budget: int, keep=()):
+    """tabs 为 [(章节 id, 最近使用时间, 估算字节)]；返回为回到预算内应休眠的章节 id（最久未用的在前）。
+
+    keep 中的标签（当前标签）不休眠。
+    """
+    total = sum(size for _, _, size in tabs)
+    victims = []
+    for cid, _, size in sorted(tabs, key=lambda tab: tab[1]):
+        if total <= budget: break
+        if cid in keep: continue
+        victims.append(cid); total -= size
+    return victims
@@ -0,0 +1,131 @@
+"""字数统计：整段文本统计，以及随编辑增量维护的逐段（QTextBlock）统计。"""
+
+import re
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # 没有 NumPy 时使用 Counter 统计
+    np = None
+
+from .config import STATS_WIDE_CJK
+
+STAT_KEYS = ('chars_with_space', 'chars_no_space', 'chinese', 'english', 'digits', 'symbols')
+SPACE, CHINESE, ENGLISH, DIGIT, SYMBOL = range(5)
+NUMPY_MIN_CHARS = 4096  # 更短的文本用 Counter（避免编码与查表的固定开销）
+
+CJK_RANGES = ((0x4E00, 0x9FFF),)
+# STATS_WIDE_CJK：另计入扩展 A 区、CJK 标点符号区（U+3000 全角空格仍算空白）与全角标点
+WIDE_CJK_RANGES = CJK_RANGES + ((0x3400, 0x4DBF), (0x3001, 0x303F), (0xFF01, 0xFF0F), (0xFF1A, 0xFF20),
+                                (0xFF3B, 0xFF40), (0xFF5B, 0xFF65))
+
+
+def _classify(c: str, ranges) -> int:
+    """单个字符的分类，与原逐字循环的判断顺序一致：空白 > 汉字 > 英文字母 > 数字 > 符号。"""
+    if c.isspace(): return SPACE
+    code = ord(c)
+    if any(lo <= code <= hi for lo, hi in ranges): return CHINESE
+    if c.isalpha() and c.isascii(): return ENGLISH
+    if c.isdigit(): return DIGIT
+    return SYMBOL
+
+
+_tables = {}
+_cjk_runs = {}
+
+
+def _category_table(ranges):
+    """全部码位 -> 分类的查找表（约 1.1 MB，首次使用时建立）。"""
+    table = _tables.get(ranges)
+    if table is None:
+        table = np.full(0x110000, SYMBOL, dtype=np.uint8)
+        table[[c for c in range(0x110000) if chr(c).isdigit()]] = DIGIT
+        table[ord('A'):ord('Z') + 1] = ENGLISH; table[ord('a'):ord('z') + 1] = ENGLISH
+        for lo, hi in ranges: table[lo:hi + 1] = CHINESE
+        table[[c for c in range(0x3001) if chr(c).isspace()]] = SPACE
+        _tables[ranges] = table
+    return table
+
+
+def _category_counts(text: str, ranges):
+    if np is not None and len(text) >= NUMPY_MIN_CHARS:
+        codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        return np.bincount(_category_table(ranges)[codes], minlength=5).tolist()
+    # 先整段删去汉字（正文中多为连续的长串），其余字符种类很少，按 Counter 汇总后逐个分类
+    runs = _cjk_runs.get(ranges)
+    if runs is None:
+        runs = _cjk_runs[ranges] = re.compile('[' + ''.join(f'{re.escape(chr(lo))}-{re.escape(chr(hi))}' for lo, hi in ranges) + ']+')
+    rest = runs.sub('', text)
+    counts = [0] * 5; counts[CHINESE] = len(text) - len(rest)
+    for c, n in Counter(rest).items(): counts[_classify(c, ranges)] += n
+    return counts
+
+
+def count_text(text: str, wide_cjk=None):
+    """返回与 STAT_KEYS 顺序一致的计数元组（\r 不计入）。
+
+    整串分类：有 NumPy 时把文本转为 UCS-4 数组查表计数，否则用正则整段去掉汉字后 Counter 汇总其余字符。
+    wide_cjk 为 None 时取 config.STATS_WIDE_CJK。
+    """
+    ranges = WIDE_CJK_RANGES if (STATS_WIDE_CJK if wide_cjk is None else wide_cjk) else CJK_RANGES
+    space, chinese, english, digits, symbols = _category_counts(text, ranges)
+    no_space = chinese + english + digits + symbols
+    return (len(text) - text.count('\r'), no_space, chinese, english, digits, symbols)
+
+
+def calc_text_stats(text: str, wide_cjk=None) -> dict:
+    return dict(zip(STAT_KEYS, count_text(text, wide_cjk)))
+
+
+def block_counts(document, wide_cjk=None) -> list:
+    """逐段统计（count_text 元组的列表）。可在工作线程中对尚未交给编辑器的文档调用。"""
+    counts = []; block = document.begin()
+    while block.isValid():
+        counts.append(count_text(block.text(), wide_cjk)); block = block.next()
+    return counts
+
+
+class BlockStats:
+    """按段落缓存统计结果，只重算 contentsChange 涉及的段落。
+
+    以段落序号为下标的旁表：编辑区之前的段落序号不变，编辑区之后的段落与编辑前一一对应，
+    因此由编辑前后的段落数即可算出被替换的旧段落范围。段落之间的换行计入 chars_with_space，
+    合计与对 toPlainText() 调用 calc_text_stats 的结果一致。
+    """
+    def __init__(self, document, wide_cjk=None, blocks=None):
+        """blocks 为预先算好的 block_counts(document)（例如后台载入时），省去首次整篇统计。"""
+        self.document = document; self.wide_cjk = wide_cjk
+        document.documentLayout()  # 没有布局的文档不发出 contentsChange
+        self._blocks = []; self._totals = [0] * len(STAT_KEYS)
+        self._rebuild(blocks)
+        document.contentsChange.connect(self._on_contents_change)
+
+    def _rebuild(self, blocks=None):
+        self._blocks = blocks if blocks is not None else block_counts(self.document, self.wide_cjk)
+        self._totals = [sum(column) for column in zip(*self._blocks)] if self._blocks else [0] * len(STAT_KEYS)
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        document = self.document
+        new_count = document.blockCount(); grown = new_count - len(self._blocks)
+        first = document.findBlock(position)
+        last = document.findBlock(min(position + added, document.characterCount() - 1))
+        if not first.isValid() or not last.isValid(): self._rebuild(); return
+        start = first.blockNumber(); end = last.blockNumber() + 1
+        if end - grown < start: self._rebuild(); return
+        fresh = []; block = first
+        while block.isValid() and block.blockNumber() < end:
+            fresh.append(count_text(block.text(), self.wide_cjk)); block = block.next()
+        stale = self._blocks[start:end - grown]
+        totals = self._totals
+        for i in range(len(totals)):
+            totals[i] += sum(stats[i] for stats in fresh) - sum(stats[i] for stats in stale)
+        self._blocks[start:end - grown] = fresh
+
+    def totals(self) -> dict:
+        """与 calc_text_stats(document.toPlainText()) 相同的结果。"""
+        totals = list(self._totals)
+        totals[0] += len(self._blocks) - 1  # 段落之间的换行
+        return dict(zip(STAT_KEYS, totals))
+
+    def line_count(self) -> int:
+        return len(self._blocks) if self._totals[0] or len(self._blocks) > 1 else 0
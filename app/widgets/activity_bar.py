@@ -5,6 +5,7 @@ from ..icons import get_icon
 class ActivityBar(QWidget):
     selected = pyqtSignal(int)
     settings_clicked = pyqtSignal()
+    stats_clicked = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -18,6 +19,14 @@ class ActivityBar(QWidget):
             btn.setFlat(True)
             btn.clicked.connect(lambda _, i=idx: self.selected.emit(i))
             layout.addWidget(btn)
+        # 字数统计面板
+        btn_stats = QPushButton()
+        btn_stats.setIcon(get_icon("stats", "#d4d4d4"))
+        btn_stats.setFixedSize(40, 40)
+        btn_stats.setFlat(True)
+        btn_stats.setToolTip("字数统计")
+        btn_stats.clicked.connect(self.stats_clicked.emit)
+        layout.addWidget(btn_stats)
         layout.addStretch()
         # 设置按钮
         btn_set = QPushButton()
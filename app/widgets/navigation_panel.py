@@ -1,15 +1,27 @@
+import os
+import json
+import logging
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QTreeView, QLineEdit, QListWidget, QLabel, QStackedWidget,
-    QHBoxLayout, QPushButton, QFileDialog, QSlider, QSpinBox, QFontComboBox, QDoubleSpinBox
+    QHBoxLayout, QPushButton, QFileDialog, QSlider, QSpinBox, QFontComboBox, QDoubleSpinBox, QCheckBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QStandardItemModel, QStandardItem, QFont
+from PyQt6.QtCore import Qt, pyqtSignal, QModelIndex
+from PyQt6.QtGui import QFont
 from ..project_manager import load_project_structure
+from .structure_model import StructureModel
+
+# 目录树展开的卷、当前章节与各章打开次数（用于预取常开的章节）：
+# {"expanded": [卷 id], "active": 章节 id, "opens": {章节 id: 次数}}
+TREE_STATE_FILENAME = 'tree_state.json'
+OPEN_COUNTS_KEPT = 100  # 只保存打开次数最多的这么多章
 
 
 class NavigationPanel(QWidget):
     tree_item_clicked = pyqtSignal(object)
     search_requested = pyqtSignal(str)
+    search_hit_activated = pyqtSignal(object)
+    replace_requested = pyqtSignal(str, str)
     find_submitted = pyqtSignal(str)
     find_prev_requested = pyqtSignal()
     find_next_requested = pyqtSignal()
@@ -24,6 +36,7 @@ class NavigationPanel(QWidget):
 
         # 树视图页
         self.tree_view = QTreeView(); self.tree_view.setHeaderHidden(True)
+        self.tree_view.setUniformRowHeights(True)  # 行高一致：滚动与布局不必逐行测量
         self.tree_view.clicked.connect(lambda idx: self.tree_item_clicked.emit(idx))
         self.tree_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.stack.addWidget(self.tree_view)
@@ -35,16 +48,27 @@ class NavigationPanel(QWidget):
 
         self.project_path = None
         self.project_data = None
-        self.tree_model = QStandardItemModel(); self.tree_view.setModel(self.tree_model)
+        self.active_id = None
+        self.open_counts = {}
+        self.tree_model = StructureModel(self); self.tree_view.setModel(self.tree_model)
         self._load_current_settings()
 
     def _build_search_page(self):
         page = QWidget(); lay = QVBoxLayout(page)
-        lay.addWidget(QLabel('项目搜索 (标题匹配)'))
+        lay.addWidget(QLabel('项目搜索 (标题 + 正文)'))
         self.search_input = QLineEdit(); self.search_input.setPlaceholderText('输入关键词 回车')
-        self.search_results = QListWidget()
+        opts = QHBoxLayout()
+        self.search_regex = QCheckBox('正则'); self.search_case = QCheckBox('区分大小写'); self.search_whole_word = QCheckBox('全词')
+        self.search_whole_word.setToolTip('只对英文单词与数字生效：前后不能紧挨字母、数字或下划线')
+        opts.addWidget(self.search_regex); opts.addWidget(self.search_case); opts.addWidget(self.search_whole_word); opts.addStretch(1)
+        self.search_results = QListWidget(); self.search_status = QLabel('')
         self.search_input.returnPressed.connect(lambda: self.search_requested.emit(self.search_input.text().strip()))
-        lay.addWidget(self.search_input); lay.addWidget(self.search_results); lay.addWidget(QLabel('——'))
+        self.search_results.itemActivated.connect(self.search_hit_activated.emit); self.search_results.itemClicked.connect(self.search_hit_activated.emit)
+        rrow = QHBoxLayout()
+        self.replace_input = QLineEdit(); self.replace_input.setPlaceholderText('替换为（可留空）'); self.replace_btn = QPushButton('全部替换…')
+        rrow.addWidget(self.replace_input, 1); rrow.addWidget(self.replace_btn)
+        self.replace_btn.clicked.connect(lambda: self.replace_requested.emit(self.search_input.text().strip(), self.replace_input.text()))
+        lay.addWidget(self.search_input); lay.addLayout(opts); lay.addLayout(rrow); lay.addWidget(self.search_results); lay.addWidget(self.search_status); lay.addWidget(QLabel('——'))
         lay.addWidget(QLabel('当前章节查找 (Ctrl+F)'))
         row = QHBoxLayout()
         self.find_input = QLineEdit(); self.find_input.setPlaceholderText('输入要查找的内容')
@@ -98,12 +122,75 @@ class NavigationPanel(QWidget):
         s['background_opacity'] = self.inline_bg_opacity.value()
         if save_settings(data): self.setting_selected.emit()
 
-    def load_project(self, project_path):
-        self.project_path = project_path; self.project_data = load_project_structure(project_path)
+    def search_options(self):
+        return {'regex': self.search_regex.isChecked(), 'case_sensitive': self.search_case.isChecked(),
+                'whole_word': self.search_whole_word.isChecked()}
+
+    def find_index(self, item_id):
+        """目录树中卷/章节 id 对应的 QModelIndex（找不到时返回无效索引）。"""
+        return self.tree_model.find_index(item_id)
+
+    def load_project(self, project_path, project_data=None):
+        self.project_path = project_path
+        self.project_data = project_data if project_data is not None else load_project_structure(project_path)
         if not self.project_data: return
-        self.tree_model.clear(); root = self.tree_model.invisibleRootItem()
-        for vol in self.project_data.get('structure', []):
-            vi = QStandardItem(vol.get('title','卷')); vi.setEditable(False); vi.setData('volume', Qt.ItemDataRole.UserRole); vi.setData(vol.get('id'), Qt.ItemDataRole.UserRole + 1); root.appendRow(vi)
-            for ch in vol.get('children', []):
-                ci = QStandardItem(ch.get('title','章节')); ci.setEditable(False); ci.setData('chapter', Qt.ItemDataRole.UserRole); ci.setData(ch.get('id'), Qt.ItemDataRole.UserRole + 1); ci.setData(ch.get('filename'), Qt.ItemDataRole.UserRole + 2); vi.appendRow(ci)
-        self.tree_view.expandAll()
+        # 卷默认折叠（章节行在展开时才取出），只展开上次展开过的卷与当前章节所在的卷
+        self.tree_model.set_structure(self.project_data.get('structure', []))
+        state = self._load_tree_state()
+        opens = state.get('opens')
+        self.open_counts = {k: v for k, v in opens.items() if isinstance(v, int)} if isinstance(opens, dict) else {}
+        for volume_id in state.get('expanded', []):
+            index = self.tree_model.find_index(volume_id)
+            if index.isValid(): self.tree_view.expand(index)
+        # 没有记录时定位到最后一章（不经 get_last_chapter，免得打开项目就建立整个结构索引）
+        last_chapter = next((vol['children'][-1] for vol in reversed(self.project_data.get('structure', [])) if vol.get('children')), None)
+        self.reveal(state.get('active') or (last_chapter or {}).get('id'))
+
+    def apply_structure_ops(self, ops):
+        """结构修改后只更新涉及的行（StructureStore.changed），保留展开与滚动状态。"""
+        self.tree_model.apply_ops(ops)
+
+    def reveal(self, item_id):
+        """展开章节所在的卷并选中、滚动到该章节。"""
+        index = self.tree_model.find_index(item_id) if item_id else QModelIndex()
+        if not index.isValid(): return
+        self.active_id = item_id
+        if index.parent().isValid(): self.tree_view.expand(index.parent())
+        self.tree_view.setCurrentIndex(index); self.tree_view.scrollTo(index)
+
+    def record_open(self, chapter_id):
+        self.open_counts[chapter_id] = self.open_counts.get(chapter_id, 0) + 1
+
+    def frequent_chapters(self, count: int) -> list:
+        """打开次数最多（至少两次）且仍存在的章节 dict。"""
+        chapters = []
+        for chapter_id in sorted(self.open_counts, key=self.open_counts.get, reverse=True):
+            if len(chapters) >= count or self.open_counts[chapter_id] < 2: break
+            chapter = self.tree_model.chapter(chapter_id)
+            if chapter is not None: chapters.append(chapter)
+        return chapters
+
+    def adjacent_chapters(self, chapter_id, before: int, after: int) -> list:
+        """目录顺序中前后相邻的章节 dict（见 StructureModel.adjacent_chapters）。"""
+        return self.tree_model.adjacent_chapters(chapter_id, before, after)
+
+    def _load_tree_state(self) -> dict:
+        try:
+            with open(os.path.join(self.project_path, TREE_STATE_FILENAME), 'r', encoding='utf-8') as f: state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError): return {}
+
+    def save_tree_state(self):
+        """记下展开的卷、当前章节与打开次数，下次打开项目时恢复。"""
+        if not self.project_path or not self.project_data: return
+        model = self.tree_model
+        expanded = [model.index(row, 0).data(Qt.ItemDataRole.UserRole + 1) for row in range(model.rowCount())
+                    if self.tree_view.isExpanded(model.index(row, 0))]
+        opens = sorted((k for k in self.open_counts if model.volume_of(k)), key=self.open_counts.get, reverse=True)[:OPEN_COUNTS_KEPT]
+        state = {'expanded': expanded, 'active': self.active_id if model.volume_of(self.active_id) else None,
+                 'opens': {k: self.open_counts[k] for k in opens}}
+        path = os.path.join(self.project_path, TREE_STATE_FILENAME)
+        try:
+            with open(path + '.tmp', 'w', encoding='utf-8') as f: json.dump(state, f, ensure_ascii=False)
+            os.replace(path + '.tmp', path)
+        except OSError: logging.exception('save tree state failed')
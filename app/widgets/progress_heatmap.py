@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+from PyQt6.QtWidgets import QWidget, QToolTip
+from PyQt6.QtCore import QRect, QSize
+from PyQt6.QtGui import QPainter, QColor
+
+WEEKS = 53
+CELL = 12
+GAP = 2
+
+
+class ProgressHeatmap(QWidget):
+    """近一年每日新增字数热力图：每列一周（周一在上），颜色深浅按当天新增字数相对每日目标（没有目标时相对最大值）。"""
+    def __init__(self, daily: dict, goal: int = 0, today: date | None = None, parent=None):
+        super().__init__(parent)
+        self.daily = daily; self.goal = goal
+        self.today = today or date.today()
+        self.first = self.today - timedelta(days=self.today.weekday() + 7 * (WEEKS - 1))
+        self.scale = goal or max([added for _, added in daily.values()] + [1])
+        self.setMouseTracking(True)
+        self.setFixedSize(self.sizeHint())
+
+    def sizeHint(self):
+        return QSize(WEEKS * (CELL + GAP) + GAP, 7 * (CELL + GAP) + GAP)
+
+    def _day_at(self, column, row):
+        return self.first + timedelta(days=column * 7 + row)
+
+    def _color(self, added: int):
+        if added <= 0: return QColor(60, 60, 60)
+        level = min(1.0, added / self.scale)
+        return QColor(14 + int(40 * level), 68 + int(150 * level), 41 + int(40 * level))
+
+    def paintEvent(self, event):
+        p = QPainter(self)
+        for column in range(WEEKS):
+            for row in range(7):
+                day = self._day_at(column, row)
+                if day > self.today: continue
+                added = self.daily.get(day.isoformat(), (0, 0))[1]
+                color = self._color(added)
+                if self.goal and added >= self.goal: color = QColor(255, 200, 60)  # 达成目标
+                p.fillRect(QRect(GAP + column * (CELL + GAP), GAP + row * (CELL + GAP), CELL, CELL), color)
+
+    def mouseMoveEvent(self, event):
+        column = int(event.position().x() - GAP) // (CELL + GAP); row = int(event.position().y() - GAP) // (CELL + GAP)
+        if 0 <= column < WEEKS and 0 <= row < 7 and self._day_at(column, row) <= self.today:
+            day = self._day_at(column, row); net, added = self.daily.get(day.isoformat(), (0, 0))
+            QToolTip.showText(event.globalPosition().toPoint(), f"{day.isoformat()}：新增 {added} 字（净增 {net}）", self)
+        else: QToolTip.hideText()
+        super().mouseMoveEvent(event)
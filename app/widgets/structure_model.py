@@ -0,0 +1,253 @@
+"""目录树模型：直接以内存中的项目结构为数据源，随结构操作逐行更新。
+
+StructureStore.changed 在结构修改之后才发出，因此模型保留一份行镜像（卷列表与各卷的章节列表，
+元素即结构中的 dict 本身），按操作重放到镜像上并发出对应的 insert/remove/dataChanged 信号：
+重命名只刷新一行，新建/删除只插入/移除一行，视图的展开与滚动状态不受影响。
+
+章节行按卷懒加载（canFetchMore/fetchMore，每次 TREE_FETCH_BATCH 行）：打开项目时只建立卷行，
+未展开的卷不产生任何章节行；尚未取出的行发生的修改只改镜像，不发信号。
+"""
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+from ..config import TREE_FETCH_BATCH
+
+KIND_ROLE = Qt.ItemDataRole.UserRole          # 'volume' / 'chapter'
+ID_ROLE = Qt.ItemDataRole.UserRole + 1
+FILENAME_ROLE = Qt.ItemDataRole.UserRole + 2
+
+
+class _VolumeRow:
+    __slots__ = ('data', 'chapters', 'row', 'fetched')
+
+    def __init__(self, data: dict, chapters: list, row: int):
+        self.data = data; self.chapters = chapters; self.row = row
+        self.fetched = 0  # 已交给视图的章节行数（chapters 的前缀）
+
+
+class StructureModel(QAbstractItemModel):
+    """卷为顶层行，章节为卷的子行。卷行的 internalPointer 为空，章节行指向所属卷的 _VolumeRow。"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._structure = []
+        self._volumes = []       # [_VolumeRow]
+        self._volume_rows = {}   # 卷 id -> _VolumeRow
+        self._chapter_volume = {}  # 章节 id -> _VolumeRow
+
+    # ---------- 数据源 ----------
+    def set_structure(self, structure: list):
+        """整体重建（打开项目时）。structure 为 project_data['structure'] 本身，之后由 apply_ops 跟进。"""
+        self.beginResetModel()
+        self._structure = structure
+        self._volumes = []; self._volume_rows = {}; self._chapter_volume = {}
+        for vol in structure:
+            vr = _VolumeRow(vol, list(vol.get('children', [])), len(self._volumes))
+            self._volumes.append(vr); self._volume_rows[vol.get('id')] = vr
+            for ch in vr.chapters: self._chapter_volume[ch.get('id')] = vr
+        self.endResetModel()
+
+    def apply_ops(self, ops):
+        """重放一次提交的结构操作（StructureStore.changed）。同一卷连续新建的章节合并为一次插入。"""
+        try:
+            i = 0
+            while i < len(ops):
+                op = ops[i]; kind = op.get('op')
+                if kind == 'add_chapter':
+                    j = i + 1
+                    while j < len(ops) and ops[j].get('op') == 'add_chapter' and ops[j].get('volume_id') == op.get('volume_id'): j += 1
+                    self._add_chapters(op.get('volume_id'), [o['chapter'] for o in ops[i:j]]); i = j; continue
+                handler = getattr(self, '_op_' + str(kind), None)
+                if handler is not None: handler(op)
+                i += 1
+        except (KeyError, ValueError):
+            self.set_structure(self._structure); return
+        if len(self._volumes) != len(self._structure): self.set_structure(self._structure)  # 镜像与结构不一致时兜底
+
+    def _op_add_volume(self, op):
+        vol = op['volume']
+        if vol.get('id') in self._volume_rows: return
+        row = len(self._volumes)
+        self.beginInsertRows(QModelIndex(), row, row)
+        vr = _VolumeRow(vol, [], row); self._volumes.append(vr); self._volume_rows[vol.get('id')] = vr
+        self.endInsertRows()
+
+    def _add_chapters(self, volume_id, chapters):
+        vr = self._volume_rows[volume_id]
+        chapters = [ch for ch in chapters if ch.get('id') not in self._chapter_volume]
+        if chapters: self._append_chapters(vr, chapters)
+
+    def _append_chapters(self, vr, chapters):
+        for ch in chapters: self._chapter_volume[ch.get('id')] = vr
+        if vr.fetched < len(vr.chapters):  # 卷末尚未取出，新行随后续 fetchMore 出现
+            vr.chapters.extend(chapters); return
+        first = len(vr.chapters)
+        self.beginInsertRows(self.createIndex(vr.row, 0), first, first + len(chapters) - 1)
+        vr.chapters.extend(chapters); vr.fetched = len(vr.chapters)
+        self.endInsertRows()
+
+    def _op_rename(self, op):
+        item_id = op['id']
+        if item_id in self._volume_rows: index = self.createIndex(self._volume_rows[item_id].row, 0)
+        elif item_id in self._chapter_volume:
+            vr = self._chapter_volume[item_id]; row = self._chapter_row(vr, item_id)
+            if row >= vr.fetched: return  # 尚未取出的行取出时自然是新标题
+            index = self.createIndex(row, 0, vr)
+        else: return
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+
+    def _op_delete(self, op):
+        item_id = op['id']
+        if item_id in self._volume_rows: self._remove_volume(self._volume_rows[item_id])
+        elif item_id in self._chapter_volume: self._remove_chapter(item_id)
+
+    def _op_move(self, op):
+        item_id = op['id']; target = self._volume_rows[op['volume_id']]
+        chapter = self._remove_chapter(item_id)
+        position = op.get('position')
+        row = len(target.chapters) if position is None or position >= len(target.chapters) else max(0, position)
+        self._chapter_volume[item_id] = target
+        if row > target.fetched or (row == target.fetched and row < len(target.chapters)):
+            target.chapters.insert(row, chapter); return
+        self.beginInsertRows(self.createIndex(target.row, 0), row, row)
+        target.chapters.insert(row, chapter); target.fetched += 1
+        self.endInsertRows()
+
+    def _op_merge_volume(self, op):
+        source = self._volume_rows[op['id']]
+        first = next((vr for vr in self._volumes if vr is not source), None)
+        if first is not None and source.chapters:
+            # 章节接到第一个剩余卷末尾，再移除空卷
+            if source.fetched:
+                self.beginRemoveRows(self.createIndex(source.row, 0), 0, source.fetched - 1)
+                moved = source.chapters; source.chapters = []; source.fetched = 0
+                self.endRemoveRows()
+            else: moved = source.chapters; source.chapters = []
+            self._append_chapters(first, moved)
+        self._remove_volume(source)
+
+    def _remove_volume(self, vr):
+        self.beginRemoveRows(QModelIndex(), vr.row, vr.row)
+        del self._volumes[vr.row]; del self._volume_rows[vr.data.get('id')]
+        for ch in vr.chapters: self._chapter_volume.pop(ch.get('id'), None)
+        for row in range(vr.row, len(self._volumes)): self._volumes[row].row = row
+        self.endRemoveRows()
+
+    def _remove_chapter(self, chapter_id):
+        vr = self._chapter_volume[chapter_id]; row = self._chapter_row(vr, chapter_id)
+        del self._chapter_volume[chapter_id]
+        if row >= vr.fetched: return vr.chapters.pop(row)
+        self.beginRemoveRows(self.createIndex(vr.row, 0), row, row)
+        chapter = vr.chapters.pop(row); vr.fetched -= 1
+        self.endRemoveRows()
+        return chapter
+
+    @staticmethod
+    def _chapter_row(vr, chapter_id) -> int:
+        # 新建/删除/重命名多发生在卷末，从尾部找起
+        for row in range(len(vr.chapters) - 1, -1, -1):
+            if vr.chapters[row].get('id') == chapter_id: return row
+        raise ValueError(chapter_id)
+
+    def find_index(self, item_id) -> QModelIndex:
+        """卷/章节 id 对应的索引（找不到时返回无效索引）；章节行尚未取出时先取到该行。"""
+        vr = self._volume_rows.get(item_id)
+        if vr is not None: return self.createIndex(vr.row, 0)
+        vr = self._chapter_volume.get(item_id)
+        if vr is None: return QModelIndex()
+        try: row = self._chapter_row(vr, item_id)
+        except ValueError: return QModelIndex()
+        self._fetch_to(vr, row + 1)
+        return self.createIndex(row, 0, vr)
+
+    def chapter(self, chapter_id) -> dict | None:
+        vr = self._chapter_volume.get(chapter_id)
+        if vr is None: return None
+        try: return vr.chapters[self._chapter_row(vr, chapter_id)]
+        except ValueError: return None
+
+    def adjacent_chapters(self, chapter_id, before: int, after: int) -> list:
+        """目录顺序（跨卷）中某章之后 after 章与之前 before 章的 dict：先后、后前，近者在前。"""
+        vr = self._chapter_volume.get(chapter_id)
+        if vr is None: return []
+        try: row = self._chapter_row(vr, chapter_id)
+        except ValueError: return []
+        following = []; v = vr.row; start = row + 1
+        while len(following) < after and v < len(self._volumes):
+            following.extend(self._volumes[v].chapters[start:start + after - len(following)]); v += 1; start = 0
+        preceding = []; v = vr.row; end = row
+        while len(preceding) < before and v >= 0:
+            chapters = self._volumes[v].chapters[:end]
+            preceding.extend(reversed(chapters[max(0, len(chapters) - (before - len(preceding))):]))
+            v -= 1; end = None
+        return following + preceding
+
+    def volume_of(self, item_id):
+        """章节所在卷的 id（卷 id 返回自身）。"""
+        if item_id in self._volume_rows: return item_id
+        vr = self._chapter_volume.get(item_id)
+        return vr.data.get('id') if vr is not None else None
+
+    # ---------- 懒加载 ----------
+    def _fetch_to(self, vr, count):
+        count = min(count, len(vr.chapters))
+        if count <= vr.fetched: return
+        self.beginInsertRows(self.createIndex(vr.row, 0), vr.fetched, count - 1)
+        vr.fetched = count
+        self.endInsertRows()
+
+    def canFetchMore(self, parent):
+        if not parent.isValid() or parent.internalPointer() is not None: return False
+        vr = self._volumes[parent.row()]
+        return vr.fetched < len(vr.chapters)
+
+    def fetchMore(self, parent):
+        if not parent.isValid() or parent.internalPointer() is not None: return
+        vr = self._volumes[parent.row()]
+        self._fetch_to(vr, vr.fetched + TREE_FETCH_BATCH)
+
+    # ---------- QAbstractItemModel ----------
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0 or row < 0: return QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, 0) if row < len(self._volumes) else QModelIndex()
+        if parent.internalPointer() is not None: return QModelIndex()  # 章节没有子行
+        vr = self._volumes[parent.row()]
+        return self.createIndex(row, 0, vr) if row < vr.fetched else QModelIndex()
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid(): return QModelIndex()
+        vr = index.internalPointer()
+        return QModelIndex() if vr is None else self.createIndex(vr.row, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid(): return len(self._volumes)
+        if parent.internalPointer() is not None: return 0
+        return self._volumes[parent.row()].fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        # 未取出章节的卷也要显示展开箭头
+        if not parent.isValid(): return bool(self._volumes)
+        return parent.internalPointer() is None and bool(self._volumes[parent.row()].chapters)
+
+    def flags(self, index):
+        if not index.isValid(): return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def node(self, index) -> dict | None:
+        """索引对应的卷/章节 dict。"""
+        if not index.isValid(): return None
+        vr = index.internalPointer()
+        if vr is None: return self._volumes[index.row()].data
+        return vr.chapters[index.row()]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        node = self.node(index)
+        if node is None: return None
+        volume = index.internalPointer() is None
+        if role == Qt.ItemDataRole.DisplayRole: return node.get('title', '卷' if volume else '章节')
+        if role == KIND_ROLE: return 'volume' if volume else 'chapter'
+        if role == ID_ROLE: return node.get('id')
+        if role == FILENAME_ROLE: return None if volume else node.get('filename')
+        return None
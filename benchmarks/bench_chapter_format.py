@@ -0,0 +1,58 @@
+"""章节存储格式基准：QTextEdit HTML vs 原生格式（体积、加载、序列化）。
+
+用法（在仓库根目录）：python benchmarks/bench_chapter_format.py [--chars 80000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt6.QtGui import QGuiApplication, QTextDocument, QTextCursor, QTextCharFormat, QTextBlockFormat, QFont  # noqa: E402
+from app.chapter_format import document_to_native, native_to_document  # noqa: E402
+
+
+def synthetic_document(chars: int, seed: int = 0) -> QTextDocument:
+    rnd = random.Random(seed)
+    words = ['他说', '今天', '的', '天气', '很好', '，', '。', 'Hello', '123']
+    doc = QTextDocument(); cursor = QTextCursor(doc)
+    bfmt = QTextBlockFormat(); bfmt.setLineHeight(150, QTextBlockFormat.LineHeightTypes.ProportionalHeight.value)
+    plain = QTextCharFormat(); plain.setFontPointSize(16)
+    bold = QTextCharFormat(plain); bold.setFontWeight(QFont.Weight.Bold)
+    total = 0
+    while total < chars:
+        cursor.insertBlock(bfmt)
+        text = '　　' + ''.join(rnd.choice(words) for _ in range(rnd.randint(20, 80)))
+        cursor.insertText(text, plain); total += len(text)
+        if rnd.random() < 0.2: cursor.insertText('重点', bold)
+    return doc
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--chars', type=int, default=80000)
+    ap.add_argument('--repeat', type=int, default=5)
+    args = ap.parse_args()
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)  # noqa: F841
+    doc = synthetic_document(args.chars)
+    html = doc.toHtml(); native = document_to_native(doc)
+    print(f"正文 {len(doc.toPlainText())} 字符")
+    print(f"体积:   HTML {len(html.encode('utf-8')) / 1024:8.1f} KB   原生 {len(native.encode('utf-8')) / 1024:8.1f} KB")
+    t_html = best_of(lambda: QTextDocument().setHtml(html), args.repeat)
+    t_native = best_of(lambda: native_to_document(native, QTextDocument()), args.repeat)
+    print(f"加载:   setHtml {t_html:8.2f} ms   原生 {t_native:8.2f} ms  ({t_html / t_native:.1f}x)")
+    t_html = best_of(doc.toHtml, args.repeat)
+    t_native = best_of(lambda: document_to_native(doc), args.repeat)
+    print(f"序列化: toHtml  {t_html:8.2f} ms   原生 {t_native:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
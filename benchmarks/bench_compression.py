@@ -0,0 +1,61 @@
+"""章节压缩基准：各编码/级别的体积与单章保存/加载延迟（含文件读写）。
+
+用法（在仓库根目录）：python benchmarks/bench_compression.py [--chapters 200] [--chars 6000]
+输入为合成的原生格式章节（格式表头 + 中文正文），在临时目录中读写。
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.chapter_storage import read_text, write_text, train_dictionary, DICT_FILENAME  # noqa: E402
+
+CONFIGS = [('none', None), ('zlib', 1), ('zlib', 6), ('zlib', 9), ('lzma', 0), ('lzma', 6), ('zlib-dict', 6), ('zlib-dict', 9)]
+
+
+def synthetic_chapters(count: int, chars: int, seed: int = 0):
+    rnd = random.Random(seed)
+    vocab = [''.join(rnd.choice('的一是了我不人在他有这个上们来到时大地为子中你说生国年着就那和要她出也得里后自以会') for _ in range(rnd.randint(1, 4))) for _ in range(3000)]
+    header = json.dumps({'cf': [{}, {'8167': ['Microsoft YaHei'], '8193': 16.0}], 'bf': [{'4168': 150.0, '4169': 1}],
+                         'blocks': [[60, 0, 1]], 'runs': [[chars, 1]]}, separators=(',', ':'))
+    out = []
+    for _ in range(count):
+        paras = []; total = 0
+        while total < chars:
+            para = '　　' + ''.join(rnd.choice(vocab) for _ in range(rnd.randint(20, 60))) + '。'
+            paras.append(para); total += len(para)
+        out.append(f"WRT1\n{header}\n" + '\n'.join(paras))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--chapters', type=int, default=200)
+    ap.add_argument('--chars', type=int, default=6000)
+    args = ap.parse_args()
+    chapters = synthetic_chapters(args.chapters, args.chars)
+    raw_total = sum(len(c.encode('utf-8')) for c in chapters)
+    print(f"{args.chapters} 章 × ~{args.chars} 字，原始 {raw_total / 1024:.0f} KB")
+    print(f"{'编码':<12}{'级别':>4}{'体积 KB':>10}{'比例':>8}{'保存 ms/章':>12}{'加载 ms/章':>12}")
+    with tempfile.TemporaryDirectory() as project:
+        with open(os.path.join(project, DICT_FILENAME), 'wb') as f:
+            f.write(train_dictionary([c.encode('utf-8') for c in chapters]))
+        for codec, level in CONFIGS:
+            options = {'compression': codec, 'level': level}
+            paths = [os.path.join(project, f'{i:05d}.txt') for i in range(len(chapters))]
+            t0 = time.perf_counter()
+            for path, text in zip(paths, chapters): write_text(path, text, options, project)
+            t_save = (time.perf_counter() - t0) * 1000 / len(chapters)
+            size = sum(os.path.getsize(p) for p in paths)
+            t0 = time.perf_counter()
+            for path in paths: read_text(path, project)
+            t_load = (time.perf_counter() - t0) * 1000 / len(chapters)
+            print(f"{codec:<12}{'-' if level is None else level:>4}{size / 1024:>10.0f}{size / raw_total:>8.1%}{t_save:>12.3f}{t_load:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""plain_backup 转换基准：单遍流式转换 vs 旧的六次 re.sub 链。
+
+用法（在仓库根目录）：python benchmarks/bench_html_plain.py [--size-mb 1] [--repeat 5]
+输入为合成的 Qt toHtml() 风格章节（每段带内联样式，部分文字带 <span> 格式）。
+"""
+import argparse
+import html as _html
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.html_plain import html_to_plain  # noqa: E402
+
+QT_HEAD = ('<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">\n'
+           '<html><head><meta name="qrichtext" content="1" /><meta charset="utf-8" /><style type="text/css">\n'
+           'p, li { white-space: pre-wrap; }\nhr { height: 1px; border-width: 0; }\n</style></head>'
+           '<body style=" font-family:\'Microsoft YaHei\'; font-size:16pt; font-weight:400; font-style:normal;">\n')
+P_STYLE = ' style=" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px; line-height:150%;"'
+EMPTY_P = ('<p style="-qt-paragraph-type:empty; margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; '
+           '-qt-block-indent:0; text-indent:0px; line-height:150%;"><br /></p>')
+
+
+def synthetic_chapter(size_bytes: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    words = ['他说', '今天', '的', '天气', '很好', '&quot;', '&amp;', 'Hello', '123', '，', '。', '　　']
+    parts = [QT_HEAD]; total = len(QT_HEAD)
+    while total < size_bytes:
+        text = ''.join(rnd.choice(words) for _ in range(rnd.randint(20, 120)))
+        if rnd.random() < 0.2:
+            text += '<span style=" font-weight:700;">' + ''.join(rnd.choice(words) for _ in range(5)) + '</span>'
+        p = EMPTY_P if rnd.random() < 0.1 else f'<p{P_STYLE}>{text}</p>'
+        parts.append(p + '\n'); total += len(p.encode('utf-8')) + 1
+    parts.append('</body></html>')
+    return ''.join(parts)
+
+
+def regex_chain(content: str) -> str:
+    """旧实现（save_chapter_content 中的六次替换）。"""
+    plain = re.sub(r'(?i)<br\s*/?>', '\n', content)
+    plain = re.sub(r'(?i)</p>', '\n', plain)
+    plain = re.sub(r'(?is)<style.*?</style>', '', plain)
+    plain = re.sub(r'(?is)<script.*?</script>', '', plain)
+    plain = re.sub(r'<[^>]+>', '', plain)
+    plain = _html.unescape(plain)
+    plain = re.sub(r'\n{3,}', '\n\n', plain)
+    return plain.strip() + '\n'
+
+
+def bench(fn, arg, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(arg); best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--size-mb', type=float, default=1.0)
+    ap.add_argument('--repeat', type=int, default=5)
+    args = ap.parse_args()
+    html = synthetic_chapter(int(args.size_mb * 1024 * 1024))
+    print(f"输入: {len(html.encode('utf-8')) / 1024:.0f} KB HTML, 纯文本 {len(html_to_plain(html))} 字符")
+    t_old = bench(regex_chain, html, args.repeat)
+    t_new = bench(html_to_plain, html, args.repeat)
+    print(f"re.sub 链:     {t_old * 1000:8.2f} ms")
+    print(f"单遍流式转换:  {t_new * 1000:8.2f} ms  ({t_old / t_new:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
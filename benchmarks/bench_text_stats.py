@@ -0,0 +1,75 @@
+"""字数统计基准：整串分类内核（NumPy 查表 / Counter）vs 原来的逐字循环。
+
+用法（在仓库根目录）：python benchmarks/bench_text_stats.py [--sizes-mb 1 5 10] [--repeat 3]
+输入为合成的中文小说正文（汉字为主，夹杂标点、英文、数字与全角空格缩进）。
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import text_stats  # noqa: E402
+
+
+def legacy_stats(text: str) -> dict:
+    """原 MainWindow._calc_text_stats 的实现（对照用）。"""
+    t = text.replace('\r', '')
+    total_with_space = len(t)
+    no_space = len([c for c in t if not c.isspace()])
+    chinese = english = digits = symbols = 0
+    for c in t:
+        if c.isspace(): continue
+        code = ord(c)
+        if 0x4E00 <= code <= 0x9FFF: chinese += 1
+        elif c.isalpha() and c.isascii(): english += 1
+        elif c.isdigit(): digits += 1
+        else: symbols += 1
+    return {'chars_with_space': total_with_space, 'chars_no_space': no_space, 'chinese': chinese,
+            'english': english, 'digits': digits, 'symbols': symbols}
+
+
+def synthetic_text(size_mb: float, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    hanzi = [chr(rnd.randint(0x4E00, 0x9FA5)) for _ in range(3000)]
+    extras = ['，', '。', '“', '”', '！', 'Hello', 'world', '2024', '３', ' ', '㐀', '…']
+    paragraphs = []; total = 0; target = int(size_mb * 1024 * 1024)
+    while total < target:
+        words = [rnd.choice(hanzi) if rnd.random() < 0.85 else rnd.choice(extras) for _ in range(rnd.randint(40, 200))]
+        p = '　　' + ''.join(words); paragraphs.append(p); total += len(p.encode('utf-8')) + 1
+    return '\n'.join(paragraphs)
+
+
+def timed(func, text, repeat):
+    best = float('inf'); result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter(); result = func(text); best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--sizes-mb', type=float, nargs='+', default=[1, 5, 10])
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+    has_numpy = text_stats.np is not None
+    print(f"NumPy: {'可用 ' + text_stats.np.__version__ if has_numpy else '不可用'}")
+    if has_numpy: text_stats.calc_text_stats('x' * text_stats.NUMPY_MIN_CHARS)  # 预先建立查找表
+    for size in args.sizes_mb:
+        text = synthetic_text(size)
+        legacy_t, expected = timed(legacy_stats, text, args.repeat)
+        print(f"{size:g} MB（{len(text)} 字符）  逐字循环: {legacy_t * 1000:8.1f} ms")
+        if has_numpy:
+            t, result = timed(text_stats.calc_text_stats, text, args.repeat)
+            assert result == expected, (result, expected)
+            print(f"{'':>24}NumPy 查表: {t * 1000:8.1f} ms  ({legacy_t / t:.1f}x)")
+        saved = text_stats.np; text_stats.np = None
+        try: t, result = timed(text_stats.calc_text_stats, text, args.repeat)
+        finally: text_stats.np = saved
+        assert result == expected, (result, expected)
+        print(f"{'':>24}正则+Counter: {t * 1000:8.1f} ms  ({legacy_t / t:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
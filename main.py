@@ -7,6 +7,7 @@ from app.settings_manager import load_settings
 from app.themes import THEMES
 from PyQt6.QtGui import QIcon
 import os
+import multiprocessing
 
 def main():
     """程序主入口"""
@@ -35,4 +36,6 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # 导入文稿使用进程池；打包后的可执行文件需要 freeze_support
+    multiprocessing.freeze_support()
     main()
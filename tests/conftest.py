@@ -0,0 +1,26 @@
+"""测试公共夹具：无界面运行 Qt，项目建在临时目录中。
+
+用法（在仓库根目录）：python -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def project(tmp_path):
+    """空项目目录（project.json + chapters/）。"""
+    from app.project_manager import save_project_structure
+    path = str(tmp_path / 'proj'); os.makedirs(os.path.join(path, 'chapters'))
+    save_project_structure(path, {'project_name': 'test', 'structure': []})
+    return path
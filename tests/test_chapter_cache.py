@@ -0,0 +1,45 @@
+import os
+
+from PyQt6.QtGui import QTextDocument
+
+from app.chapter_cache import ChapterCache, file_stamp
+from app.tab_memory import estimate_document_bytes
+
+
+def _chapter(project, filename, text):
+    with open(os.path.join(project, 'chapters', filename), 'w', encoding='utf-8') as f: f.write(text)
+    document = QTextDocument(); document.setPlainText(text)
+    return file_stamp(project, filename), document
+
+
+def test_hit_miss_and_external_change(qapp, project):
+    cache = ChapterCache(project, 1 << 20)
+    stamp, document = _chapter(project, 'a.txt', '甲乙丙')
+    assert cache.put('a.txt', stamp, 'font', document, [(3,)])
+    assert cache.get('a.txt', 'font') == (document, [(3,)]) and ('a.txt', 'font') in cache
+    assert cache.get('a.txt', 'other font') is None  # 字体不同视为未命中，条目释放
+    cache.put('a.txt', stamp, 'font', document, [])
+    with open(os.path.join(project, 'chapters', 'a.txt'), 'a', encoding='utf-8') as f: f.write('丁')
+    assert ('a.txt', 'font') not in cache and cache.get('a.txt', 'font') is None
+    assert (cache.hits, cache.misses, cache.size) == (1, 2, 0)
+
+
+def test_notify_marks_entries_stale(qapp, project):
+    cache = ChapterCache(project, 1 << 20)
+    stamp, document = _chapter(project, 'a.txt', '甲'); cache.put('a.txt', stamp, 'font', document, [])
+    cache.notify('saved', os.path.join(project, 'other'), ['a.txt'])  # 别的项目的事件
+    assert ('a.txt', 'font') in cache
+    cache.notify('saved', project, ['a.txt'])
+    assert ('a.txt', 'font') not in cache and cache.get('a.txt', 'font') is None
+
+
+def test_least_recently_used_entries_are_evicted(qapp, project):
+    entries = {name: _chapter(project, name, name * 100) for name in ('a', 'b', 'c')}
+    size = estimate_document_bytes(entries['a'][1])
+    cache = ChapterCache(project, size * 2)
+    for name in ('a', 'b'): cache.put(name, entries[name][0], 'font', entries[name][1], [])
+    cache.get('a', 'font')  # a 最近用过，淘汰 b
+    cache.put('c', entries['c'][0], 'font', entries['c'][1], [])
+    assert [name for name in 'abc' if (name, 'font') in cache] == ['a', 'c'] and cache.size == size * 2
+    big = QTextDocument(); big.setPlainText('字' * 10000)
+    assert not cache.put('big', entries['a'][0], 'font', big, [])  # 超过整个预算的不缓存
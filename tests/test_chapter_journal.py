@@ -0,0 +1,97 @@
+import json
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QTextDocument, QTextCursor, QTextBlockFormat, QTextCharFormat
+
+from app.chapter_format import plain_to_native, load_into_document, document_to_native
+from app.chapter_journal import capture_op, merge_op, apply_ops, reset_journal, append_journal, read_journal
+from app.project_manager import save_chapter_content, load_chapter_content
+
+BASE = plain_to_native('第一段\n第二段文字\n第三段\n')
+
+
+def _recorded(edit):
+    """在 BASE 上执行 edit，返回 (编辑后的原生内容, 记下的日志操作)。"""
+    doc = load_into_document(BASE, QTextDocument()); doc.clearUndoRedoStacks()
+    doc.documentLayout()  # 没有布局的文档不发出 contentsChange
+    ops = []; doc.contentsChange.connect(lambda p, r, a: merge_op(ops, capture_op(doc, p, r, a)))
+    edit(doc)
+    return document_to_native(doc), json.loads(json.dumps(ops, ensure_ascii=False))  # 与落盘一样经过 JSON
+
+
+def _replayed(ops):
+    doc = load_into_document(BASE, QTextDocument()); apply_ops(doc, ops)
+    return document_to_native(doc)
+
+
+def _align(doc, block_number, alignment):
+    fmt = QTextBlockFormat(); fmt.setAlignment(alignment)
+    QTextCursor(doc.findBlockByNumber(block_number)).mergeBlockFormat(fmt)
+
+
+def test_typing_is_recorded_as_plain_text(qapp):
+    def edit(doc):
+        cursor = QTextCursor(doc); cursor.setPosition(3)
+        for ch in '新加的字': cursor.insertText(ch)
+    expected, ops = _recorded(edit)
+    assert ops == [{'p': 3, 'r': 0, 't': '新加的字'}]
+    assert _replayed(ops) == expected
+
+
+def test_block_alignment_survives_replay(qapp):
+    expected, ops = _recorded(lambda doc: _align(doc, 1, Qt.AlignmentFlag.AlignCenter))
+    assert '"4112":132' in expected
+    assert _replayed(ops) == expected
+
+
+def test_alignment_of_trailing_empty_block(qapp):
+    expected, ops = _recorded(lambda doc: _align(doc, 3, Qt.AlignmentFlag.AlignRight))
+    assert _replayed(ops) == expected
+
+
+def test_formatted_insert_split_and_delete(qapp):
+    def edit(doc):
+        cursor = QTextCursor(doc); cursor.setPosition(2)
+        bold = QTextCharFormat(); bold.setFontWeight(700)
+        cursor.insertText('粗体', bold); cursor.insertBlock(); cursor.insertText('新段')
+        _align(doc, 2, Qt.AlignmentFlag.AlignCenter)
+        cursor.setPosition(0); cursor.setPosition(8, QTextCursor.MoveMode.KeepAnchor); cursor.removeSelectedText()
+    expected, ops = _recorded(edit)
+    assert _replayed(ops) == expected
+
+
+def test_pasted_html_keeps_block_formats_exactly(qapp):
+    def edit(doc):
+        cursor = QTextCursor(doc); cursor.setPosition(3)
+        cursor.insertHtml('<p align=center><b>甲</b>乙</p><p style="margin-left:20px">丙</p>')
+    expected, ops = _recorded(edit)
+    assert _replayed(ops) == expected
+
+
+def test_load_chapter_content_replays_journal(qapp, project):
+    save_chapter_content(project, 'c.txt', BASE)
+    expected, ops = _recorded(lambda doc: _align(doc, 1, Qt.AlignmentFlag.AlignCenter))
+    append_journal(project, 'c.txt', ops)
+    assert load_chapter_content(project, 'c.txt') == expected
+
+
+def test_journal_with_stale_base_is_ignored(qapp, project):
+    save_chapter_content(project, 'c.txt', BASE)
+    append_journal(project, 'c.txt', [{'p': 0, 'r': 0, 't': '甲'}])
+    reset_journal(project, 'c.txt', '别的内容')
+    assert read_journal(project, 'c.txt', BASE) == []
+    assert load_chapter_content(project, 'c.txt') == BASE
+
+
+def test_torn_last_line_is_dropped(qapp, project):
+    save_chapter_content(project, 'c.txt', BASE)
+    append_journal(project, 'c.txt', [{'p': 0, 'r': 0, 't': '甲'}])
+    from app.chapter_journal import journal_path
+    with open(journal_path(project, 'c.txt'), 'a', encoding='utf-8') as f: f.write('{"p": 1, "r"')
+    assert read_journal(project, 'c.txt', BASE) == [{'p': 0, 'r': 0, 't': '甲'}]
+
+
+def test_legacy_html_ops_still_replay(qapp):
+    ops = [{'p': 0, 'r': 0, 'h': '<b>甲</b>'}]
+    doc = load_into_document(BASE, QTextDocument()); apply_ops(doc, ops)
+    assert doc.toPlainText().startswith('甲第一段')
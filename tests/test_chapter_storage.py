@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from app.chapter_storage import DICT_FILENAME, compress, decompress, read_text, train_dictionary, write_text
+
+TEXT = '林中有一座小屋，小屋前有一条河。\r\n' * 50
+
+
+@pytest.mark.parametrize('codec', ['none', 'zlib', 'lzma', 'zlib-dict'])
+def test_write_and_read_round_trip(project, codec):
+    if codec == 'zlib-dict':
+        with open(os.path.join(project, DICT_FILENAME), 'wb') as f: f.write(train_dictionary([TEXT.encode('utf-8')] * 3))
+    path = os.path.join(project, 'chapters', 'a.txt')
+    write_text(path, TEXT, {'compression': codec}, project)
+    with open(path, 'rb') as f: size = len(f.read())
+    assert (size < len(TEXT.encode('utf-8'))) == (codec != 'none')
+    assert read_text(path, project) == TEXT.replace('\r\n', '\n')
+
+
+def test_dictionary_mismatch_is_reported(project):
+    zdict = os.path.join(project, DICT_FILENAME)
+    with open(zdict, 'wb') as f: f.write(b'0123456789abcdef' * 4)
+    blob = compress(b'data', {'compression': 'zlib-dict'}, project)
+    os.remove(zdict)
+    with open(zdict, 'wb') as f: f.write(b'fedcba9876543210' * 4)
+    with pytest.raises(ValueError): decompress(blob, project)
+    assert decompress(b'plain', project) == b'plain'
@@ -0,0 +1,19 @@
+import io
+
+from PyQt6.QtGui import QTextCursor, QTextDocument
+
+from app.html_plain import html_to_plain, write_plain
+
+
+def test_matches_qt_plain_text(qapp):
+    document = QTextDocument(); cursor = QTextCursor(document)
+    cursor.insertText('第一段 <标签> & "引号"'); cursor.insertBlock(); cursor.insertBlock()
+    cursor.insertText('空行之后'); cursor.insertBlock(); cursor.insertText('  前后空格  ')
+    html = document.toHtml()
+    assert html_to_plain(html) == document.toPlainText()
+    stream = io.StringIO(); write_plain(html, stream)
+    assert stream.getvalue() == document.toPlainText() + '\n'
+
+
+def test_non_qt_html_is_stripped():
+    assert html_to_plain('甲<br>乙<i>丙</i>&hellip;') == '甲\n乙丙…'
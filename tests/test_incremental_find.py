@@ -0,0 +1,37 @@
+import random
+
+from PyQt6.QtGui import QTextCursor
+
+from app.custom_widgets import AdvancedTextEdit
+
+
+def _scan(text, pattern):
+    starts = []; i = text.find(pattern)
+    while i != -1: starts.append(i); i = text.find(pattern, i + len(pattern))
+    return starts
+
+
+def test_find_matches_follow_random_edits(qapp):
+    rng = random.Random(3)
+    for pattern in ('小屋', 'aa', '。\n'):
+        editor = AdvancedTextEdit(); editor.setPlainText('林中小屋。\naaa 小屋小屋\n' * 20)
+        text = editor.toPlainText()
+        editor.set_find_matches([(p, len(pattern)) for p in _scan(text, pattern)], 0, pattern)
+        document = editor.document()
+        for _ in range(200):
+            cursor = QTextCursor(document); size = document.characterCount() - 1
+            start = rng.randint(0, size); cursor.setPosition(start)
+            cursor.setPosition(min(size, start + rng.choice([0, 0, 1, 2, 5])), QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(rng.choice(['小', '屋', 'a', '。', '\n', '小屋', '', 'x']))
+            expected = _scan(editor.toPlainText(), pattern)
+            assert editor.find_matches() == [(p, len(pattern)) for p in expected]
+            assert editor._find_current < len(expected)
+
+
+def test_current_match_follows_its_position(qapp):
+    editor = AdvancedTextEdit(); editor.setPlainText('甲小屋乙小屋丙小屋')
+    editor.set_find_matches([(1, 2), (4, 2), (7, 2)], 1, '小屋'); totals = []
+    editor.findMatchesChanged.connect(lambda current, total: totals.append((current, total)))
+    cursor = QTextCursor(editor.document()); cursor.insertText('前言')  # 当前命中整体后移
+    cursor.setPosition(2); cursor.setPosition(5, QTextCursor.MoveMode.KeepAnchor); cursor.removeSelectedText()  # 删掉第一个命中
+    assert editor.find_matches() == [(3, 2), (6, 2)] and totals[-1] == (0, 2)
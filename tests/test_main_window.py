@@ -0,0 +1,45 @@
+import time
+
+import pytest
+from PyQt6.QtGui import QTextCursor
+
+from app.project_manager import load_project_structure, add_new_volume, add_new_chapter, save_project_structure, load_chapter_content
+
+
+def _settle(qapp, window, seconds=0.2):
+    deadline = time.time() + 10
+    while any(info.get('loading') for info in window.open_tabs.values()) and time.time() < deadline: qapp.processEvents()
+    deadline = time.time() + seconds
+    while time.time() < deadline: qapp.processEvents(); time.sleep(0.005)
+
+
+@pytest.fixture
+def window(qapp, project, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # main_window 在当前目录写 debug.log
+    from app import main_window
+    data = load_project_structure(project); add_new_volume(data, '甲')
+    for topic in ('一', '二'): add_new_chapter(project, data, data['structure'][0]['id'], topic)
+    save_project_structure(project, data)
+    window = main_window.MainWindow(project); window.show(); _settle(qapp, window)
+    yield window
+    window.close()
+
+
+def test_hibernated_tab_wakes_with_edits_and_cursor(qapp, window, project):
+    first, second = window.project_data['structure'][0]['children']
+    window.open_chapter_in_tab(window.nav_panel.find_index(first['id'])); _settle(qapp, window)
+    editor = window.tab_widget.currentWidget(); editor.insertPlainText('第一段\n第二段')
+    cursor = editor.textCursor(); cursor.setPosition(2); editor.setTextCursor(cursor)
+    window.autosave_tabs(); window.save_worker.flush(); _settle(qapp, window)  # 只写进编辑日志
+    window.open_chapter_in_tab(window.nav_panel.find_index(second['id'])); _settle(qapp, window)
+    window._hibernate_tab(first['id'])
+    assert window.open_tabs[first['id']].get('hibernated') and editor.toPlainText() == ''
+    assert first['id'] not in window._live_tabs()
+    window.tab_widget.setCurrentWidget(editor); _settle(qapp, window)
+    info = window.open_tabs[first['id']]
+    assert 'hibernated' not in info and editor.toPlainText() == '第一段\n第二段'
+    assert editor.textCursor().position() == 2 and not editor.document().isModified()
+    assert info['stats'].totals()['chinese'] == 6
+    editor.moveCursor(QTextCursor.MoveOperation.End); editor.insertPlainText('。')
+    window.close()
+    assert load_chapter_content(project, first['filename']).endswith('第二段。')
@@ -0,0 +1,35 @@
+import json
+import time
+
+from app.progress_log import ProgressLog, SESSION_GAP, chapter_key
+
+
+def _ts(day, hour, minute=0):
+    return int(time.mktime((2024, 5, day, hour, minute, 0, 0, 0, -1)))
+
+
+def test_rollup_days_and_sessions(project):
+    log = ProgressLog(project)
+    log.append('chap-0000000a', 100, _ts(1, 9)); log.append('chap-0000000a', -30, _ts(1, 9, 20))
+    log.append('chap-0000000b', 0, _ts(1, 9, 25))  # 增量为 0 不记
+    log.append('chap-0000000b', 50, _ts(1, 23, 59)); log.append('chap-0000000b', 20, _ts(2, 0, 10))
+    assert log.daily() == {'2024-05-01': (120, 150), '2024-05-02': (20, 20)}
+    assert log.weekly() == {(2024, 18): 140}
+    assert log.sessions() == [(_ts(1, 9), _ts(1, 9, 20), 70), (_ts(1, 23, 59), _ts(2, 0, 10), 70)]
+    assert [key for _, key, _ in log.records()] == [chapter_key('chap-0000000a')] * 2 + [0xb] * 2
+
+
+def test_rollup_only_reads_new_records(project):
+    log = ProgressLog(project)
+    log.append('chap-1', 10, _ts(3, 8)); log.rollup()
+    with open(log.rollup_path, encoding='utf-8') as f: assert json.load(f)['offset'] == 12
+    log.append('chap-1', 5, _ts(3, 8) + SESSION_GAP + 1)
+    reopened = ProgressLog(project)  # 从缓存文件接着汇总
+    assert reopened.daily() == {'2024-05-03': (15, 15)} and len(reopened.sessions()) == 2
+
+
+def test_truncated_log_is_rolled_up_again(project):
+    log = ProgressLog(project)
+    log.append('chap-1', 10, _ts(4, 8)); log.append('chap-1', 10, _ts(4, 9)); log.rollup()
+    with open(log.path, 'r+b') as f: f.truncate(12)
+    assert ProgressLog(project).daily() == {'2024-05-04': (10, 10)}
@@ -0,0 +1,30 @@
+from app import project_index
+from app.project_index import ProjectIndex, get_index, drop_index
+
+
+def _data():
+    return {'structure': [
+        {'id': 'vol-1', 'title': '第一卷：甲', 'children': [{'id': 'chap-1', 'title': '第001章 开端'}, {'id': 'chap-2', 'title': '第002章 相遇'}]},
+        {'id': 'vol-2', 'title': '第三卷：乙', 'children': [{'id': 'chap-3', 'title': '第007章 离别'}]},
+    ]}
+
+
+def test_numbers_follow_rename_and_removal():
+    data = _data(); index = ProjectIndex(data)
+    assert (index.next_volume_number(), index.next_chapter_number()) == (4, 8)
+    data['structure'][1]['children'][0]['title'] = '第003章 离别'; index.renamed('chap-3', '第007章 离别', '第003章 离别')
+    assert index.next_chapter_number() == 4
+    vol = data['structure'].pop(); index.removed_volume(vol)
+    assert (index.next_volume_number(), index.next_chapter_number()) == (2, 3)
+    assert index.node('chap-3') is None and index.parent_of('chap-2') is data['structure'][0]
+
+
+def test_cached_index_is_rebuilt_when_id_slot_is_reused():
+    # 旧的 project_data 被回收后，新对象可能得到同一个 id()；缓存须按对象身份核对
+    old, new = _data(), _data()
+    stale = get_index(old); project_index._indexes[id(new)] = stale
+    index = get_index(new)
+    assert index is not stale and index.data is new
+    assert get_index(new) is index
+    drop_index(new)
+    assert get_index(new) is not index
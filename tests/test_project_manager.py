@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from app.project_manager import (load_project_structure, add_new_volume, add_new_chapter, rename_item_in_structure,
+                                 batch)
+from app.widgets.structure_model import StructureModel, ID_ROLE
+
+
+@pytest.fixture
+def data(project):
+    data = load_project_structure(project)
+    add_new_volume(data, '甲'); add_new_volume(data, '乙')
+    for topic in ('一', '二'): add_new_chapter(project, data, data['structure'][0]['id'], topic)
+    return data
+
+
+def test_failed_batch_restores_structure_in_place(project, data):
+    structure = data['structure']; volume = structure[0]; children = volume['children']; chapter = children[0]
+    before = [(dict(v), [dict(c) for c in v['children']]) for v in structure]
+    with pytest.raises(RuntimeError):
+        with batch(project, data):
+            add_new_volume(data, '丙')
+            add_new_chapter(project, data, volume['id'], '三')
+            rename_item_in_structure(data, chapter['id'], '改名')
+            raise RuntimeError('导入失败')
+    assert data['structure'] is structure and structure[0] is volume
+    assert volume['children'] is children and children[0] is chapter
+    assert [(dict(v), [dict(c) for c in v['children']]) for v in structure] == before
+    assert not os.path.exists(os.path.join(project, 'chapters', '003-三.txt'))
+
+
+def test_model_sees_edits_after_failed_batch(qapp, project, data):
+    model = StructureModel(); model.set_structure(data['structure'])
+    chapter = data['structure'][0]['children'][0]
+    with pytest.raises(RuntimeError):
+        with batch(project, data):
+            rename_item_in_structure(data, chapter['id'], '批次中的名字'); raise RuntimeError
+    rename_item_in_structure(data, chapter['id'], '之后的名字')
+    model.apply_ops([{'op': 'rename', 'id': chapter['id'], 'title': '之后的名字'}])
+    index = model.find_index(chapter['id'])
+    assert index.data(ID_ROLE) == chapter['id'] and index.data() == '之后的名字'
+
+
+def test_successful_batch_writes_once(project, data):
+    with batch(project, data):
+        add_new_chapter(project, data, data['structure'][1]['id'], '三')
+    reloaded = load_project_structure(project)
+    assert [c['title'] for c in reloaded['structure'][1]['children']] == ['第003章 三']
+    assert os.path.exists(os.path.join(project, 'chapters', '003-三.txt'))
@@ -0,0 +1,105 @@
+import os
+import re
+import threading
+
+from PyQt6.QtGui import QTextDocument, QTextCursor, QTextCharFormat
+
+from app.chapter_format import plain_to_native, load_into_document, document_to_native
+from app.chapter_journal import append_journal
+from app.project_manager import (save_chapter_content, load_chapter_content, save_chapters_atomic, add_change_listener,
+                                 remove_change_listener)
+from app.project_replace import replace_in_native, replace_in_document, apply_to_files
+
+
+def _formatted(qapp):
+    doc = QTextDocument(); cursor = QTextCursor(doc)
+    bold = QTextCharFormat(); bold.setFontWeight(700); plain = QTextCharFormat()
+    cursor.insertText('李明', bold); cursor.insertText('走进森林，', plain); cursor.insertBlock()
+    cursor.insertText('李', plain); cursor.insertText('明看见小鸟', bold)
+    return document_to_native(doc)
+
+
+def _via_document(content, pattern, replacement, regex=False):
+    doc = load_into_document(content, QTextDocument())
+    return replace_in_document(doc, pattern, replacement, regex), document_to_native(doc)
+
+
+def _normalized(content):
+    return document_to_native(load_into_document(content, QTextDocument()))
+
+
+def test_native_rewrite_matches_document_path(qapp):
+    content = _formatted(qapp)
+    for pattern, replacement, regex in (('李明', '王五', False), ('森林', '', False), ('明走', 'X', False),
+                                        (r'(小)(鸟)', r'\2\1', True)):
+        compiled = re.compile(pattern if regex else re.escape(pattern))
+        new_content, count = replace_in_native(content, compiled, replacement, regex)
+        expected_count, expected = _via_document(content, compiled, replacement, regex)
+        assert count == expected_count and _normalized(new_content) == expected
+
+
+def test_cross_block_replacements_need_a_document(qapp):
+    content = plain_to_native('第一段\n第二段')
+    assert replace_in_native(content, re.compile('段\n第'), '', False) is None
+    assert replace_in_native(content, re.compile('一'), '\n', False) is None
+
+
+def _chapters(project, count, text='李明走进森林。'):
+    names = [f'{i:03d}.txt' for i in range(count)]
+    for name in names: save_chapter_content(project, name, plain_to_native(text))
+    return names
+
+
+def test_apply_to_files_in_process_pool(project):
+    names = _chapters(project, 70)  # 超过 POOL_MIN_ITEMS，走进程池
+    seen = []
+    success, total, _ = apply_to_files(project, names, re.compile('森林'), '山谷', workers=2,
+                                       progress=lambda done, n: seen.append((done, n)))
+    assert success and total == 70
+    assert seen[-1] == (70, 70)
+    assert all(load_chapter_content(project, name).endswith('李明走进山谷。') for name in names)
+
+
+def test_journal_and_html_chapters_take_the_document_path(qapp, project):
+    names = _chapters(project, 2)
+    append_journal(project, names[0], [{'p': 0, 'r': 0, 't': '森林'}])
+    save_chapter_content(project, 'html.txt', '<html><body><p>森林里</p></body></html>')
+    success, total, _ = apply_to_files(project, names + ['html.txt'], re.compile('森林'), '山谷', workers=1)
+    assert success and total == 4
+    assert load_chapter_content(project, names[0]).endswith('山谷李明走进山谷。')
+    assert load_chapter_content(project, 'html.txt').endswith('山谷里')
+
+
+def test_cancel_leaves_every_chapter_untouched(project):
+    names = _chapters(project, 3); cancel = threading.Event(); cancel.set()
+    success, total, msg = apply_to_files(project, names, re.compile('森林'), '山谷', workers=1, cancel=cancel)
+    assert not success and total == 0
+    assert all(load_chapter_content(project, name).endswith('李明走进森林。') for name in names)
+
+
+def test_missing_chapter_aborts_without_writing(project):
+    names = _chapters(project, 2)
+    success, _, msg = apply_to_files(project, names + ['missing.txt'], re.compile('森林'), '山谷', workers=1)
+    assert not success and 'missing.txt' in msg
+    assert all(load_chapter_content(project, name).endswith('李明走进森林。') for name in names)
+
+
+def test_failed_rename_midway_resets_journals_of_replaced_chapters(project, monkeypatch):
+    names = _chapters(project, 3)
+    for name in names: append_journal(project, name, [{'p': 0, 'r': 0, 't': '旧'}])
+    real_replace = os.replace; calls = []; events = []
+
+    def flaky_replace(src, dst):
+        calls.append(dst)
+        if len(calls) == 3: raise PermissionError(32, '文件被占用')  # 第二章的章节文件
+        real_replace(src, dst)
+    monkeypatch.setattr(os, 'replace', flaky_replace)
+    listener = lambda kind, path, filenames: events.append((kind, filenames)); add_change_listener(listener)
+    try: success, msg = save_chapters_atomic(project, {name: plain_to_native('新内容') for name in names})
+    finally: remove_change_listener(listener); monkeypatch.undo()
+    assert not success and names[0] in msg and names[1] not in msg
+    assert events == [('saved', [names[0]])]
+    assert load_chapter_content(project, names[0]) == plain_to_native('新内容')  # 旧日志不再重放到新内容上
+    assert all(load_chapter_content(project, name).endswith('旧李明走进森林。') for name in names[1:])
+    leftovers = [f for sub in ('chapters', 'plain_backup') for f in os.listdir(os.path.join(project, sub)) if f.endswith('.tmp')]
+    assert leftovers == []
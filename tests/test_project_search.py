@@ -0,0 +1,29 @@
+from app.project_search import compile_query, locate_match
+
+
+def test_whole_word_matches_inside_cjk_text():
+    pattern = compile_query('小屋', whole_word=True)
+    assert [m.start() for m in pattern.finditer('林中有一座小屋。小屋前')] == [5, 8]
+
+
+def test_whole_word_still_separates_latin_words():
+    pattern = compile_query('cat', whole_word=True)
+    assert [m.start() for m in pattern.finditer('cat concat cat_ 黑cat2 猫cat。')] == [0, 23]
+
+
+def test_whole_word_wraps_regex_alternation():
+    pattern = compile_query('ab|cd', regex=True, whole_word=True)
+    assert pattern.findall('xab cd abx 甲ab乙') == ['cd', 'ab']
+
+
+def test_locate_match_keeps_exact_offset():
+    pattern = compile_query('小屋')
+    assert locate_match('林中有一座小屋。', pattern, 5, 2) == (5, 2)
+
+
+def test_locate_match_falls_back_to_nearest_match():
+    # 索引中的偏移与编辑器的纯文本差了几个字符（旧 HTML 章节的段落模型不一致）
+    text = '小屋在北边。\n\n林中有一座小屋。' + '小屋' * 3
+    pattern = compile_query('小屋')
+    assert locate_match(text, pattern, 12, 2) == (13, 2)
+    assert locate_match('没有了', pattern, 12, 2) == (12, 2)
@@ -0,0 +1,54 @@
+import os
+
+from app.importer import import_manuscript
+from app.chapter_format import plain_to_native
+from app.project_manager import load_project_structure, save_chapter_content
+from app.project_stats import ProjectStats, StatsUpdater, summarize
+from app.text_stats import STAT_KEYS
+
+CHARS = STAT_KEYS.index('chars_no_space')
+
+
+def test_refresh_counts_new_changed_and_removed(project):
+    stats = ProjectStats(project)
+    save_chapter_content(project, 'a.txt', plain_to_native('一二三'))
+    save_chapter_content(project, 'b.txt', plain_to_native('四五'))
+    assert stats.refresh(workers=1) == 2
+    assert stats.chapter('a.txt')['chars_no_space'] == 3
+    assert stats.refresh(workers=1) == 0  # 没有变化时不重新统计
+    save_chapter_content(project, 'a.txt', plain_to_native('一二三四'))
+    os.remove(os.path.join(project, 'plain_backup', 'b.txt'))
+    assert stats.refresh(workers=1) == 2
+    assert stats.snapshot()['a.txt'][CHARS] == 4
+    assert 'b.txt' not in stats.snapshot()
+
+
+def test_cache_survives_reload(project):
+    save_chapter_content(project, 'a.txt', plain_to_native('一二三'))
+    stats = ProjectStats(project); stats.refresh(workers=1); stats.save()
+    assert ProjectStats(project).chapter('a.txt') == stats.chapter('a.txt')
+
+
+def test_updater_refresh_picks_up_imported_chapters(project, tmp_path):
+    updater = StatsUpdater(project, ProjectStats(project)); updater.wait_idle()
+    source = tmp_path / 'book.txt'
+    source.write_text('第一卷 甲\n第一章 开端\n李明走进森林。\n第二章 继续\n小鸟在唱歌。\n', encoding='utf-8')
+    data = load_project_structure(project)
+    import_manuscript(project, data, str(source))
+    updater.refresh(); updater.wait_idle(); updater.stop()
+    book, volumes = summarize(data['structure'], updater.stats.snapshot())
+    assert [counts[CHARS] for _, counts in volumes[0][2]] == [7, 6]
+    assert book[CHARS] == 13
+
+
+def test_updater_failure_is_logged_and_retried(project, monkeypatch, caplog):
+    updater = StatsUpdater(project, ProjectStats(project)); updater.wait_idle()
+    real_update = ProjectStats.update
+    monkeypatch.setattr(ProjectStats, 'update', lambda self, filename: 1 / 0)
+    save_chapter_content(project, 'a.txt', plain_to_native('一二三'))
+    updater.notify('saved', project, ['a.txt']); updater.wait_idle()
+    assert updater.error and 'project stats update failed' in caplog.text
+    monkeypatch.setattr(ProjectStats, 'update', real_update)
+    updater.notify('saved', project, ['other.txt']); updater.wait_idle()  # 下一次事件先对账，补上漏掉的章
+    updater.stop()
+    assert updater.error is None and updater.stats.snapshot()['a.txt'][CHARS] == 3
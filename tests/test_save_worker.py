@@ -0,0 +1,40 @@
+import threading
+import time
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QTextDocument
+
+from app.chapter_format import is_native, native_plain_text
+from app.project_manager import load_chapter_content
+from app.save_worker import ChapterSaveWorker
+
+
+def _wait(qapp, worker):
+    worker.flush(5)
+    deadline = time.time() + 0.3
+    while time.time() < deadline: qapp.processEvents(); time.sleep(0.01)
+
+
+def test_snapshot_is_released_on_gui_thread(qapp, project):
+    worker = ChapterSaveWorker(project); saved = []; threads = []
+    worker.saved.connect(lambda *args: saved.append(args[:2]))
+    snapshot = QTextDocument(); snapshot.setPlainText('第一段\n第二段')
+    snapshot.destroyed.connect(lambda: threads.append(threading.get_ident()), Qt.ConnectionType.DirectConnection)
+    worker.submit('a.txt', snapshot); del snapshot
+    _wait(qapp, worker)
+    assert saved == [('a.txt', True)]
+    assert threads == [threading.get_ident()]
+    content = load_chapter_content(project, 'a.txt')
+    assert is_native(content) and native_plain_text(content) == '第一段\n第二段'
+    worker.stop(5)
+
+
+def test_queued_snapshot_is_replaced(qapp, project):
+    worker = ChapterSaveWorker(project)
+    with worker._cond:  # 工作线程取任务前连续提交两次，只写最后一份
+        for text in ('旧', '新'):
+            doc = QTextDocument(); doc.setPlainText(text); worker.submit('a.txt', doc)
+        del doc
+    _wait(qapp, worker)
+    assert native_plain_text(load_chapter_content(project, 'a.txt')) == '新'
+    worker.stop(5)
@@ -0,0 +1,74 @@
+import os
+import shutil
+
+import pytest
+
+from app.search_index import SearchIndex, IndexUpdater
+
+
+def _backup(project, filename, text):
+    path = os.path.join(project, 'plain_backup'); os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, filename), 'w', encoding='utf-8') as f: f.write(text)
+
+
+@pytest.fixture
+def index(project):
+    _backup(project, 'a.txt', '林中有一座小屋。'); _backup(project, 'b.txt', '山下的小屋，小屋前有河。')
+    index = SearchIndex(project); index.rebuild()
+    yield index
+    index.close()
+
+
+def test_search_ranks_by_count(index):
+    hits, _ = index.search('小屋')
+    assert [(h['filename'], h['count']) for h in hits] == [('b.txt', 2), ('a.txt', 1)]
+
+
+def test_live_text_overrides_stale_index(index):
+    # 只写进了编辑日志的内容：索引里还是旧文本，结果须以打开标签中的文本为准
+    hits, _ = index.search('小屋', live={'a.txt': '林中什么都没有。'})
+    assert [h['filename'] for h in hits] == ['b.txt']
+    hits, _ = index.search('木桥', live={'a.txt': '林中有一座木桥。'})
+    assert [(h['filename'], h['position']) for h in hits] == [('a.txt', 5)]
+
+
+def _postings(index):
+    return {gram: dict(index._postings(gram)) for gram in ('小屋', '林中', '木桥', '前有河')}
+
+
+def test_update_document_matches_rebuild(index, project, tmp_path):
+    _backup(project, 'a.txt', '林中有一座木桥，木桥下有河。')
+    changed = index.update_document('a.txt')
+    assert 0 < changed < 30  # 只改写次数有变化的 n-gram
+    copy = str(tmp_path / 'copy'); shutil.copytree(os.path.join(project, 'plain_backup'), os.path.join(copy, 'plain_backup'))
+    fresh = SearchIndex(copy); fresh.rebuild()
+    # 文档编号可能不同，按文件名比较各 n-gram 的倒排
+    names = lambda idx: dict(idx.conn.execute('SELECT id, filename FROM docs'))
+    by_name = lambda idx: {g: {names(idx)[d]: n for d, n in p.items()} for g, p in _postings(idx).items()}
+    assert by_name(index) == by_name(fresh)
+    fresh.close()
+    assert [h['filename'] for h in index.search('木桥')[0]] == ['a.txt']
+
+
+def test_remove_and_reconcile(index, project):
+    os.remove(os.path.join(project, 'plain_backup', 'b.txt'))
+    _backup(project, 'c.txt', '小屋小屋小屋')
+    assert index.reconcile() == (1, 1)
+    assert [(h['filename'], h['count']) for h in index.search('小屋')[0]] == [('c.txt', 3), ('a.txt', 1)]
+    assert index.search('前有河')[0] == [] and not index._postings('前有河')
+
+
+def test_updater_failure_is_logged_and_retried(project, monkeypatch, caplog):
+    _backup(project, 'a.txt', '林中有一座小屋。')
+    updater = IndexUpdater(project); updater.wait_idle()
+    real_update = SearchIndex.update_document
+    monkeypatch.setattr(SearchIndex, 'update_document', lambda self, filename: 1 / 0)
+    _backup(project, 'a.txt', '林中有一座木桥。'); updater.notify('saved', project, ['a.txt']); updater.wait_idle()
+    assert updater.error and 'search index update failed' in caplog.text
+    monkeypatch.setattr(SearchIndex, 'update_document', real_update)
+    updater.notify('saved', project, ['other.txt']); updater.wait_idle()  # 下一次事件先对账，补上漏掉的更新
+    assert updater.error is None
+    updater.stop()
+    index = SearchIndex(project)
+    assert [h['filename'] for h in index.search('木桥')[0]] == ['a.txt']
+    index.close()
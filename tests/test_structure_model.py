@@ -0,0 +1,66 @@
+import pytest
+
+from app.project_manager import (load_project_structure, add_new_volume, add_new_chapter, rename_item_in_structure,
+                                 delete_item, move_chapter, merge_and_delete_volume)
+from app.structure_store import StructureStore
+from app.widgets import structure_model
+from app.widgets.structure_model import StructureModel, ID_ROLE
+
+
+@pytest.fixture
+def tree(qapp, project, monkeypatch):
+    monkeypatch.setattr(structure_model, 'TREE_FETCH_BATCH', 2)
+    data = load_project_structure(project); store = StructureStore(project, data)
+    for topic in ('甲', '乙'):
+        add_new_volume(data, topic)
+        for i in range(3): add_new_chapter(project, data, data['structure'][-1]['id'], f'{topic}{i}')
+    model = StructureModel(); model.set_structure(data['structure']); store.changed.connect(model.apply_ops)
+    yield project, data, model
+    store.close()
+
+
+def _rows(model):
+    """模型中的 (卷 id, [章节 id]) 列表（先取出全部懒加载的行）。"""
+    rows = []
+    for v in range(model.rowCount()):
+        parent = model.index(v, 0)
+        while model.canFetchMore(parent): model.fetchMore(parent)
+        rows.append((parent.data(ID_ROLE), [model.index(c, 0, parent).data(ID_ROLE) for c in range(model.rowCount(parent))]))
+    return rows
+
+
+def _expected(data):
+    return [(vol['id'], [ch['id'] for ch in vol['children']]) for vol in data['structure']]
+
+
+def test_chapters_are_fetched_lazily(tree):
+    _, data, model = tree
+    parent = model.index(0, 0)
+    assert model.rowCount(parent) == 0 and model.canFetchMore(parent)
+    model.fetchMore(parent)
+    assert model.rowCount(parent) == 2
+    assert model.find_index(data['structure'][1]['children'][2]['id']).row() == 2  # 按需取到该行
+    assert _rows(model) == _expected(data)
+
+
+def test_model_follows_structure_ops(tree):
+    project, data, model = tree
+    first, second = data['structure']
+    model.fetchMore(model.index(0, 0))  # 第一卷只取出一部分
+    rename_item_in_structure(data, first['children'][0]['id'], '第001章 改名')
+    move_chapter(data, second['children'][0]['id'], first['id'], 1)
+    delete_item(project, data, first['children'][-1]['id'])
+    add_new_chapter(project, data, second['id'], '新章')
+    assert _rows(model) == _expected(data)
+    assert model.index(0, 0, model.index(0, 0)).data() == '第001章 改名'
+    merge_and_delete_volume(data, second['id'], project)
+    assert _rows(model) == _expected(data) and model.rowCount() == 1
+
+
+def test_adjacent_chapters_cross_volumes(tree):
+    _, data, model = tree
+    ids = [ch['id'] for vol in data['structure'] for ch in vol['children']]
+    assert [ch['id'] for ch in model.adjacent_chapters(ids[2], 2, 2)] == [ids[3], ids[4], ids[1], ids[0]]
+    assert [ch['id'] for ch in model.adjacent_chapters(ids[0], 3, 1)] == [ids[1]]
+    assert [ch['id'] for ch in model.adjacent_chapters(ids[5], 4, 1)] == [ids[4], ids[3], ids[2], ids[1]]
+    assert model.adjacent_chapters('missing', 1, 1) == [] and not model.find_index('missing').isValid()
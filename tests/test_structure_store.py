@@ -0,0 +1,82 @@
+import json
+import os
+
+from app.project_manager import (load_project_structure, add_new_volume, add_new_chapter, rename_item_in_structure,
+                                 delete_item)
+from app.structure_store import StructureStore, OPLOG_FILENAME, read_oplog
+
+
+def _open(project):
+    data = load_project_structure(project)
+    store = StructureStore(project, data)
+    return data, store
+
+
+def _crash(store):
+    """模拟崩溃：防抖写入还没发生，project.json 仍是旧的。"""
+    store._timer.stop(); store._dirty = False
+
+
+def test_ops_recovered_after_crash_before_first_flush(qapp, project):
+    os.remove(os.path.join(project, OPLOG_FILENAME))  # 旧版本保存的项目没有 oplog
+    data, store = _open(project)
+    add_new_volume(data, '甲'); volume_id = data['structure'][0]['id']
+    add_new_chapter(project, data, volume_id, '开端')
+    rename_item_in_structure(data, volume_id, '第一卷：改名')
+    _crash(store); store.close()
+    recovered = load_project_structure(project)
+    assert recovered['structure'][0]['title'] == '第一卷：改名'
+    assert [c['title'] for c in recovered['structure'][0]['children']] == ['第001章 开端']
+
+
+def test_stale_oplog_is_rebased_on_open(qapp, project):
+    with open(os.path.join(project, OPLOG_FILENAME), 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'base': 1}) + '\n' + json.dumps({'op': 'add_volume', 'volume': {'id': 'vol-x', 'title': '旧', 'children': []}}) + '\n')
+    data, store = _open(project)
+    assert data['structure'] == []  # 基底不匹配的旧操作不应用
+    add_new_volume(data, '乙')
+    _crash(store); store.close()
+    assert [v['title'] for v in load_project_structure(project)['structure']] == ['第一卷：乙']
+
+
+def test_flush_writes_json_and_resets_oplog(qapp, project):
+    data, store = _open(project)
+    add_new_volume(data, '甲')
+    assert store.flush()
+    with open(os.path.join(project, 'project.json'), 'r', encoding='utf-8') as f: text = f.read()
+    assert json.loads(text)['structure'][0]['title'] == '第一卷：甲'
+    assert read_oplog(project, text) == []
+    store.close()
+
+
+def test_torn_trailing_op_is_ignored(qapp, project):
+    data, store = _open(project)
+    add_new_volume(data, '甲'); _crash(store); store.close()
+    with open(os.path.join(project, OPLOG_FILENAME), 'a', encoding='utf-8') as f: f.write('{"op": "rename", "id"')
+    assert [v['title'] for v in load_project_structure(project)['structure']] == ['第一卷：甲']
+
+
+def test_delete_is_replayed(qapp, project):
+    data, store = _open(project)
+    add_new_volume(data, '甲'); add_new_volume(data, '乙'); store.flush()
+    delete_item(project, data, data['structure'][0]['id'])
+    _crash(store); store.close()
+    assert [v['title'] for v in load_project_structure(project)['structure']] == ['第二卷：乙']
+
+
+def test_oplog_write_failure_still_notifies_and_flushes(qapp, project, monkeypatch):
+    data, store = _open(project)
+    errors = []; changes = []
+    store.flush_failed.connect(errors.append); store.changed.connect(changes.append)
+    real_open = open
+
+    def failing_open(path, mode='r', *args, **kwargs):
+        if str(path).endswith(OPLOG_FILENAME) and 'a' in mode: raise OSError(28, 'No space left on device')
+        return real_open(path, mode, *args, **kwargs)
+    monkeypatch.setattr('builtins.open', failing_open)
+    assert add_new_volume(data, '甲')
+    monkeypatch.undo()
+    assert len(errors) == 1 and [op['op'] for op in changes[0]] == ['add_volume']
+    assert store._dirty and store.flush()
+    assert [v['title'] for v in load_project_structure(project)['structure']] == ['第一卷：甲']
+    store.close()
@@ -0,0 +1,17 @@
+from PyQt6.QtGui import QTextDocument
+
+from app.tab_memory import CHAR_BYTES, UNDO_STEP_BYTES, estimate_document_bytes, pick_hibernation
+
+
+def test_pick_hibernation_takes_least_recently_used_first():
+    tabs = [('a', 3, 40), ('b', 1, 30), ('c', 2, 50), ('d', 4, 10)]
+    assert pick_hibernation(tabs, 200) == []
+    assert pick_hibernation(tabs, 100) == ['b']
+    assert pick_hibernation(tabs, 60) == ['b', 'c']
+    assert pick_hibernation(tabs, 60, keep=('b',)) == ['c', 'a']
+    assert pick_hibernation(tabs, 0, keep=('d',)) == ['b', 'c', 'a']
+
+
+def test_estimate_counts_text_and_undo_steps(qapp):
+    document = QTextDocument(); document.setPlainText('一二三')
+    assert estimate_document_bytes(document) == 4 * CHAR_BYTES + document.availableUndoSteps() * UNDO_STEP_BYTES
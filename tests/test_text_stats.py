@@ -0,0 +1,48 @@
+import random
+
+import pytest
+from PyQt6.QtGui import QTextCursor, QTextDocument
+
+from app import text_stats
+from app.text_stats import BlockStats, STAT_KEYS, calc_text_stats, count_text
+
+SAMPLE = '第一章　开端\n李明说：“Hello, world 2024！”\t\n\n㐀ａ１ 。'
+
+
+def _reference(text, wide):
+    ranges = text_stats.WIDE_CJK_RANGES if wide else text_stats.CJK_RANGES
+    counts = [0] * 5
+    for c in text: counts[text_stats._classify(c, ranges)] += 1
+    no_space = sum(counts[1:])
+    return (len(text) - text.count('\r'), no_space, *counts[1:])
+
+
+@pytest.mark.parametrize('wide', [False, True])
+def test_counter_path_matches_per_char_classification(wide):
+    assert count_text(SAMPLE, wide) == _reference(SAMPLE, wide)
+
+
+@pytest.mark.parametrize('wide', [False, True])
+def test_numpy_path_matches_counter_path(monkeypatch, wide):
+    pytest.importorskip('numpy')
+    monkeypatch.setattr(text_stats, 'NUMPY_MIN_CHARS', 0)
+    assert count_text(SAMPLE, wide) == _reference(SAMPLE, wide)
+
+
+def test_block_stats_follow_random_edits(qapp):
+    document = QTextDocument(); document.setPlainText('第一段文字。\n\nSecond 段 2。\n末段')
+    stats = BlockStats(document, wide_cjk=False)
+    rng = random.Random(7); pieces = ['字', 'ab', '\n', '12', '，', ' ', '新的一段\n另一段']
+    for _ in range(300):
+        cursor = QTextCursor(document); size = document.characterCount() - 1
+        start = rng.randint(0, size); cursor.setPosition(start)
+        cursor.setPosition(min(size, start + rng.choice([0, 0, 1, 3, 12])), QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(rng.choice(pieces) if rng.random() < 0.8 else '')
+        assert stats.totals() == calc_text_stats(document.toPlainText(), False)
+    assert set(stats.totals()) == set(STAT_KEYS)
+
+
+def test_block_stats_accepts_precomputed_blocks(qapp):
+    document = QTextDocument(); document.setPlainText('甲乙\n丙')
+    stats = BlockStats(document, wide_cjk=False, blocks=text_stats.block_counts(document, False))
+    assert stats.totals() == calc_text_stats('甲乙\n丙', False) and stats.line_count() == 2
@@ -0,0 +1,30 @@
+"""切换项目的章节压缩方式，并把已有章节与纯文本备份全部转换。
+
+用法（在仓库根目录）：
+    python tools/compress_project.py <项目目录> --codec zlib [--level 6]
+    python tools/compress_project.py <项目目录> --codec none        # 解压回普通文本
+codec 可选 none / zlib / lzma / zlib-dict（按本项目训练预置字典）。
+请在应用未打开该项目时运行。
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.chapter_storage import CODECS  # noqa: E402
+from app.project_manager import set_project_storage  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('project_path')
+    ap.add_argument('--codec', choices=CODECS, required=True)
+    ap.add_argument('--level', type=int, default=None)
+    args = ap.parse_args()
+    count = set_project_storage(args.project_path, args.codec, args.level)
+    if count < 0: sys.exit('无法读取或写入 project.json')
+    print(f"已按 {args.codec} 重写 {count} 个文件")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""把项目中的章节文件批量迁移为原生格式（或用 --to-html 导出回 HTML）。
+
+用法（在仓库根目录）：python tools/migrate_chapter_format.py <项目目录> [--to-html]
+迁移前会先重放各章节的编辑日志；纯文本备份同步重建。
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PyQt6.QtGui import QGuiApplication  # noqa: E402
+from app.project_manager import migrate_chapter_files  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('project_path')
+    ap.add_argument('--to-html', action='store_true', help='导出为 QTextEdit HTML（旧格式）')
+    args = ap.parse_args()
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv)  # noqa: F841  QTextDocument 需要
+    converted, before, after = migrate_chapter_files(args.project_path, to_html=args.to_html)
+    print(f"已转换 {converted} 个章节: {before / 1024:.1f} KB -> {after / 1024:.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""从 plain_backup/ 全量重建项目的全文索引（search_index.db）。
+
+用法（在仓库根目录）：python tools/rebuild_search_index.py <项目目录>
+索引损坏、或在应用外批量修改了章节后使用。
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.search_index import SearchIndex  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('project_path')
+    args = ap.parse_args()
+    t0 = time.perf_counter()
+    index = SearchIndex(args.project_path)
+    count = index.rebuild(); index.close()
+    print(f"已索引 {count} 章，用时 {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""统计文本文件或项目的字数（与编辑器状态栏相同的分类）。
+
+用法（在仓库根目录）：python tools/text_stats.py <文件/目录/项目目录>... [--wide-cjk]
+项目目录统计 plain_backup/ 下的各章纯文本；普通目录统计其中的 .txt/.md 文件。
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.importer import decode_bytes, IMPORT_EXTENSIONS  # noqa: E402
+from app.text_stats import STAT_KEYS, count_text  # noqa: E402
+
+LABELS = ('字符', '字数(不含空格)', '汉字', '英文', '数字', '符号')
+
+
+def iter_files(path):
+    if os.path.isfile(path):
+        yield path; return
+    backup = os.path.join(path, 'plain_backup')
+    root = backup if os.path.isdir(backup) else path
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(IMPORT_EXTENSIONS): yield os.path.join(dirpath, name)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('paths', nargs='+')
+    ap.add_argument('--wide-cjk', action='store_true', help='汉字另计入扩展 A 区与中文标点')
+    ap.add_argument('-v', '--verbose', action='store_true', help='逐个文件输出')
+    args = ap.parse_args()
+    t0 = time.perf_counter(); totals = [0] * len(STAT_KEYS); files = 0
+    for path in args.paths:
+        for file_path in iter_files(path):
+            with open(file_path, 'rb') as f: text, _ = decode_bytes(f.read())
+            counts = count_text(text, args.wide_cjk); files += 1
+            totals = [a + b for a, b in zip(totals, counts)]
+            if args.verbose: print(f"{counts[1]:>10}  {file_path}")
+    print(f"{files} 个文件，用时 {time.perf_counter() - t0:.2f} s")
+    for label, value in zip(LABELS, totals): print(f"{label}: {value}")
+
+
+if __name__ == '__main__':
+    main()